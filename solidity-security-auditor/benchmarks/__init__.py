@@ -0,0 +1,13 @@
+"""
+Benchmarks for the auditor's detectors.
+
+generator builds synthetic Solidity and Anchor sources of configurable size,
+and run_benchmarks measures throughput, peak memory and the per-detector
+breakdown on them, comparing against a saved baseline. The remaining scripts
+benchmark individual components (scanning engine, lexer, pathological
+regex inputs).
+"""
+
+from .generator import GeneratedSource, generate, generate_anchor, generate_solidity
+
+__all__ = ['GeneratedSource', 'generate', 'generate_anchor', 'generate_solidity']
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Benchmark for bulk contract fetching against a local mock explorer.
+
+Serves one stand-in explorer per EVM network from a local server (see
+bench_http_client.py), each answering after a fixed latency and enforcing
+its own requests-per-second quota by replying "Max rate limit reached", as
+the real explorers do, and failing a share of requests with 503 errors.
+Addresses starting with 0x00 are reported as not verified. The same address list, spread over Ethereum, BSC, Polygon and
+Avalanche, is then fetched one blocking call at a time with
+fetch_contract_source and concurrently with fetch_many (with and without
+retries), all without the contract cache, and finally twice more with
+fetch_many through a fresh on-disk contract cache (cold, then warm). The script reports the wall time,
+the results by outcome and how many requests the server received and
+rejected for exceeding its quota.
+
+Usage:
+    python benchmarks/bench_fetch_many.py --addresses 200 --latency-ms 50 --quota 5 --failure-rate 0.05
+"""
+
+import argparse
+import asyncio
+import collections
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.bench_http_client import ExplorerHandler, StandInExplorer
+from cache_store import CACHE_DIR_ENV
+from contract_fetcher import BlockchainNetwork, ContractCache, ContractSourceFetcher
+from http_client import HTTPClient
+from rate_limiter import RateLimiter
+from retry_policy import RetryPolicy
+
+EVM_NETWORKS = (
+    BlockchainNetwork.ETHEREUM_MAINNET,
+    BlockchainNetwork.BSC_MAINNET,
+    BlockchainNetwork.POLYGON_MAINNET,
+    BlockchainNetwork.AVALANCHE_MAINNET,
+)
+
+
+class MockExplorer(StandInExplorer):
+    """Stand-in explorers with a response latency and a per-explorer quota."""
+
+    def __init__(self, latency: float, quota: int, failure_rate: float = 0.0):
+        super().__init__(0.0, handler=MockExplorerHandler)
+        self.latency = latency
+        self.quota = quota
+        self.failure_rate = failure_rate
+        self.requests: Dict[str, collections.deque] = collections.defaultdict(collections.deque)
+        self.received = 0
+        self.rejected = 0
+
+    def admit(self, explorer: str) -> bool:
+        """Count a request against the explorer's quota for the last second."""
+        now = time.monotonic()
+        with self.lock:
+            self.received += 1
+            recent = self.requests[explorer]
+            while recent and now - recent[0] >= 1.0:
+                recent.popleft()
+            if self.quota and len(recent) >= self.quota:
+                self.rejected += 1
+                return False
+            recent.append(now)
+            return True
+
+    def endpoints(self) -> Dict[BlockchainNetwork, str]:
+        base = f"http://localhost:{self.server_address[1]}"
+        return {network: f"{base}/{network.value}/api" for network in EVM_NETWORKS}
+
+
+class MockExplorerHandler(ExplorerHandler):
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        address = parse_qs(url.query).get('address', [''])[0]
+        admitted = self.server.admit(url.path)
+        time.sleep(self.server.latency)
+        if random.random() < self.server.failure_rate:
+            self.send_json({'status': '0', 'message': 'Service Unavailable'}, status=503)
+        elif not admitted:
+            self.send_json({'status': '0', 'message': 'NOTOK', 'result': 'Max rate limit reached'})
+        elif address.startswith('0x00'):
+            self.send_json({'status': '0', 'message': 'NOTOK', 'result': 'Contract source code not verified'})
+        else:
+            super().do_GET()
+
+    def send_json(self, data: Dict, status: int = 200):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_addresses(count: int, unverified_share: float, seed: int) -> List[Tuple[str, BlockchainNetwork]]:
+    rng = random.Random(seed)
+    addresses = []
+    for index in range(count):
+        prefix = '00' if rng.random() < unverified_share else 'ab'
+        address = '0x' + prefix + ''.join(rng.choice('0123456789abcdef') for _ in range(38))
+        addresses.append((address, EVM_NETWORKS[index % len(EVM_NETWORKS)]))
+    return addresses
+
+
+def make_fetcher(server: MockExplorer, client: HTTPClient, interval: float, burst: int,
+                 cache: Optional[ContractCache] = None, max_attempts: Optional[int] = None) -> ContractSourceFetcher:
+    rate_limiter = RateLimiter()
+    retry_policy = RetryPolicy() if max_attempts is None else RetryPolicy(max_attempts=max_attempts)
+    fetcher = ContractSourceFetcher(client, rate_limiter, endpoints=server.endpoints(),
+                                    cache=cache, use_cache=cache is not None, retry_policy=retry_policy)
+    for service in fetcher.service_names.values():
+        rate_limiter.configure(service, interval, burst)
+    return fetcher
+
+
+def run_sequential(fetcher: ContractSourceFetcher, addresses) -> Tuple[float, collections.Counter]:
+    outcomes = collections.Counter()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for address, network in addresses:
+            contract = fetcher.fetch_contract_source(address, url_hint=network.value)
+            outcomes['ok' if contract else 'failed'] += 1
+    return time.perf_counter() - started, outcomes
+
+
+async def run_concurrent(fetcher: ContractSourceFetcher, addresses, concurrency: int) -> Tuple[float, collections.Counter]:
+    outcomes = collections.Counter()
+    started = time.perf_counter()
+    async for result in fetcher.fetch_many(addresses, concurrency=concurrency):
+        outcomes['ok' if result.ok else result.error.value] += 1
+    return time.perf_counter() - started, outcomes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk contract fetching against a mock explorer")
+    parser.add_argument('--addresses', type=int, default=100, help="Addresses to fetch, spread over 4 networks")
+    parser.add_argument('--latency-ms', type=float, default=50.0, help="Mock explorer response latency")
+    parser.add_argument('--quota', type=int, default=5,
+                        help="Requests per second each mock explorer accepts (0 = unlimited)")
+    parser.add_argument('--interval', type=float, default=0.2, help="Client-side seconds between requests per explorer")
+    parser.add_argument('--burst', type=int, default=5, help="Client-side burst per explorer")
+    parser.add_argument('--concurrency', type=int, default=4, help="fetch_many requests in flight per explorer")
+    parser.add_argument('--unverified-share', type=float, default=0.1, help="Share of unverified addresses")
+    parser.add_argument('--failure-rate', type=float, default=0.05,
+                        help="Share of requests the mock explorers fail with a 503")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--skip-sequential', action='store_true', help="Only run fetch_many")
+    args = parser.parse_args()
+
+    server = MockExplorer(args.latency_ms / 1000, args.quota, args.failure_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    addresses = make_addresses(args.addresses, args.unverified_share, args.seed)
+
+    sequential = lambda fetcher: run_sequential(fetcher, addresses)
+    concurrent = lambda fetcher: asyncio.run(run_concurrent(fetcher, addresses, args.concurrency))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ[CACHE_DIR_ENV] = cache_dir
+        cache = ContractCache()
+        cases = [] if args.skip_sequential else [('fetch_contract_source', sequential, None, None)]
+        cases += [
+            ('fetch_many, no retries', concurrent, None, 1),
+            ('fetch_many', concurrent, None, None),
+            ('fetch_many, cold cache', concurrent, cache, None),
+            ('fetch_many, warm cache', concurrent, cache, None),
+        ]
+
+        print(f"🌐 Mock explorers at http://localhost:{server.server_address[1]}/<network>/api "
+              f"({args.latency_ms:.0f} ms latency, quota {args.quota or 'unlimited'}/s each)")
+        print(f"{'fetcher':<24} {'time (s)':>9} {'contracts/s':>12} {'requests':>9} {'rejected':>9}  outcomes")
+        with HTTPClient(pool_maxsize=max(10, args.concurrency)) as client:
+            for name, run, case_cache, max_attempts in cases:
+                # Separate fetchers, rate limiters and retry policies, so no case
+                # starts with a drained bucket, an open breaker or a spent budget
+                fetcher = make_fetcher(server, client, args.interval, args.burst, case_cache, max_attempts)
+                time.sleep(1.0)  # Let the server quotas reset between cases
+                received, rejected = server.received, server.rejected
+                seconds, outcomes = run(fetcher)
+                print(f"{name:<24} {seconds:>9.2f} {len(addresses) / seconds:>12.1f} "
+                      f"{server.received - received:>9} {server.rejected - rejected:>9}  "
+                      f"{dict(sorted(outcomes.items()))}")
+        cache.store.close()
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the pooled HTTP client against a local stand-in explorer.
+
+Starts an Etherscan-like HTTP/1.1 server on localhost serving the example
+contract (gzip-compressed when asked), then times sequential fetches made
+with bare requests.get, with the pooled HTTPClient, and end to end through
+ContractSourceFetcher. The server counts the connections it accepts, which
+shows how many handshakes each client paid. --tls serves HTTPS with a
+throwaway self-signed certificate (requires the openssl CLI), and
+--connect-delay-ms adds a delay to every new connection to emulate the
+round trips of a handshake with a remote explorer.
+
+Usage:
+    python benchmarks/bench_http_client.py --requests 200 --tls --connect-delay-ms 30
+"""
+
+import argparse
+import contextlib
+import gzip
+import io
+import json
+import os
+import shutil
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from contract_fetcher import BlockchainNetwork, ContractSourceFetcher
+from http_client import HTTPClient
+from rate_limiter import RateLimiter
+
+EXAMPLE_CONTRACT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'examples', 'vulnerable_contract.sol')
+ADDRESS = '0x' + 'ab' * 20
+
+
+class StandInExplorer(ThreadingHTTPServer):
+    """Local server answering getsourcecode requests like an explorer API."""
+
+    daemon_threads = True
+
+    def __init__(self, connect_delay: float, ssl_context=None, handler=None):
+        super().__init__(('127.0.0.1', 0), handler or ExplorerHandler)
+        with open(EXAMPLE_CONTRACT, 'r', encoding='utf-8') as f:
+            self.body = json.dumps({
+                'status': '1',
+                'message': 'OK',
+                'result': [{
+                    'SourceCode': f.read(),
+                    'ContractName': 'VulnerableBank',
+                    'CompilerVersion': 'v0.7.6+commit.7338295f',
+                    'ABI': '[]',
+                    'ConstructorArguments': '',
+                }],
+            }).encode('utf-8')
+        self.gzipped_body = gzip.compress(self.body)
+        self.connect_delay = connect_delay
+        self.ssl_context = ssl_context
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    def get_request(self):
+        sock, address = super().get_request()
+        if self.ssl_context is not None:
+            sock = self.ssl_context.wrap_socket(sock, server_side=True)
+        return sock, address
+
+    @property
+    def url(self) -> str:
+        scheme = 'https' if self.ssl_context is not None else 'http'
+        return f"{scheme}://localhost:{self.server_address[1]}/api"
+
+
+class ExplorerHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without this, Nagle's algorithm
+    # and delayed ACKs add ~40ms to every response on a kept-alive connection
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+        if self.server.connect_delay:
+            time.sleep(self.server.connect_delay)
+
+    def do_GET(self):
+        body = self.server.body
+        headers = {'Content-Type': 'application/json'}
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = self.server.gzipped_body
+            headers['Content-Encoding'] = 'gzip'
+        self.send_response(200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def self_signed_context(directory: str):
+    """Create a throwaway certificate for localhost; return (server context, certificate path)."""
+    cert, key = os.path.join(directory, 'cert.pem'), os.path.join(directory, 'key.pem')
+    subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+         '-subj', '/CN=localhost', '-addext', 'subjectAltName=DNS:localhost',
+         '-keyout', key, '-out', cert],
+        check=True, capture_output=True
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    return context, cert
+
+
+def measure(server: StandInExplorer, fetch, count: int):
+    """Run fetch sequentially; return (latencies in seconds, connections opened)."""
+    before = server.connections
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        fetch()
+        latencies.append(time.perf_counter() - start)
+    return latencies, server.connections - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled HTTP fetches against a local explorer")
+    parser.add_argument('--requests', type=int, default=200, help="Sequential fetches per client")
+    parser.add_argument('--tls', action='store_true', help="Serve HTTPS with a self-signed certificate")
+    parser.add_argument('--connect-delay-ms', type=float, default=0.0,
+                        help="Delay added to every new connection, emulating handshake round trips")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        ssl_context, verify = None, True
+        if args.tls:
+            if shutil.which('openssl') is None:
+                sys.exit("--tls requires the openssl command")
+            ssl_context, verify = self_signed_context(directory)
+
+        server = StandInExplorer(args.connect_delay_ms / 1000, ssl_context)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        params = {'module': 'contract', 'action': 'getsourcecode', 'address': ADDRESS}
+
+        client = HTTPClient()
+        fetcher = ContractSourceFetcher(client, RateLimiter(), use_cache=False)
+        fetcher.api_endpoints[BlockchainNetwork.ETHEREUM_MAINNET] = server.url
+        fetcher.rate_limiter.configure('etherscan', interval=0)
+
+        def fetch_contract():
+            with contextlib.redirect_stdout(io.StringIO()):
+                assert fetcher.fetch_contract_source(ADDRESS) is not None
+
+        cases = [
+            ('requests.get', lambda: requests.get(server.url, params=params, timeout=10, verify=verify).json()),
+            ('HTTPClient.get', lambda: client.get(server.url, params=params, verify=verify).json()),
+        ]
+        if not args.tls:
+            # The fetcher verifies certificates against the system store
+            cases.append(('ContractSourceFetcher', fetch_contract))
+
+        print(f"🌐 Stand-in explorer at {server.url} ({len(server.body):,} bytes, "
+              f"{len(server.gzipped_body):,} gzipped)")
+        print(f"{'client':<24} {'mean (ms)':>10} {'p50 (ms)':>9} {'p95 (ms)':>9} {'connections':>12}")
+        for name, fetch in cases:
+            fetch()  # Warm up imports and the first connection
+            latencies, connections = measure(server, fetch, args.requests)
+            latencies.sort()
+            print(f"{name:<24} {statistics.mean(latencies) * 1000:>10.2f} "
+                  f"{latencies[len(latencies) // 2] * 1000:>9.2f} "
+                  f"{latencies[int(len(latencies) * 0.95)] * 1000:>9.2f} {connections:>12}")
+
+        client.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
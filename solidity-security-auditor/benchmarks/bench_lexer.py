@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the array-backed Solidity lexer.
+
+Tokenizes the example contract repeated up to growing source sizes and
+reports throughput in tokens per second alongside the memory held by the
+token arrays and the peak memory allocated while lexing.
+
+Usage:
+    python benchmarks/bench_lexer.py --lines 1000 10000 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from solidity_lexer import tokenize
+
+EXAMPLE_CONTRACT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'examples', 'vulnerable_contract.sol')
+
+
+def build_source(target_lines: int) -> str:
+    """Repeat the example contract until the source reaches the requested size."""
+    with open(EXAMPLE_CONTRACT, 'r', encoding='utf-8') as f:
+        contract = f.read()
+    copies = max(1, target_lines // (contract.count('\n') + 1))
+    return '\n'.join([contract] * copies)
+
+
+def time_best(func, repeat: int):
+    """Return the best wall time of several runs and the last result."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Solidity lexer")
+    parser.add_argument('--lines', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help="Approximate source sizes in lines")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per measurement (best is kept)")
+    args = parser.parse_args()
+
+    print(f"{'lines':>8} {'bytes':>11} {'tokens':>10} {'time (s)':>9} {'tokens/s':>11} "
+          f"{'arrays (KiB)':>13} {'peak (KiB)':>11}")
+
+    for lines in args.lines:
+        code = build_source(lines)
+        elapsed, tokens = time_best(lambda: tokenize(code), args.repeat)
+
+        tracemalloc.start()
+        tokenize(code)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"{code.count(chr(10)) + 1:>8,} {len(code):>11,} {len(tokens):>10,} {elapsed:>9.4f} "
+              f"{len(tokens) / elapsed:>11,.0f} {tokens.memory_bytes / 1024:>13,.1f} {peak / 1024:>11,.1f}")
+
+
+if __name__ == "__main__":
+    main()
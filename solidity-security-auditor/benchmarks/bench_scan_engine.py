@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the single-pass scanning engine.
+
+Compares running every pattern with its own finditer pass against the
+single-pass ScanEngine while the number of registered patterns grows.
+The Solidity pattern set is padded with synthetic patterns anchored on
+identifiers of the source, which mirrors adding new detectors to the
+registry; the share of rules the literal prefilter skipped is reported
+next to the timings.
+
+Usage:
+    python benchmarks/bench_scan_engine.py --lines 20000
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from detectors import VulnerabilityDetector, SOLIDITY_REGEX_FLAGS
+from scan_engine import ScanEngine, ScanRule, ScanStats
+
+EXAMPLE_CONTRACT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'examples', 'vulnerable_contract.sol')
+
+
+def build_source(target_lines: int) -> str:
+    """Repeat the example contract until the source reaches the requested size."""
+    with open(EXAMPLE_CONTRACT, 'r', encoding='utf-8') as f:
+        contract = f.read()
+    copies = max(1, target_lines // (contract.count('\n') + 1))
+    return '\n'.join([contract] * copies)
+
+
+# Statement shapes the synthetic patterns confirm after their identifier
+SYNTHETIC_SHAPES = (
+    r'\s*\([^)]*\)',           # call
+    r'\s*(?:=|\+=|-=)[^;]*;',   # assignment
+    r'\b[^;{}]*[;{]',           # rest of the statement
+)
+
+
+def build_rules(code: str, pattern_count: int, seed: int = 7):
+    """
+    Build the Solidity rules padded with synthetic anchored patterns.
+
+    The synthetic patterns are anchored on identifiers that occur in the
+    source, so the prefilter keeps them and they reach confirmation.
+    """
+    detector = VulnerabilityDetector()
+    rules = [
+        ScanRule(name, detector.compiled_patterns.regexes[name], tuple(data['anchors']))
+        for name, data in detector.patterns.items()
+    ]
+    identifiers = sorted(set(re.findall(r'\b[A-Za-z_]\w{3,}\b', code)))
+    random.Random(seed).shuffle(identifiers)
+    synthetic = [(identifier, shape) for shape in SYNTHETIC_SHAPES for identifier in identifiers]
+    for identifier, shape in synthetic[:max(0, pattern_count - len(rules))]:
+        rules.append(ScanRule(
+            f'synthetic_{len(rules)}',
+            re.compile(re.escape(identifier) + shape, SOLIDITY_REGEX_FLAGS),
+            (identifier,)
+        ))
+    return rules
+
+
+def time_best(func, repeat: int) -> float:
+    """Return the best wall time of several runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the single-pass scanning engine")
+    parser.add_argument('--lines', type=int, default=20000, help="Approximate source size in lines")
+    parser.add_argument('--counts', type=int, nargs='+', default=[10, 20, 40, 80, 160],
+                        help="Pattern counts to benchmark")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per measurement (best is kept)")
+    args = parser.parse_args()
+
+    code = build_source(args.lines)
+    print(f"📄 Source: {code.count(chr(10)) + 1:,} lines, {len(code):,} bytes")
+    print(f"{'patterns':>9} {'per-pattern (s)':>16} {'single-pass (s)':>16} {'speedup':>8} {'skipped':>8} {'matches':>9}")
+
+    for count in args.counts:
+        rules = build_rules(code, count)
+        engine = ScanEngine(rules)
+
+        def per_pattern():
+            return {rule.rule_id: [m.span() for m in rule.regex.finditer(code)] for rule in rules}
+
+        naive_time = time_best(per_pattern, args.repeat)
+        engine_time = time_best(lambda: engine.scan(code), args.repeat)
+        stats = ScanStats()
+        spans = engine.scan(code, stats)
+        assert spans == per_pattern(), "single-pass results differ from per-pattern scan"
+
+        print(f"{len(rules):>9} {naive_time:>16.4f} {engine_time:>16.4f} {naive_time / engine_time:>7.1f}x "
+              f"{stats.skip_rate:>8.0%} {sum(map(len, spans.values())):>9,}")
+
+
+if __name__ == "__main__":
+    main()
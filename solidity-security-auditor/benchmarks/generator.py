@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Synthetic large-source generator for the benchmarks.
+
+Builds Solidity and Anchor (Solana/Rust) sources of a requested size from the
+example contracts. Every copy of an example gets its own contract, function
+and struct names, and copies are interleaved with benign filler functions
+drawn at random, so the output reads like a large flattened codebase rather
+than one file pasted many times. Optionally, each source also ends with
+inputs that make the detector regexes backtrack heavily.
+
+Usage:
+    python benchmarks/generator.py --language solidity --lines 50000 > big.sol
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+from dataclasses import dataclass
+from typing import Callable, Tuple
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'examples')
+SOLIDITY_EXAMPLE = os.path.join(EXAMPLES_DIR, 'vulnerable_contract.sol')
+ANCHOR_EXAMPLE = os.path.join(EXAMPLES_DIR, 'solana_vulnerable.rs')
+
+LANGUAGES = ('solidity', 'anchor')
+
+SOLIDITY_FILLERS = (
+    '    function get{name}(address account) public view returns (uint256) {{\n'
+    '        return balances[account];\n'
+    '    }}\n',
+    '    function set{name}(uint256 value) external onlyOwner {{\n'
+    '        require(value > 0, "Invalid value");\n'
+    '        limit = value;\n'
+    '        emit LimitUpdated(msg.sender, value);\n'
+    '    }}\n',
+    '    function compute{name}(uint256 a, uint256 b) internal pure returns (uint256) {{\n'
+    '        // Scaled ratio with a rounding guard\n'
+    '        if (b == 0) {{\n'
+    '            return 0;\n'
+    '        }}\n'
+    '        return (a * 1e18) / b;\n'
+    '    }}\n',
+    '    function sweep{name}(address payable to) external onlyOwner {{\n'
+    '        uint256 amount = address(this).balance;\n'
+    '        (bool ok, ) = to.call{{value: amount}}("");\n'
+    '        require(ok, "Transfer failed");\n'
+    '    }}\n',
+)
+
+ANCHOR_FILLERS = (
+    'pub fn checked_total_{name}(values: &[u64]) -> Option<u64> {{\n'
+    '    let mut total: u64 = 0;\n'
+    '    for value in values {{\n'
+    '        total = total.checked_add(*value)?;\n'
+    '    }}\n'
+    '    Some(total)\n'
+    '}}\n',
+    'pub fn validate_authority_{name}(authority: &AccountInfo, expected: &Pubkey) -> ProgramResult {{\n'
+    '    if !authority.is_signer || authority.key != expected {{\n'
+    '        return Err(ProgramError::MissingRequiredSignature);\n'
+    '    }}\n'
+    '    Ok(())\n'
+    '}}\n',
+    '#[account]\n'
+    'pub struct Vault{name} {{\n'
+    '    pub authority: Pubkey,\n'
+    '    pub bump: u8,\n'
+    '    pub deposits: u64,\n'
+    '}}\n',
+)
+
+
+@dataclass
+class GeneratedSource:
+    """
+    A synthetic source and what it was built from.
+
+    Attributes:
+        language: "solidity" or "anchor"
+        code: Generated source code
+        lines: Number of lines in the code
+        contracts: Number of contracts (Solidity) or program modules (Anchor)
+            in the code, used to report contracts per second
+    """
+    language: str
+    code: str
+    lines: int
+    contracts: int
+
+
+def _read(path: str) -> str:
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _split_header(source: str, first_body_line: str) -> Tuple[str, str]:
+    """Split a source into (header, body) at the first line starting with first_body_line."""
+    lines = source.split('\n')
+    for index, line in enumerate(lines):
+        if line.startswith(first_body_line):
+            return '\n'.join(lines[:index]) + '\n', '\n'.join(lines[index:]).rstrip() + '\n'
+    raise ValueError(f"No line starting with {first_body_line!r}")
+
+
+def _renamer(template: str, definition: str) -> Callable[[str], str]:
+    """
+    Build a function suffixing every name the template defines.
+
+    Args:
+        template: Source text whose definitions are renamed
+        definition: Regex whose first group captures a defined name
+
+    Returns:
+        Function mapping a suffix to the renamed template
+    """
+    names = sorted(set(re.findall(definition, template)), key=len, reverse=True)
+    name_regex = re.compile(r'\b(' + '|'.join(map(re.escape, names)) + r')\b')
+    return lambda suffix: name_regex.sub(lambda match: match.group(1) + suffix, template)
+
+
+def _insert_into_contract(unit: str, members: str) -> str:
+    """Insert members before the closing brace of the first top-level contract."""
+    closing = unit.index('\n}') + 1
+    return unit[:closing] + members + unit[closing:]
+
+
+def solidity_pathological_cases(size: int) -> str:
+    """
+    Build a contract of inputs that make the Solidity patterns backtrack heavily.
+
+    Args:
+        size: Repetition count controlling the length of each case
+
+    Returns:
+        Solidity source text
+    """
+    return (
+        'pragma solidity ' + '0.6.0 ' * size + ';\n'
+        'contract Pathological {\n'
+        '    struct Slot ' + 'storage ' * size + '= ;\n'
+        '    function before(address target) public ' + 'require( ' * size + '{\n'
+        '        target.call(' + 'before ' * size + ');\n'
+        '        uint256 total = ' + ' + '.join(['amount'] * size) + ';\n'
+        '    }\n'
+        '}\n'
+    )
+
+
+def anchor_pathological_cases(size: int) -> str:
+    """
+    Build Rust code with long lines that make the Solana patterns backtrack heavily.
+
+    Args:
+        size: Repetition count controlling the length of each case
+
+    Returns:
+        Rust source text
+    """
+    return (
+        'pub fn pathological(ctx: Context<Pathological>) -> Result<()> {\n'
+        '    let keys = ' + ' '.join(['ctx.accounts.vault.owner'] * size) + ';\n'
+        '    let infos = ' + ' '.join(['AccountInfo::new'] * size) + ';\n'
+        '    let borrowed = ' + '.data.borrow() ' * size + ';\n'
+        '    Ok(())\n'
+        '}\n'
+    )
+
+
+def _generate(language: str, target_lines: int, seed: int, pathological: bool) -> GeneratedSource:
+    rng = random.Random(seed)
+    if language == 'solidity':
+        header, body = _split_header(_read(SOLIDITY_EXAMPLE), 'contract ')
+        rename = _renamer(body, r'\b(?:contract|function|struct|event|modifier)\s+(\w+)')
+        fillers = SOLIDITY_FILLERS
+        wrap = _insert_into_contract
+        pathological_cases = solidity_pathological_cases
+    elif language == 'anchor':
+        header, body = _split_header(_read(ANCHOR_EXAMPLE), '#[program]')
+        rename = _renamer(body, r'\b(?:mod|struct|fn)\s+(\w+)')
+        fillers = ANCHOR_FILLERS
+        wrap = str.__add__
+        pathological_cases = anchor_pathological_cases
+    else:
+        raise ValueError(f"Unknown language: {language}")
+
+    parts = [header]
+    lines = header.count('\n')
+    contracts = 0
+    # The pathological cases are unbalanced on purpose; placed last, they
+    # leave the structure of the rest of the source intact
+    case = pathological_cases(max(200, target_lines // 50)) if pathological else ''
+    lines += case.count('\n')
+
+    while lines < target_lines:
+        suffix = f"_{contracts}"
+        filler = ''.join(
+            rng.choice(fillers).format(name=f"{suffix}_{index}")
+            for index in range(rng.randint(2, 12))
+        )
+        unit = wrap(rename(suffix), filler)
+        parts.append('\n' + unit)
+        lines += unit.count('\n') + 1
+        contracts += 1
+
+    parts.append('\n' + case)
+    code = ''.join(parts)
+    return GeneratedSource(language, code, code.count('\n') + 1, contracts)
+
+
+def generate_solidity(target_lines: int, seed: int = 0, pathological: bool = False) -> GeneratedSource:
+    """
+    Generate a flattened Solidity source of about target_lines lines.
+
+    Args:
+        target_lines: Minimum number of lines to generate (e.g. 1,000 - 200,000)
+        seed: Seed for the filler selection, making the output reproducible
+        pathological: Include inputs that make the regexes backtrack heavily
+
+    Returns:
+        The generated source
+    """
+    return _generate('solidity', target_lines, seed, pathological)
+
+
+def generate_anchor(target_lines: int, seed: int = 0, pathological: bool = False) -> GeneratedSource:
+    """
+    Generate an Anchor (Solana) program source of about target_lines lines.
+
+    Args:
+        target_lines: Minimum number of lines to generate (e.g. 1,000 - 200,000)
+        seed: Seed for the filler selection, making the output reproducible
+        pathological: Include inputs that make the regexes backtrack heavily
+
+    Returns:
+        The generated source
+    """
+    return _generate('anchor', target_lines, seed, pathological)
+
+
+def generate(language: str, target_lines: int, seed: int = 0, pathological: bool = False) -> GeneratedSource:
+    """Generate a source in the given language ("solidity" or "anchor")."""
+    return _generate(language, target_lines, seed, pathological)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a large synthetic contract source")
+    parser.add_argument('--language', choices=LANGUAGES, default='solidity')
+    parser.add_argument('--lines', type=int, default=10000, help="Minimum number of lines")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--pathological', action='store_true',
+                        help="Include inputs that make the regexes backtrack heavily")
+    args = parser.parse_args()
+
+    source = generate(args.language, args.lines, args.seed, args.pathological)
+    sys.stdout.write(source.code)
+    print(f"Generated {source.lines:,} lines, {source.contracts:,} contracts", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
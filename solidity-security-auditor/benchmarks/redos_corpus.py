@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Pathological-input corpus for the Solidity regex detectors.
+
+Each case targets a pattern that used to backtrack super-linearly on large
+flattened sources. The script times the legacy form of each pattern against
+the current one on the same input, checks the current scan stays within its
+budget, and verifies that the rewritten patterns report exactly the same
+matches as the legacy ones on the example contracts.
+
+Usage:
+    python benchmarks/redos_corpus.py --size 3000
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from detectors import VulnerabilityDetector, SOLIDITY_REGEX_FLAGS
+from scan_engine import ScanStats
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'examples')
+
+# Pattern forms before the linear-time rewrites, kept for comparison
+LEGACY_PATTERNS = {
+    'reentrancy': r'(?:\.call(?:\.value)?\s*\(|\.send\s*\(|\.transfer\s*\()(?:[^;]*?)(?:before|prior to)(?:[^;]*?)(?:balance|state)',
+    'access_control': r'function\s+\w+\s*\([^)]*\)\s*(?:public|external)(?!\s+(?:view|pure))(?![^{]*(?:onlyOwner|require\s*\(.*msg\.sender|modifier\s+\w+))',
+    'integer_overflow': r'pragma\s+solidity\s+[^;]*[0-6]\.[0-7]\.\d+(?:[^{]*(?:\+\+|--|\+=|-=|\*=|/=))',
+    'uninitialized_storage': r'(?:struct|mapping)(?:[^;]*?)(?:storage)(?:[^;=]*?)(?:;)',
+}
+
+
+def pathological_cases(size: int):
+    """
+    Yield (pattern_name, source) pairs that trigger heavy backtracking.
+
+    Args:
+        size: Repetition count controlling the input length
+    """
+    # Many "before" keywords in one statement and no balance/state before the ';'
+    # (the '.balance' after it satisfies the prefilter without ending the match)
+    yield 'reentrancy', 'x.call(' + 'before ' * size + '; y.balance;'
+    # A public function header followed by many require( tokens and no msg.sender
+    yield 'access_control', 'function f() public ' + 'require( ' * size + '{'
+    # Many version numbers in a pragma and no arithmetic operator before '{'
+    # (the '++' after it satisfies the prefilter without ending the match)
+    yield 'integer_overflow', 'pragma solidity ' + '0.6.0 ' * size + ';' + ' x' * size + '{ x++; }'
+    # Many storage keywords with a single '=' before the ';'
+    yield 'uninitialized_storage', 'struct S ' + 'storage ' * size + '= ;'
+
+
+def example_sources():
+    """Yield the example contracts and a few synthetic edge cases."""
+    for name in sorted(os.listdir(EXAMPLES_DIR)):
+        with open(os.path.join(EXAMPLES_DIR, name), 'r', encoding='utf-8') as f:
+            yield f.read()
+    yield 'pragma solidity 0.6.12; pragma solidity 0.5.0;\nuint x; x += 1; contract A {'
+    yield 'a.call(x) before balance; b.send(1) prior to update the state;'
+    yield 'mapping(uint => S) storage s = t; struct T storage u; struct V storage w = x storage y;'
+    yield 'function f(uint a) external require(a) msg.sender {\n}\nfunction g() public onlyOwner {}'
+
+
+def timed(func):
+    """Run func and return (result, seconds)."""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the pathological regex corpus")
+    parser.add_argument('--size', type=int, default=3000, help="Repetitions per pathological input")
+    args = parser.parse_args()
+
+    detector = VulnerabilityDetector()
+    engine = detector.compiled_patterns.engine
+    failures = 0
+
+    print("🔁 Equivalence of rewritten patterns on example sources")
+    for name, legacy in LEGACY_PATTERNS.items():
+        legacy_regex = re.compile(legacy, SOLIDITY_REGEX_FLAGS)
+        current_regex = detector.compiled_patterns.regexes[name]
+        for code in example_sources():
+            legacy_spans = [m.span() for m in legacy_regex.finditer(code)]
+            current_spans = [m.span() for m in current_regex.finditer(code)]
+            if legacy_spans != current_spans:
+                failures += 1
+                print(f"   ❌ {name}: {legacy_spans} != {current_spans}")
+    print("   ✅ done" if not failures else f"   ❌ {failures} mismatches")
+
+    print(f"\n⏱️  Pathological inputs (size={args.size})")
+    print(f"{'pattern':<24} {'bytes':>9} {'legacy (s)':>11} {'current (s)':>12} {'timed out':>10}")
+    for name, code in pathological_cases(args.size):
+        legacy_regex = re.compile(LEGACY_PATTERNS[name], SOLIDITY_REGEX_FLAGS)
+        _, legacy_time = timed(lambda: list(legacy_regex.finditer(code)))
+        stats = ScanStats()
+        _, current_time = timed(lambda: engine.scan(code, stats))
+        print(f"{name:<24} {len(code):>9,} {legacy_time:>11.4f} {current_time:>12.4f} "
+              f"{'yes' if name in stats.timed_out_rules else 'no':>10}")
+        if name in stats.skipped_rules:
+            print(f"   ❌ {name}: skipped by the literal prefilter, so the timing measures nothing")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+End-to-end detector benchmark on synthetic large sources.
+
+Generates Solidity and Anchor sources of the requested sizes (see
+generator.py) and analyzes each one in a fresh process, so that peak RSS
+belongs to that case alone. Reports throughput in lines and contracts per
+second, peak RSS, the number of findings and the most expensive detectors.
+Results can be saved as a baseline and later runs compared against it;
+the script exits with status 1 when a case regresses beyond the tolerance.
+
+Slither is not run unless --slither is given, so results measure the
+regex detectors and stay comparable between machines with and without it.
+
+Usage:
+    python benchmarks/run_benchmarks.py --sizes 1000 10000 100000 --save-baseline baseline.json
+    python benchmarks/run_benchmarks.py --sizes 1000 10000 100000 --baseline baseline.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Not available on Windows; peak RSS is then not reported
+
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.generator import LANGUAGES, generate
+
+
+def clear_source_caches() -> None:
+    """Drop the per-source caches so every run analyzes the source cold."""
+    from detectors import mask_comments_and_strings
+    from solidity_lexer import get_token_stream
+    from source_index import get_source_index
+    from source_structure import get_structure_index
+
+    for cached in (mask_comments_and_strings, get_token_stream, get_source_index, get_structure_index):
+        cached.cache_clear()
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MiB, if it can be measured."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_case(language: str, lines: int, pathological: bool, seed: int,
+             repeat: int, slither: bool) -> Dict:
+    """
+    Generate and analyze one case; meant to run in its own process.
+
+    Returns:
+        Measurements of the fastest of ``repeat`` cold runs
+    """
+    from blockchain_detectors import MultiBlockchainDetector, SolanaDetector
+    from detectors import VulnerabilityDetector
+    from scan_engine import ScanStats
+
+    source = generate(language, lines, seed, pathological)
+    if slither:
+        detector = MultiBlockchainDetector()
+        analyze = lambda code, stats: detector.analyze(code, stats=stats)[0]
+    elif language == 'solidity':
+        analyze = VulnerabilityDetector()._detect_with_regex
+    else:
+        analyze = SolanaDetector().analyze
+
+    best = None
+    for _ in range(repeat):
+        clear_source_caches()
+        stats = ScanStats()
+        started = time.perf_counter()
+        findings = analyze(source.code, stats)
+        seconds = time.perf_counter() - started
+        if best is None or seconds < best[0]:
+            best = (seconds, stats, len(findings))
+
+    seconds, stats, finding_count = best
+    return {
+        'language': language,
+        'lines': source.lines,
+        'contracts': source.contracts,
+        'bytes': len(source.code),
+        'pathological': pathological,
+        'seconds': seconds,
+        'lines_per_second': source.lines / seconds,
+        'contracts_per_second': source.contracts / seconds,
+        'peak_rss_mb': peak_rss_mb(),
+        'findings': finding_count,
+        'timed_out_rules': stats.timed_out_rules,
+        'profile': stats.profile(),
+    }
+
+
+def case_id(language: str, lines: int, pathological: bool) -> str:
+    return f"{language}-{lines}" + ("-pathological" if pathological else "")
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """
+    Compare results with a baseline.
+
+    Args:
+        results: Current results keyed by case id
+        baseline: Baseline results keyed by case id
+        tolerance: Allowed relative slowdown or memory growth (0.25 = 25%)
+
+    Returns:
+        Descriptions of the regressions found
+    """
+    regressions = []
+    print(f"\n{'case':<28} {'lines/s':>10} {'baseline':>10} {'change':>8} {'RSS change':>11}")
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"{name:<28} {'(not in baseline)':>30}")
+            continue
+
+        speed = result['lines_per_second'] / previous['lines_per_second']
+        rss = None
+        if result['peak_rss_mb'] and previous.get('peak_rss_mb'):
+            rss = result['peak_rss_mb'] / previous['peak_rss_mb']
+        rss_text = f"{rss - 1:>+10.0%}" if rss is not None else f"{'n/a':>10}"
+        print(f"{name:<28} {result['lines_per_second']:>10,.0f} {previous['lines_per_second']:>10,.0f} "
+              f"{speed - 1:>+8.0%} {rss_text}")
+
+        if speed < 1 - tolerance:
+            regressions.append(f"{name}: throughput {speed - 1:+.0%}")
+        if rss is not None and rss > 1 + tolerance:
+            regressions.append(f"{name}: peak RSS {rss - 1:+.0%}")
+        if result['findings'] != previous['findings']:
+            regressions.append(f"{name}: {result['findings']} findings (baseline {previous['findings']})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the detectors on synthetic large sources")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000],
+                        help="Source sizes in lines (1,000 - 200,000)")
+    parser.add_argument('--languages', nargs='+', choices=LANGUAGES, default=list(LANGUAGES))
+    parser.add_argument('--pathological', action='store_true',
+                        help="Also run every size with inputs that make the regexes backtrack heavily")
+    parser.add_argument('--seed', type=int, default=0, help="Generator seed")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per case (the fastest is kept)")
+    parser.add_argument('--slither', action='store_true', help="Run the full analysis including Slither")
+    parser.add_argument('--top', type=int, default=5, help="Detectors listed per case in the breakdown")
+    parser.add_argument('--baseline', help="Compare against results saved with --save-baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Allowed slowdown or memory growth against the baseline")
+    parser.add_argument('--save-baseline', help="Save the results as a baseline JSON file")
+    args = parser.parse_args()
+
+    cases = [
+        (language, lines, pathological)
+        for language in args.languages
+        for lines in args.sizes
+        for pathological in ((False, True) if args.pathological else (False,))
+    ]
+
+    results = {}
+    print(f"{'case':<28} {'lines':>8} {'time (s)':>9} {'lines/s':>10} {'contracts/s':>12} "
+          f"{'peak RSS':>10} {'findings':>9}")
+    for language, lines, pathological in cases:
+        # A fresh process per case keeps peak RSS and warm caches from leaking between cases
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+            result = pool.submit(run_case, language, lines, pathological,
+                                 args.seed, args.repeat, args.slither).result()
+        name = case_id(language, lines, pathological)
+        results[name] = result
+        rss = f"{result['peak_rss_mb']:.0f} MiB" if result['peak_rss_mb'] is not None else "n/a"
+        print(f"{name:<28} {result['lines']:>8,} {result['seconds']:>9.3f} "
+              f"{result['lines_per_second']:>10,.0f} {result['contracts_per_second']:>12,.1f} "
+              f"{rss:>10} {result['findings']:>9,}")
+        if result['timed_out_rules']:
+            print(f"    ⚠️  timed out: {', '.join(result['timed_out_rules'])}")
+
+    print("\nPer-detector breakdown (ms, matches, bytes scanned):")
+    for name, result in results.items():
+        print(f"  {name}")
+        for detector_id, data in list(result['profile']['detectors'].items())[:args.top]:
+            print(f"    {detector_id:<40} {data['wall_time'] * 1000:>9.2f} "
+                  f"{data['matches']:>7,} {data['bytes_scanned']:>12,}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump({'seed': args.seed, 'cases': results}, f, indent=2)
+        print(f"\n💾 Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('seed') != args.seed:
+            print(f"⚠️  Baseline was generated with seed {baseline.get('seed')}, not {args.seed}")
+        regressions = compare(results, baseline['cases'], args.tolerance)
+        if regressions:
+            print("\n❌ Regressions:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print("\n✅ No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
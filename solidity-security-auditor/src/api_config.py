@@ -39,12 +39,22 @@ class APIConfig:
             'snowtrace': None,     # Avalanche still uses V1
         }
         
-        # Rate limits (requests per second)
+        # Rate limits (seconds between requests)
         self.rate_limits = {
             'etherscan': 0.2,  # 5 req/sec with free key
             'bscscan': 0.2,
             'polygonscan': 0.2,
             'snowtrace': 0.2,
+            'solana': 0.2,
+        }
+        
+        # Requests allowed back to back before the rate limit applies
+        self.rate_bursts = {
+            'etherscan': 5,
+            'bscscan': 5,
+            'polygonscan': 5,
+            'snowtrace': 5,
+            'solana': 5,
         }
     
     def get_api_key(self, service: str) -> str:
@@ -59,6 +69,10 @@ class APIConfig:
         """Get rate limit for a service."""
         return self.rate_limits.get(service, 0.2)
     
+    def get_rate_burst(self, service: str) -> int:
+        """Get the number of requests a service allows back to back."""
+        return self.rate_bursts.get(service, 1)
+    
     def get_chain_id(self, service: str) -> Optional[str]:
         """Get chain ID for V2 API services."""
         return self.chain_ids.get(service)
@@ -17,11 +17,12 @@ Author: Security Education Project
 License: MIT (Educational Use)
 """
 
+import argparse
 import os
 import sys
+import time
 import json
 import hashlib
-import requests
 import re
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
@@ -41,14 +42,21 @@ except ImportError as e:
     print("Please install requirements: pip install -r requirements.txt")
     sys.exit(1)
 
-from detectors import VulnerabilityDetector, Finding
+from detectors import VulnerabilityDetector, Finding, FINDING_CATALOG, compare_findings, sort_by_severity
 from reporter import SecurityReporter
 from blockchain_detectors import MultiBlockchainDetector, BlockchainType, BlockchainContext
 from contract_fetcher import ContractSourceFetcher, ContractInfo
+from scan_engine import ScanStats
+from cache_store import SQLiteCache
+from http_client import get_http_client
 from verified_contracts import get_example_contracts, suggest_contract
 from api_config import api_config
 
 
+# Whole-analysis results keyed by source, chain and detector fingerprint
+ANALYSIS_CACHE_FILE = 'analysis_results.sqlite'
+
+
 class MultiBlockchainAuditor:
     """
     Main CLI interface for the Multi-Blockchain Security Auditor.
@@ -59,12 +67,19 @@ class MultiBlockchainAuditor:
     blockchain-specific security vulnerabilities.
     """
     
-    def __init__(self):
+    def __init__(self, profile: bool = False):
+        """
+        Args:
+            profile: Print per-detector timings after every analysis
+        """
         self.console = Console()
+        self.profile = profile
         self.detector = VulnerabilityDetector()  # Legacy Solidity detector
         self.multi_detector = MultiBlockchainDetector()  # New multi-blockchain detector
-        self.contract_fetcher = ContractSourceFetcher()  # Contract address fetcher
+        self.http = get_http_client()  # Pooled keep-alive connections shared with the fetcher
+        self.contract_fetcher = ContractSourceFetcher(self.http)  # Contract address fetcher
         self.reporter = SecurityReporter()
+        self.analysis_cache = SQLiteCache(ANALYSIS_CACHE_FILE)  # Results of previous analyses
         self.reports_dir = Path("reports")
         self.reports_dir.mkdir(exist_ok=True)
         
@@ -340,7 +355,9 @@ Listed 6 option(s).
         self.console.print(f"[yellow]📍 Fetching contract source for address: {address}[/yellow]")
         
         # Fetch contract information
+        fetch_started = time.perf_counter()
         contract_info = self.contract_fetcher.fetch_contract_source(address)
+        fetch_time = time.perf_counter() - fetch_started
         
         if not contract_info:
             self.console.print("[red]❌ Could not fetch contract source code[/red]")
@@ -362,7 +379,8 @@ Listed 6 option(s).
         
         # Perform analysis
         source_description = f"{contract_info.contract_name} ({contract_info.blockchain.value.title()})"
-        self._analyze_code(contract_info.source_code, source_description, contract_info.explorer_url)
+        self._analyze_code(contract_info.source_code, source_description, contract_info.explorer_url,
+                           fetch_time=fetch_time)
     
     def _analyze_contract_url(self, url: str) -> None:
         """Analyze contract from URL (existing functionality)."""
@@ -373,6 +391,7 @@ Listed 6 option(s).
             
             code = None
             source_description = url
+            fetch_started = time.perf_counter()
             
             if 'etherscan' in domain:
                 code, source_description = self._fetch_from_etherscan(url)
@@ -389,7 +408,8 @@ Listed 6 option(s).
                 code, source_description = self._fetch_raw_content(url)
             
             if code:
-                self._analyze_code(code, source_description, url)
+                self._analyze_code(code, source_description, url,
+                                   fetch_time=time.perf_counter() - fetch_started)
             else:
                 self.console.print("[red]❌ Could not fetch contract code from URL[/red]")
                 
@@ -421,7 +441,7 @@ Listed 6 option(s).
             self.console.print(f"[yellow]📥 Fetching contract {contract_address} from Etherscan...[/yellow]")
             
             # Try to fetch the page and extract source code
-            response = requests.get(url, timeout=10)
+            response = self.http.get(url, timeout=10)
             if response.status_code == 200:
                 # Simple extraction - in production, use Etherscan API
                 # Look for contract code in the page
@@ -458,7 +478,7 @@ Listed 6 option(s).
                 self.console.print(f"[yellow]📥 Fetching BSC contract: {address}[/yellow]")
                 
                 # Try to get source code (would need API key in production)
-                response = requests.get(url, timeout=10)
+                response = self.http.get(url, timeout=10)
                 if response.status_code == 200:
                     # This is a simplified approach - in production, use BSCScan API
                     return None, f"BSCScan: {address} (API key required for full support)"
@@ -481,7 +501,7 @@ Listed 6 option(s).
                 self.console.print(f"[yellow]📥 Fetching Polygon contract: {address}[/yellow]")
                 
                 # Try to get source code (would need API key in production)
-                response = requests.get(url, timeout=10)
+                response = self.http.get(url, timeout=10)
                 if response.status_code == 200:
                     # This is a simplified approach - in production, use PolygonScan API
                     return None, f"PolygonScan: {address} (API key required for full support)"
@@ -529,7 +549,7 @@ Listed 6 option(s).
         try:
             self.console.print(f"[yellow]📥 Fetching content from: {url}[/yellow]")
             
-            response = requests.get(url, timeout=10)
+            response = self.http.get(url, timeout=10)
             if response.status_code == 200:
                 content = response.text
                 
@@ -547,7 +567,8 @@ Listed 6 option(s).
             self.console.print(f"[red]❌ Error fetching content: {e}[/red]")
             return None, url
     
-    def _analyze_code(self, code: str, source: str, url: str = "") -> None:
+    def _analyze_code(self, code: str, source: str, url: str = "",
+                      fetch_time: Optional[float] = None) -> None:
         """
         Perform multi-blockchain security analysis on smart contract code.
         
@@ -555,7 +576,11 @@ Listed 6 option(s).
             code: The smart contract source code to analyze
             source: Description of the code source (file path, clipboard, etc.)
             url: Optional URL context for blockchain detection
+            fetch_time: Seconds spent fetching the code, if it was downloaded
         """
+        scan_stats = ScanStats()
+        if fetch_time is not None:
+            scan_stats.record_stage('fetch', fetch_time)
         self.console.print(f"\n[yellow]🔍 Analyzing: {source}[/yellow]")
         
         with Progress(
@@ -568,13 +593,56 @@ Listed 6 option(s).
             # Generate code hash for tracking
             code_hash = hashlib.sha256(code.encode()).hexdigest()[:16]
             
-            # Perform multi-blockchain analysis
-            findings, blockchain_context = self.multi_detector.analyze(code, url)
+            # Reuse the stored analysis of an identical source
+            cache_key = self._analysis_cache_key(code, url)
+            cached = self.analysis_cache.get(cache_key)
+            
+            if cached is not None:
+                findings = [Finding.from_dict(finding, cached.get('detector_catalog'), code)
+                            for finding in cached['findings']]
+                blockchain_context = BlockchainContext.from_dict(cached['context'])
+                skip_rate = cached['prefilter_skip_rate']
+            else:
+                # Perform multi-blockchain analysis, counting findings as they stream in
+                analysis_started = time.perf_counter()
+                blockchain_context = self.multi_detector.detect_blockchain_type(code, url)
+                findings = []
+                for finding in self.multi_detector.analyze_iter(code, url, stats=scan_stats,
+                                                                context=blockchain_context):
+                    findings.append(finding)
+                    progress.update(task, description=f"Running security analysis... {len(findings)} findings so far")
+                findings = sort_by_severity(findings)
+                scan_stats.record_stage('analysis', time.perf_counter() - analysis_started)
+                skip_rate = scan_stats.skip_rate
+                # Partial results (a detector timed out, Slither failed or
+                # overran) would be served until a pattern changes
+                if scan_stats.complete:
+                    self.analysis_cache.set(cache_key, {
+                        'detector_catalog': FINDING_CATALOG.to_dict(f.detector_id for f in findings),
+                        # Snippets are rebuilt from the source on a hit, so only their lines are stored
+                        'findings': [f.to_compact_dict(snippet_ref=True) for f in findings],
+                        'context': blockchain_context.to_dict(),
+                        'prefilter_skip_rate': skip_rate
+                    })
             
             progress.update(task, description="Analysis complete!")
         
+        if cached is not None:
+            self.console.print("[dim]♻️  Loaded cached results for identical source[/dim]")
+        else:
+            self.console.print(
+                f"[dim]⚡ Prefilter skipped {scan_stats.rules_skipped}/{scan_stats.rules_total} "
+                f"detectors ({scan_stats.skip_rate:.0%})[/dim]"
+            )
+            if not scan_stats.complete:
+                self.console.print("[dim]⚠️  Analysis incomplete; results were not cached[/dim]")
+        
         # Display results with blockchain context
         self._display_analysis_results(findings, source, code_hash, blockchain_context)
+        self._display_baseline_comparison(findings, source, code_hash)
+        profile = scan_stats.profile()
+        if self.profile:
+            self._display_profile(profile, cached=cached is not None)
         
         # Save to history
         analysis_record = {
@@ -584,14 +652,35 @@ Listed 6 option(s).
             'findings_count': len(findings),
             'critical_count': len([f for f in findings if f.severity == 'Critical']),
             'high_count': len([f for f in findings if f.severity == 'High']),
-            'findings': [f.to_dict() for f in findings]
+            'prefilter_skip_rate': skip_rate,
+            'profile': profile,
+            # Enough to compare later versions of the source without building snippets
+            'fingerprints': [f.fingerprint for f in findings]
         }
         self.analysis_history.append(analysis_record)
         
         # Offer to generate report
         if findings:
             if Confirm.ask("\n📄 Generate detailed security report?", default=True):
-                self._generate_report(code, findings, source, code_hash)
+                self._generate_report(code, findings, source, code_hash, profile)
+    
+    def _analysis_cache_key(self, code: str, url: str = "") -> str:
+        """
+        Build the analysis cache key for a source.
+        
+        Args:
+            code: The smart contract source code
+            url: Optional URL context used for blockchain detection
+            
+        Returns:
+            Hex digest of the source, the detected chain and the detector fingerprint
+        """
+        payload = json.dumps({
+            'code': hashlib.sha256(code.encode()).hexdigest(),
+            'blockchain': self.multi_detector.detect_blockchain_type(code, url).blockchain.value,
+            'detectors': self.multi_detector.fingerprint
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
     
     def _display_analysis_results(self, findings: List[Finding], source: str, code_hash: str, 
                                  blockchain_context: Optional[BlockchainContext] = None) -> None:
@@ -626,7 +715,8 @@ Listed 6 option(s).
             self.console.print("[green]✅ No security issues detected![/green]")
             return
         
-        # Summary statistics
+        # Summary statistics, and the findings in display order (sorted once)
+        ordered_findings = sort_by_severity(findings)
         severity_counts = {}
         for finding in findings:
             severity_counts[finding.severity] = severity_counts.get(finding.severity, 0) + 1
@@ -679,7 +769,7 @@ Listed 6 option(s).
             findings_table.add_column("Line", width=6, justify="center")
             findings_table.add_column("Description", width=50)
             
-            for finding in sorted(findings, key=lambda x: ['Critical', 'High', 'Medium', 'Low', 'Info'].index(x.severity)):
+            for finding in ordered_findings:
                 color = severity_colors.get(finding.severity, 'white')
                 findings_table.add_row(
                     f"[{color}]{finding.severity}[/{color}]",
@@ -698,7 +788,7 @@ Listed 6 option(s).
             findings_table.add_column("Line", width=5, justify="center")
             findings_table.add_column("Description", width=35)
             
-            for finding in sorted(findings, key=lambda x: ['Critical', 'High', 'Medium', 'Low', 'Info'].index(x.severity)):
+            for finding in ordered_findings:
                 color = severity_colors.get(finding.severity, 'white')
                 findings_table.add_row(
                     f"[{color}]{finding.severity[:4]}[/{color}]",
@@ -712,7 +802,7 @@ Listed 6 option(s).
         else:
             # Minimal list for small screens
             self.console.print("[bold]🔍 Issues:[/bold]")
-            for i, finding in enumerate(sorted(findings, key=lambda x: ['Critical', 'High', 'Medium', 'Low', 'Info'].index(x.severity))[:5], 1):
+            for i, finding in enumerate(ordered_findings[:5], 1):
                 color = severity_colors.get(finding.severity, 'white')
                 line_info = f"L{finding.line_number}" if finding.line_number else "N/A"
                 self.console.print(f"{i}. [{color}]{finding.severity[:4]}[/{color}] {finding.vulnerability_type[:15]} ({line_info})")
@@ -720,7 +810,61 @@ Listed 6 option(s).
             if len(findings) > 5:
                 self.console.print(f"... and {len(findings) - 5} more issues")
     
-    def _generate_report(self, code: str, findings: List[Finding], source: str, code_hash: str) -> None:
+    def _display_baseline_comparison(self, findings: List[Finding], source: str, code_hash: str) -> None:
+        """Compare findings with the latest earlier analysis of a different version of the same source."""
+        baseline = next((
+            record for record in reversed(self.analysis_history)
+            if record['source'] == source and record['code_hash'] != code_hash
+        ), None)
+        if baseline is None:
+            return
+        
+        comparison = compare_findings(findings, baseline['fingerprints'])
+        self.console.print(
+            f"[dim]🔁 Compared with previous analysis ({baseline['code_hash']}): "
+            f"{len(comparison['new'])} new, {len(comparison['fixed'])} fixed, "
+            f"{len(comparison['unchanged'])} unchanged[/dim]"
+        )
+    
+    def _display_profile(self, profile: Dict[str, Dict], cached: bool = False, limit: int = 15) -> None:
+        """
+        Display where an analysis spent its time.
+        
+        Args:
+            profile: ScanStats.profile() of the analysis
+            cached: Whether the findings were loaded from the analysis cache
+            limit: Maximum number of detectors to list
+        """
+        if cached:
+            self.console.print("[dim]⏱️  Results were cached; no detectors ran[/dim]")
+        
+        detectors = list(profile['detectors'].items())
+        if detectors:
+            profile_table = Table(title="⏱️ Detector Profile", show_header=True)
+            profile_table.add_column("Detector", width=40)
+            profile_table.add_column("Time (ms)", justify="right")
+            profile_table.add_column("Matches", justify="right")
+            profile_table.add_column("Bytes", justify="right")
+            profile_table.add_column("Skipped", justify="center")
+            
+            for detector_id, data in detectors[:limit]:
+                profile_table.add_row(
+                    detector_id,
+                    f"{data['wall_time'] * 1000:.2f}",
+                    str(data['matches']),
+                    f"{data['bytes_scanned']:,}",
+                    "yes" if data['skipped'] == data['runs'] else ""
+                )
+            self.console.print(profile_table)
+            if len(detectors) > limit:
+                self.console.print(f"[dim]... and {len(detectors) - limit} more detectors[/dim]")
+        
+        if profile['stages']:
+            stages = " | ".join(f"{stage}: {seconds * 1000:.1f} ms" for stage, seconds in profile['stages'].items())
+            self.console.print(f"[dim]Stages: {stages}[/dim]")
+    
+    def _generate_report(self, code: str, findings: List[Finding], source: str, code_hash: str,
+                         profile: Optional[Dict] = None) -> None:
         """Generate and save a detailed security report."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         report_filename = f"security_report_{code_hash}_{timestamp}.md"
@@ -743,9 +887,11 @@ Listed 6 option(s).
                     'timestamp': datetime.now().isoformat(),
                     'source': source,
                     'code_hash': code_hash,
-                    'tool_version': '1.0.0'
+                    'tool_version': '1.0.0',
+                    'profile': profile
                 },
-                'findings': [f.to_dict() for f in findings],
+                'detector_catalog': FINDING_CATALOG.to_dict(f.detector_id for f in findings),
+                'findings': [f.to_compact_dict() for f in findings],
                 'summary': {
                     'total_findings': len(findings),
                     'by_severity': {
@@ -941,8 +1087,13 @@ Listed 6 option(s).
 
 def main():
     """Entry point for the application."""
+    parser = argparse.ArgumentParser(description="PANDA WEB3 Multi-Blockchain Security Auditor")
+    parser.add_argument('--profile', action='store_true',
+                        help="show per-detector time, match count and bytes scanned after each analysis")
+    args = parser.parse_args()
+    
     try:
-        auditor = MultiBlockchainAuditor()
+        auditor = MultiBlockchainAuditor(profile=args.profile)
         auditor.run()
     except Exception as e:
         print(f"❌ Failed to start application: {e}")
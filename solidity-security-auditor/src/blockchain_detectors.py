@@ -11,13 +11,23 @@ EDUCATIONAL PURPOSE: This tool helps developers learn about blockchain-specific
 Use only for authorized security assessments and educational purposes.
 """
 
-import re
+import json
+import time
+import hashlib
 import logging
-from typing import List, Dict, Optional, Tuple, Any
+from typing import Iterator, List, Dict, Optional, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
 
-from detectors import Finding, VulnerabilityDetector
+from source_index import get_source_index
+from detectors import (
+    Finding, VulnerabilityDetector, CompiledPatternSet, LINE_REGEX_FLAGS,
+    get_compiled_patterns, register_pattern_metadata, detector_timeout_finding, mask_comments_and_strings,
+    get_slither_version, get_solc_version, finding_key, sort_by_severity,
+    severity_ordered_patterns, estimated_slither_duration, get_slither_executor, SEVERITY_ORDER
+)
+from scan_engine import ScanStats
+from slither_pool import SlitherWorkerPool
 
 
 class BlockchainType(Enum):
@@ -37,6 +47,25 @@ class BlockchainContext:
     language: str  # e.g., "solidity", "rust", "anchor"
     version: Optional[str] = None
     framework: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert context to dictionary for JSON serialization."""
+        return {
+            'blockchain': self.blockchain.value,
+            'language': self.language,
+            'version': self.version,
+            'framework': self.framework
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BlockchainContext":
+        """Rebuild a context serialized with to_dict()."""
+        return cls(
+            blockchain=BlockchainType(data['blockchain']),
+            language=data['language'],
+            version=data.get('version'),
+            framework=data.get('framework')
+        )
 
 
 class SolanaDetector:
@@ -44,12 +73,19 @@ class SolanaDetector:
     
     def __init__(self):
         self.patterns = self._initialize_solana_patterns()
+        self.compiled_patterns = get_compiled_patterns('solana', self.patterns, LINE_REGEX_FLAGS, line_mode=True)
+        self.metadata = register_pattern_metadata('solana', {
+            # SWC is Solidity-specific
+            name: dict(data, swc_id=None) for name, data in self.patterns.items()
+        })
     
     def _initialize_solana_patterns(self) -> Dict[str, Dict[str, Any]]:
         """Initialize Solana-specific vulnerability patterns."""
         return {
             "missing_signer_check": {
                 "pattern": r"(?:instruction|ctx)\.accounts\.(?!.*\.is_signer).*\.key(?!\s*==\s*ctx\.accounts\.signer\.key)",
+                "anchors": ["instruction.accounts.", "ctx.accounts."],
+                "requires": [[".key"]],
                 "severity": "High",
                 "description": "Missing signer verification",
                 "explanation": "Solana programs must verify that accounts are properly signed",
@@ -59,6 +95,8 @@ class SolanaDetector:
             },
             "unchecked_account_ownership": {
                 "pattern": r"(?:instruction|ctx)\.accounts\..*\.owner(?!\s*==)",
+                "anchors": ["instruction.accounts.", "ctx.accounts."],
+                "requires": [[".owner"]],
                 "severity": "High", 
                 "description": "Unchecked account ownership",
                 "explanation": "Account ownership should be verified to prevent unauthorized access",
@@ -68,6 +106,7 @@ class SolanaDetector:
             },
             "integer_overflow_rust": {
                 "pattern": r"(?:checked_add|checked_sub|checked_mul|checked_div)\s*\(",
+                "anchors": ["checked_add", "checked_sub", "checked_mul", "checked_div"],
                 "severity": "Medium",
                 "description": "Potential integer operation without overflow check",
                 "explanation": "Rust requires explicit overflow handling in financial operations",
@@ -77,6 +116,7 @@ class SolanaDetector:
             },
             "unsafe_deserialization": {
                 "pattern": r"(?:try_from_slice_unchecked|from_bytes_unchecked)",
+                "anchors": ["try_from_slice_unchecked", "from_bytes_unchecked"],
                 "severity": "High",
                 "description": "Unsafe deserialization",
                 "explanation": "Unchecked deserialization can lead to memory corruption",
@@ -86,6 +126,8 @@ class SolanaDetector:
             },
             "missing_rent_exemption": {
                 "pattern": r"AccountInfo.*new.*rent",
+                "anchors": ["AccountInfo"],
+                "requires": [["new"], ["rent"]],
                 "severity": "Medium",
                 "description": "Potential rent exemption issue",
                 "explanation": "Accounts should be rent-exempt to avoid being cleaned up",
@@ -94,6 +136,8 @@ class SolanaDetector:
             },
             "uninitialized_account": {
                 "pattern": r"\.data\.borrow\(\).*is_empty\(\)",
+                "anchors": [".data.borrow()"],
+                "requires": [["is_empty()"]],
                 "severity": "High",
                 "description": "Uninitialized account access",
                 "explanation": "Accessing uninitialized accounts can lead to undefined behavior",
@@ -102,6 +146,8 @@ class SolanaDetector:
             },
             "missing_bump_validation": {
                 "pattern": r"find_program_address.*seeds",
+                "anchors": ["find_program_address"],
+                "requires": [["seeds"]],
                 "severity": "Medium",
                 "description": "Potential missing bump seed validation",
                 "explanation": "PDA bump seeds should be validated to ensure canonical addresses",
@@ -110,39 +156,51 @@ class SolanaDetector:
             }
         }
     
-    def analyze(self, code: str) -> List[Finding]:
+    def analyze(self, code: str, stats: Optional[ScanStats] = None) -> List[Finding]:
         """Analyze Rust/Anchor code for Solana-specific vulnerabilities."""
-        findings = []
-        lines = code.split('\n')
+        return list(self.analyze_iter(code, stats))
+    
+    def analyze_iter(self, code: str, stats: Optional[ScanStats] = None,
+                     pattern_names: Optional[List[str]] = None) -> Iterator[Finding]:
+        """Yield Solana-specific findings pattern by pattern (optionally only the named ones, in order)."""
+        source_index = get_source_index(code)
+        matches = self.compiled_patterns.engine.iter_scan(
+            mask_comments_and_strings(code, 'rust'), stats, rule_ids=pattern_names
+        )
         
-        for pattern_name, pattern_data in self.patterns.items():
-            pattern = re.compile(pattern_data["pattern"], re.IGNORECASE | re.MULTILINE)
+        for pattern_name, spans, timed_out in matches:
+            metadata = self.metadata[pattern_name]
+            for line_start, _ in spans:
+                line_num = source_index.line_of(line_start)
+                yield Finding.from_metadata(
+                    metadata,
+                    line_number=line_num,
+                    code_snippet=source_index.snippet_ref(line_num, before=0, after=0, strip=True)
+                )
             
-            for line_num, line in enumerate(lines, 1):
-                if pattern.search(line):
-                    finding = Finding(
-                        vulnerability_type=pattern_data["type"],
-                        severity=pattern_data["severity"],
-                        line_number=line_num,
-                        code_snippet=line.strip(),
-                        description=pattern_data["description"],
-                        explanation=pattern_data["explanation"],
-                        recommendation=pattern_data["recommendation"],
-                        cwe_id=pattern_data.get("cwe_id"),
-                        swc_id=None  # SWC is Solidity-specific
-                    )
-                    findings.append(finding)
-        
-        return findings
+            if timed_out:
+                yield detector_timeout_finding(pattern_name)
 
 
 class MultiBlockchainDetector:
     """Multi-blockchain vulnerability detector that combines platform-specific detectors."""
     
-    def __init__(self):
-        self.solidity_detector = VulnerabilityDetector()
+    def __init__(self, slither_pool: Optional[SlitherWorkerPool] = None):
+        """
+        Args:
+            slither_pool: Optional pool of warm Slither workers shared with the
+                Solidity detector
+        """
+        self.solidity_detector = VulnerabilityDetector(slither_pool=slither_pool)
         self.solana_detector = SolanaDetector()
         self.blockchain_specific_patterns = self._initialize_blockchain_patterns()
+        self.compiled_blockchain_patterns = {
+            blockchain: get_compiled_patterns(f"chain:{blockchain.value}", data["patterns"],
+                                              LINE_REGEX_FLAGS, line_mode=True)
+            for blockchain, data in self.blockchain_specific_patterns.items()
+        }
+        for blockchain, data in self.blockchain_specific_patterns.items():
+            data["metadata"] = register_pattern_metadata(f"chain:{blockchain.value}", data["patterns"])
     
     def _initialize_blockchain_patterns(self) -> Dict[BlockchainType, Dict[str, Any]]:
         """Initialize blockchain-specific vulnerability patterns."""
@@ -151,6 +209,8 @@ class MultiBlockchainDetector:
                 "patterns": {
                     "pancakeswap_rug": {
                         "pattern": r"PancakeSwap.*rugpull|removeLiquidity.*onlyOwner",
+                        "anchors": ["PancakeSwap", "removeLiquidity"],
+                        "requires": [["rugpull", "onlyOwner"]],
                         "severity": "Critical",
                         "description": "Potential rug pull mechanism",
                         "explanation": "Contract may allow owner to remove liquidity unexpectedly",
@@ -159,6 +219,8 @@ class MultiBlockchainDetector:
                     },
                     "bep20_issues": {
                         "pattern": r"function\s+transfer.*returns\s*\(\s*bool\s*\)(?!.*require)",
+                        "anchors": ["function"],
+                        "requires": [["transfer"], ["returns"], ["bool"]],
                         "severity": "Medium", 
                         "description": "BEP-20 transfer without checks",
                         "explanation": "BEP-20 transfers should include proper validation",
@@ -171,6 +233,8 @@ class MultiBlockchainDetector:
                 "patterns": {
                     "matic_bridge_issues": {
                         "pattern": r"(?:deposit|withdraw).*Matic.*(?!.*checkpoint)",
+                        "anchors": ["deposit", "withdraw"],
+                        "requires": [["Matic"]],
                         "severity": "High",
                         "description": "Potential bridge operation without checkpoint",
                         "explanation": "Polygon bridge operations should include checkpoint validation",
@@ -179,6 +243,8 @@ class MultiBlockchainDetector:
                     },
                     "gas_optimization": {
                         "pattern": r"for\s*\(.*length.*\+\+\)",
+                        "anchors": ["for"],
+                        "requires": [["length"], ["++"]],
                         "severity": "Low",
                         "description": "Gas inefficient loop",
                         "explanation": "Polygon gas costs can be optimized with better loop patterns",
@@ -191,6 +257,8 @@ class MultiBlockchainDetector:
                 "patterns": {
                     "avalanche_consensus": {
                         "pattern": r"block\.timestamp.*finality",
+                        "anchors": ["block.timestamp"],
+                        "requires": [["finality"]],
                         "severity": "Medium",
                         "description": "Avalanche consensus timing issue",
                         "explanation": "Avalanche has different finality guarantees than Ethereum",
@@ -201,6 +269,28 @@ class MultiBlockchainDetector:
             }
         }
     
+    @property
+    def fingerprint(self) -> str:
+        """
+        Version hash of every pattern set and the Slither toolchain in use.
+        
+        Changes whenever any Solidity, Solana or chain-specific pattern changes
+        or Slither/solc is installed, upgraded or removed, so results cached
+        under it are invalidated automatically.
+        """
+        slither_version = get_slither_version()
+        payload = json.dumps({
+            'solidity': self.solidity_detector.compiled_patterns.version,
+            'solana': self.solana_detector.compiled_patterns.version,
+            'chains': {
+                blockchain.value: compiled.version
+                for blockchain, compiled in self.compiled_blockchain_patterns.items()
+            },
+            'slither': slither_version,
+            'solc': get_solc_version() if slither_version else None,
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+    
     def detect_blockchain_type(self, code: str, url: str = "") -> BlockchainContext:
         """Detect the blockchain type and language from code and context."""
         code_lower = code.lower()
@@ -256,57 +346,208 @@ class MultiBlockchainDetector:
             language="unknown"
         )
     
-    def analyze(self, code: str, url: str = "") -> Tuple[List[Finding], BlockchainContext]:
+    def analyze(self, code: str, url: str = "",
+                stats: Optional[ScanStats] = None,
+                deadline: Optional[float] = None,
+                fail_fast: bool = False,
+                severity_threshold: str = "High") -> Tuple[List[Finding], BlockchainContext]:
         """
         Analyze code using appropriate blockchain-specific detectors.
         
+        Collects analyze_iter() and sorts the findings by severity. In
+        fail-fast mode, triage_iter() is used instead and the findings hold at
+        most the first finding at or above severity_threshold.
+        
+        Args:
+            code: Source code to analyze
+            url: Optional URL context for blockchain detection
+            stats: Optional ScanStats accumulating prefilter skip counts across
+                every detector family that runs
+            deadline: Optional number of seconds to wait for Slither on
+                EVM-compatible chains (see VulnerabilityDetector.analyze_iter)
+            fail_fast: Stop at the first finding at or above severity_threshold
+            severity_threshold: Least severe level that decides a fail-fast analysis
+        
         Returns:
             Tuple of (findings, blockchain_context)
         """
         context = self.detect_blockchain_type(code, url)
-        findings = []
+        if fail_fast:
+            findings = list(self.triage_iter(code, url, severity_threshold, stats, deadline, context=context))
+        else:
+            findings = list(self.analyze_iter(code, url, stats, deadline, context=context))
+        return sort_by_severity(findings), context
+    
+    def analyze_iter(self, code: str, url: str = "",
+                     stats: Optional[ScanStats] = None,
+                     deadline: Optional[float] = None,
+                     context: Optional[BlockchainContext] = None) -> Iterator[Finding]:
+        """
+        Analyze code, yielding findings as each detector produces them.
+        
+        Duplicates are dropped as they arrive; findings are not sorted. The
+        blockchain context the detectors were chosen for is available from
+        detect_blockchain_type().
+        
+        Args:
+            code: Source code to analyze
+            url: Optional URL context for blockchain detection
+            stats: Optional ScanStats accumulating prefilter skip counts across
+                every detector family that runs
+            deadline: Optional number of seconds to wait for Slither on
+                EVM-compatible chains
+            context: Blockchain context if already detected by the caller
+        
+        Yields:
+            Deduplicated security findings
+        """
+        if context is None:
+            context = self.detect_blockchain_type(code, url)
         
         # Use appropriate detector based on blockchain type
         if context.blockchain == BlockchainType.SOLANA:
-            findings.extend(self.solana_detector.analyze(code))
+            streams = [self.solana_detector.analyze_iter(code, stats)]
         else:
             # Use Solidity detector for EVM-compatible chains
-            findings.extend(self.solidity_detector.analyze(code))
+            streams = [self.solidity_detector.analyze_iter(code, stats, deadline=deadline)]
             
             # Add blockchain-specific patterns
             if context.blockchain in self.blockchain_specific_patterns:
-                blockchain_findings = self._analyze_blockchain_specific(
+                streams.append(self._iter_blockchain_specific(
                     code, 
-                    self.blockchain_specific_patterns[context.blockchain]
-                )
-                findings.extend(blockchain_findings)
+                    self.blockchain_specific_patterns[context.blockchain],
+                    self.compiled_blockchain_patterns[context.blockchain],
+                    stats
+                ))
+        
+        seen = set()
+        for stream in streams:
+            for finding in stream:
+                key = finding_key(finding)
+                if key not in seen:
+                    seen.add(key)
+                    yield finding
+    
+    def triage_iter(self, code: str, url: str = "", severity_threshold: str = "High",
+                    stats: Optional[ScanStats] = None, deadline: Optional[float] = None,
+                    context: Optional[BlockchainContext] = None) -> Iterator[Finding]:
+        """
+        Decide whether code has any finding at or above a severity, doing as little work as possible.
+        
+        Only patterns that can reach the threshold run, most severe first
+        (e.g. reentrancy before access control), and the analysis stops at the
+        first finding at or above it. Slither runs last and only if the regex
+        patterns did not already decide the outcome. Work that was skipped is
+        recorded in stats (rules_not_run, slither_skipped) together with an
+        estimate of the time saved, based on the per-pattern time of this run
+        and the mean duration of earlier Slither runs in this process. The
+        estimate covers this scan only, even if stats is reused.
+        
+        Args:
+            code: Source code to analyze
+            url: Optional URL context for blockchain detection
+            severity_threshold: Least severe level that decides the outcome
+            stats: Optional ScanStats updated with the skipped work
+            deadline: Optional number of seconds to wait for Slither
+            context: Blockchain context if already detected by the caller
+        
+        Yields:
+            The first finding at or above the threshold, if any, and an
+            "Analysis Incomplete" finding if Slither missed the deadline
+        """
+        if stats is None:
+            stats = ScanStats()
+        if context is None:
+            context = self.detect_blockchain_type(code, url)
+        threshold = SEVERITY_ORDER.get(severity_threshold, 4)
+        started = time.monotonic()
+        
+        # Regex stages in the order they run: (pattern definitions, runner)
+        if context.blockchain == BlockchainType.SOLANA:
+            stages = [(self.solana_detector.patterns,
+                       lambda names: self.solana_detector.analyze_iter(code, stats, names))]
+        else:
+            stages = [(self.solidity_detector.patterns,
+                       lambda names: self.solidity_detector._iter_regex(code, stats, names))]
+            if context.blockchain in self.blockchain_specific_patterns:
+                chain_patterns = self.blockchain_specific_patterns[context.blockchain]
+                compiled = self.compiled_blockchain_patterns[context.blockchain]
+                stages.append((chain_patterns["patterns"],
+                               lambda names: self._iter_blockchain_specific(code, chain_patterns, compiled, stats, names)))
+        
+        decisive = None
+        rules_run = 0
+        # Rules this scan skipped; stats may already hold those of earlier scans
+        not_run = []
+        for patterns, run in stages:
+            if decisive is not None:
+                not_run.extend(patterns)
+                continue
+            names = severity_ordered_patterns(patterns, severity_threshold)
+            not_run.extend(name for name in patterns if name not in names)
+            rules_before = stats.rules_total
+            for finding in run(names):
+                if SEVERITY_ORDER.get(finding.severity, 4) <= threshold:
+                    decisive = finding
+                    break
+            ran = stats.rules_total - rules_before
+            rules_run += ran
+            not_run.extend(names[ran:])
+        stats.rules_not_run.extend(not_run)
+        regex_seconds = time.monotonic() - started
         
-        return findings, context
+        # Slither only runs when the regex patterns left the outcome open
+        incomplete = None
+        slither_skipped = False
+        uses_slither = context.blockchain != BlockchainType.SOLANA and self.solidity_detector.slither_available
+        if uses_slither and decisive is None:
+            future = get_slither_executor().submit(self.solidity_detector._detect_with_slither, code, stats)
+            for finding in self.solidity_detector._await_slither(future, stats, deadline, started):
+                if finding.vulnerability_type == "Analysis Incomplete":
+                    incomplete = finding
+                elif SEVERITY_ORDER.get(finding.severity, 4) <= threshold:
+                    decisive = finding
+                    break
+        elif uses_slither:
+            slither_skipped = stats.slither_skipped = True
+        
+        # Estimate the time a full analysis would have spent on the work this scan skipped
+        saved = regex_seconds / max(1, rules_run) * len(not_run)
+        if slither_skipped:
+            saved += estimated_slither_duration() or 0.0
+        stats.time_saved_estimate = saved
+        
+        if decisive is not None:
+            yield decisive
+        if incomplete is not None:
+            yield incomplete
     
-    def _analyze_blockchain_specific(self, code: str, patterns: Dict[str, Any]) -> List[Finding]:
+    def _analyze_blockchain_specific(self, code: str, patterns: Dict[str, Any],
+                                     compiled: CompiledPatternSet,
+                                     stats: Optional[ScanStats] = None) -> List[Finding]:
         """Analyze code using blockchain-specific patterns."""
-        findings = []
-        lines = code.split('\n')
+        return list(self._iter_blockchain_specific(code, patterns, compiled, stats))
+    
+    def _iter_blockchain_specific(self, code: str, patterns: Dict[str, Any],
+                                  compiled: CompiledPatternSet,
+                                  stats: Optional[ScanStats] = None,
+                                  pattern_names: Optional[List[str]] = None) -> Iterator[Finding]:
+        """Yield findings of blockchain-specific patterns pattern by pattern (optionally only the named ones)."""
+        source_index = get_source_index(code)
+        matches = compiled.engine.iter_scan(mask_comments_and_strings(code), stats, rule_ids=pattern_names)
         
-        for pattern_name, pattern_data in patterns["patterns"].items():
-            pattern = re.compile(pattern_data["pattern"], re.IGNORECASE | re.MULTILINE)
+        for pattern_name, spans, timed_out in matches:
+            metadata = patterns["metadata"][pattern_name]
+            for line_start, _ in spans:
+                line_num = source_index.line_of(line_start)
+                yield Finding.from_metadata(
+                    metadata,
+                    line_number=line_num,
+                    code_snippet=source_index.snippet_ref(line_num, before=0, after=0, strip=True)
+                )
             
-            for line_num, line in enumerate(lines, 1):
-                if pattern.search(line):
-                    finding = Finding(
-                        vulnerability_type=pattern_data["type"],
-                        severity=pattern_data["severity"],
-                        line_number=line_num,
-                        code_snippet=line.strip(),
-                        description=pattern_data["description"],
-                        explanation=pattern_data["explanation"],
-                        recommendation=pattern_data["recommendation"],
-                        cwe_id=pattern_data.get("cwe_id"),
-                        swc_id=pattern_data.get("swc_id")
-                    )
-                    findings.append(finding)
-        
-        return findings
+            if timed_out:
+                yield detector_timeout_finding(pattern_name)
     
     def get_blockchain_info(self, blockchain: BlockchainType) -> Dict[str, str]:
         """Get information about a specific blockchain."""
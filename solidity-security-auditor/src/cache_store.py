@@ -0,0 +1,222 @@
+"""
+On-Disk Cache Storage for the Auditor
+
+This module locates the auditor's cache directory and provides small helpers
+for persisting cached data there. The directory defaults to
+~/.cache/panda-web3-auditor and can be moved with the PANDA_AUDITOR_CACHE_DIR
+environment variable. Small documents are stored as JSON files; larger
+result caches use a SQLite store with optional LRU eviction and per-entry
+expiry. Caching
+never affects correctness: any I/O error while reading or writing the cache
+is treated as a miss.
+
+EDUCATIONAL PURPOSE: This tool is designed to help developers learn about smart contract
+security. It should only be used for authorized security assessments and educational purposes.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Optional
+
+
+CACHE_DIR_ENV = 'PANDA_AUDITOR_CACHE_DIR'
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'panda-web3-auditor'
+
+logger = logging.getLogger(__name__)
+
+
+def get_cache_dir() -> Path:
+    """
+    Get the cache directory, honouring the PANDA_AUDITOR_CACHE_DIR override.
+
+    Returns:
+        Path of the cache directory (not created until something is written)
+    """
+    override = os.getenv(CACHE_DIR_ENV)
+    return Path(override).expanduser() if override else DEFAULT_CACHE_DIR
+
+
+def read_json(name: str) -> Optional[Any]:
+    """
+    Read a JSON document from the cache directory.
+
+    Args:
+        name: File name within the cache directory
+
+    Returns:
+        Decoded document, or None if it is missing or unreadable
+    """
+    try:
+        with open(get_cache_dir() / name, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(name: str, data: Any) -> bool:
+    """
+    Atomically write a JSON document to the cache directory.
+
+    Args:
+        name: File name within the cache directory
+        data: JSON-serializable document
+
+    Returns:
+        True if the document was written
+    """
+    cache_dir = get_cache_dir()
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=f'.{name}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, cache_dir / name)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return True
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug(f"Could not write cache file {name}: {e}")
+        return False
+
+
+class SQLiteCache:
+    """
+    Key/value store in a SQLite database in the cache directory.
+
+    Values are JSON documents stored zlib-compressed. Entries can be given a
+    time to live, after which they read as misses. Once the stored values
+    exceed max_bytes, expired and then least recently used entries are
+    evicted. The store is safe to share between threads and between
+    processes using the same database file; any database error is logged and
+    treated as a miss.
+    """
+
+    def __init__(self, name: str, max_bytes: Optional[int] = 64 * 1024 * 1024):
+        """
+        Args:
+            name: Database file name within the cache directory
+            max_bytes: Upper bound on the total size of the stored values, or
+                None to keep every entry until it expires
+        """
+        self.path = get_cache_dir() / name
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, '
+                'accessed REAL NOT NULL, expires REAL)'
+            )
+            columns = {row[1] for row in connection.execute('PRAGMA table_info(entries)')}
+            if 'expires' not in columns:
+                # Databases written before entries could expire
+                connection.execute('ALTER TABLE entries ADD COLUMN expires REAL')
+            connection.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)')
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached document and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached document, or None on a miss
+        """
+        try:
+            with self._lock:
+                connection = self._connect()
+                row = connection.execute('SELECT value, expires FROM entries WHERE key = ?', (key,)).fetchone()
+                if row is None:
+                    return None
+                now = time.time()
+                if row[1] is not None and row[1] <= now:
+                    connection.execute('DELETE FROM entries WHERE key = ?', (key,))
+                    connection.commit()
+                    return None
+                connection.execute('UPDATE entries SET accessed = ? WHERE key = ?', (now, key))
+                connection.commit()
+            return json.loads(zlib.decompress(row[0]))
+        except (sqlite3.Error, OSError, zlib.error, ValueError) as e:
+            logger.debug(f"Cache read from {self.path.name} failed: {e}")
+            return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """
+        Store a document, evicting least recently used entries beyond max_bytes.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable document
+            ttl: Seconds until the entry expires, or None to keep it indefinitely
+
+        Returns:
+            True if the document was stored
+        """
+        try:
+            blob = zlib.compress(json.dumps(value).encode('utf-8'))
+            now = time.time()
+            expires = now + ttl if ttl is not None else None
+            with self._lock:
+                connection = self._connect()
+                connection.execute(
+                    'INSERT OR REPLACE INTO entries (key, value, size, accessed, expires) VALUES (?, ?, ?, ?, ?)',
+                    (key, blob, len(blob), now, expires)
+                )
+                self._evict(connection)
+                connection.commit()
+            return True
+        except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+            logger.debug(f"Cache write to {self.path.name} failed: {e}")
+            return False
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """Delete expired, then least recently used entries until the store fits in max_bytes."""
+        if self.max_bytes is None:
+            return
+        total = connection.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        connection.execute('DELETE FROM entries WHERE expires <= ?', (time.time(),))
+        total = connection.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        evicted = []
+        for key, size in connection.execute('SELECT key, size FROM entries ORDER BY accessed'):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        connection.executemany('DELETE FROM entries WHERE key = ?', evicted)
+
+    def clear(self) -> None:
+        """Delete every entry."""
+        try:
+            with self._lock:
+                connection = self._connect()
+                connection.execute('DELETE FROM entries')
+                connection.commit()
+        except (sqlite3.Error, OSError) as e:
+            logger.debug(f"Cache clear of {self.path.name} failed: {e}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
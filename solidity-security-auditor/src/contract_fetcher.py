@@ -9,13 +9,22 @@ Use only for authorized security assessments and educational purposes.
 """
 
 import requests
+import asyncio
+import functools
 import json
+import os
+import threading
 import time
-from typing import Optional, Tuple, Dict, Any
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple, Dict, Any, AsyncIterator, Callable, Iterable, Union
+from dataclasses import asdict, dataclass
 from enum import Enum
 import re
 from api_config import api_config
+from cache_store import SQLiteCache
+from http_client import HTTPClient, get_http_client
+from rate_limiter import RateLimiter, get_rate_limiter, is_rate_limit_message
+from retry_policy import CircuitBreaker, RetryPolicy, get_retry_policy
 
 
 class BlockchainNetwork(Enum):
@@ -39,22 +48,209 @@ class ContractInfo:
     explorer_url: str
     abi: Optional[str] = None
     constructor_args: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert contract info to dictionary for JSON serialization."""
+        data = asdict(self)
+        data['blockchain'] = self.blockchain.value
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ContractInfo":
+        """Rebuild contract info from to_dict() output."""
+        return cls(**{**data, 'blockchain': BlockchainNetwork(data['blockchain'])})
+
+
+class FetchError(Enum):
+    """Reasons a contract fetch can fail."""
+    NOT_CONFIGURED = "not_configured"
+    INVALID_API_KEY = "invalid_api_key"
+    NOT_VERIFIED = "not_verified"
+    NOT_FOUND = "not_found"
+    RATE_LIMITED = "rate_limited"
+    API_ERROR = "api_error"
+    NETWORK_ERROR = "network_error"
+    CIRCUIT_OPEN = "circuit_open"
+    ERROR = "error"
+
+
+@dataclass
+class FetchResult:
+    """Outcome of fetching one contract: the contract, or why it could not be fetched."""
+    address: str
+    blockchain: BlockchainNetwork
+    contract: Optional[ContractInfo] = None
+    error: Optional[FetchError] = None
+    message: str = ""
+    cached: bool = False
+    attempts: int = 1
+    status_code: Optional[int] = None  # HTTP status of a failed request, if it got a response
+    retry_after: Optional[float] = None  # Seconds the server asked to wait before retrying
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# Failures that say nothing about the contract and may succeed when retried.
+# API_ERROR is left out: explorer NOTOK results and JSON-RPC errors (such as a
+# malformed address or pubkey) are answered the same way on every attempt, and
+# the transient ones (rate limits) are already classified as RATE_LIMITED.
+RETRYABLE_ERRORS = (FetchError.RATE_LIMITED, FetchError.NETWORK_ERROR)
+
+
+def is_retryable(result: FetchResult) -> bool:
+    """Check whether a failed fetch is transient and worth retrying."""
+    if result.error not in RETRYABLE_ERRORS:
+        return False
+    # Client errors other than 429 fail the same way on every attempt
+    status = result.status_code
+    return status is None or status == 429 or not 400 <= status < 500
+
+
+def is_endpoint_failure(result: FetchResult) -> bool:
+    """Check whether a fetch failed because the explorer is down (no response, timeout or 5xx)."""
+    return result.error == FetchError.NETWORK_ERROR and (result.status_code is None or result.status_code >= 500)
+
+
+def _redact_api_key(text: str) -> str:
+    """Hide API keys in request URLs quoted by error messages."""
+    return re.sub(r'(apikey=)[^&\s]+', r'\1***', text, flags=re.IGNORECASE)
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    """Seconds from a Retry-After header, if it holds a number of seconds."""
+    try:
+        return max(0.0, float(response.headers.get('Retry-After', '')))
+    except ValueError:
+        return None
+
+
+# Fetched EVM contracts keyed by network and address
+CONTRACT_CACHE_FILE = 'contract_sources.sqlite'
+NEGATIVE_TTL_ENV = 'PANDA_AUDITOR_NEGATIVE_CACHE_TTL'
+DEFAULT_NEGATIVE_TTL = 24 * 60 * 60
+# Failures that describe the contract rather than the request, and can be cached
+CACHEABLE_ERRORS = (FetchError.NOT_VERIFIED, FetchError.NOT_FOUND)
+
+
+def _negative_ttl_from_env() -> float:
+    try:
+        return float(os.getenv(NEGATIVE_TTL_ENV, DEFAULT_NEGATIVE_TTL))
+    except ValueError:
+        return DEFAULT_NEGATIVE_TTL
+
+
+class ContractCache:
+    """
+    Persistent cache of EVM contract fetch results.
+    
+    The verified source of an address never changes, so fetched contracts
+    (source, ABI, compiler and constructor arguments) are kept permanently
+    and never evicted. "Not verified" and "not found" results expire after
+    negative_ttl seconds, because a contract can be verified later. Entries
+    are stored zlib-compressed in a SQLite database in the cache directory.
+    """
+    
+    def __init__(self, name: str = CONTRACT_CACHE_FILE, negative_ttl: Optional[float] = None):
+        """
+        Args:
+            name: Database file name within the cache directory
+            negative_ttl: Seconds to remember that an address has no verified
+                source; defaults to PANDA_AUDITOR_NEGATIVE_CACHE_TTL or one
+                day, and 0 disables negative caching
+        """
+        self.store = SQLiteCache(name, max_bytes=None)
+        self.negative_ttl = negative_ttl if negative_ttl is not None else _negative_ttl_from_env()
+    
+    @staticmethod
+    def key(address: str, network: BlockchainNetwork) -> str:
+        # EVM addresses are case-insensitive (mixed case is only a checksum)
+        return f"{network.value}:{address.lower()}"
+    
+    def get(self, address: str, network: BlockchainNetwork) -> Optional[FetchResult]:
+        """
+        Look up the cached result for an address.
+        
+        Returns:
+            The cached FetchResult (marked as cached), or None on a miss
+        """
+        data = self.store.get(self.key(address, network))
+        if data is None:
+            return None
+        try:
+            if 'contract' in data:
+                return FetchResult(address, network, contract=ContractInfo.from_dict(data['contract']),
+                                   cached=True)
+            return FetchResult(address, network, error=FetchError(data['error']),
+                               message=data['message'], cached=True)
+        except (KeyError, TypeError, ValueError):
+            return None
+    
+    def put(self, result: FetchResult) -> None:
+        """Store a fetch result if it says something lasting about the contract."""
+        key = self.key(result.address, result.blockchain)
+        if result.ok:
+            self.store.set(key, {'contract': result.contract.to_dict()})
+        elif result.error in CACHEABLE_ERRORS and self.negative_ttl > 0:
+            self.store.set(key, {'error': result.error.value, 'message': result.message},
+                           ttl=self.negative_ttl)
+
+
+_CONTRACT_CACHE: Optional[ContractCache] = None
+_CONTRACT_CACHE_LOCK = threading.Lock()
+
+
+def get_contract_cache() -> ContractCache:
+    """Get the process-wide contract cache, opening it on first use."""
+    global _CONTRACT_CACHE
+    if _CONTRACT_CACHE is None:
+        with _CONTRACT_CACHE_LOCK:
+            if _CONTRACT_CACHE is None:
+                _CONTRACT_CACHE = ContractCache()
+    return _CONTRACT_CACHE
 
 
 class ContractSourceFetcher:
     """Fetches contract source code from various blockchain explorers."""
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[HTTPClient] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 endpoints: Optional[Dict[BlockchainNetwork, str]] = None,
+                 cache: Optional[ContractCache] = None, use_cache: bool = True,
+                 retry_policy: Optional[RetryPolicy] = None):
+        """
+        Args:
+            http_client: HTTP client to fetch with; defaults to the shared
+                process-wide client, so connections to each explorer are reused
+            rate_limiter: Per-service rate limiter; defaults to the shared
+                process-wide limiter, so every fetcher respects the same quotas
+            endpoints: API URLs replacing the configured ones for some
+                networks, e.g. to fetch from a local mock explorer
+            cache: Cache of EVM contract fetches; defaults to the shared
+                on-disk cache
+            use_cache: Set to False to always fetch from the explorers
+            retry_policy: Retry, circuit breaker and retry budget settings;
+                defaults to the shared process-wide policy, so breakers and
+                budgets see every request made to an explorer
+        """
         # Use API configuration
         self.api_config = api_config
+        self.http = http_client or get_http_client()
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.cache = (cache or get_contract_cache()) if use_cache else None
+        self.retry_policy = retry_policy or get_retry_policy()
         
         # API endpoints for different networks (from config)
         self.api_endpoints = {
             BlockchainNetwork.ETHEREUM_MAINNET: self.api_config.get_endpoint('etherscan'),
             BlockchainNetwork.BSC_MAINNET: self.api_config.get_endpoint('bscscan'),
             BlockchainNetwork.POLYGON_MAINNET: self.api_config.get_endpoint('polygonscan'),
-            BlockchainNetwork.AVALANCHE_MAINNET: self.api_config.get_endpoint('snowtrace')
+            BlockchainNetwork.AVALANCHE_MAINNET: self.api_config.get_endpoint('snowtrace'),
+            BlockchainNetwork.SOLANA_MAINNET: "https://api.mainnet-beta.solana.com"
         }
+        if endpoints:
+            self.api_endpoints.update(endpoints)
         
         # Service names for API keys
         self.service_names = {
@@ -72,18 +268,7 @@ class ContractSourceFetcher:
             BlockchainNetwork.AVALANCHE_MAINNET: "https://snowtrace.io/address/",
             BlockchainNetwork.SOLANA_MAINNET: "https://explorer.solana.com/address/"
         }
-        
-        # Rate limiting
-        self.last_request_time = 0
-        self.min_request_interval = 0.2  # 200ms between requests
-    
-    def _rate_limit(self):
-        """Implement rate limiting to respect API limits."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.min_request_interval:
-            time.sleep(self.min_request_interval - time_since_last)
-        self.last_request_time = time.time()
+
     
     def _detect_network_from_address(self, address: str, url_hint: str = "") -> BlockchainNetwork:
         """Detect blockchain network from address format and URL hints."""
@@ -133,25 +318,154 @@ class ContractSourceFetcher:
         else:
             return self._fetch_evm_contract(address, network)
     
+    def _evm_service(self, network: BlockchainNetwork) -> Optional[Tuple[str, str, str]]:
+        """Get (api_url, service_name, api_key) for an EVM network, or None if it is not configured."""
+        api_url = self.api_endpoints.get(network)
+        service_name = self.service_names.get(network)
+        if not api_url or not service_name:
+            return None
+        return api_url, service_name, self.api_config.get_api_key(service_name)
+    
     def _fetch_evm_contract(self, address: str, network: BlockchainNetwork) -> Optional[ContractInfo]:
         """Fetch contract source from EVM-compatible networks (Ethereum, BSC, Polygon, etc)."""
         
-        api_url = self.api_endpoints.get(network)
-        service_name = self.service_names.get(network)
+        cached = self.cache.get(address, network) if self.cache is not None else None
+        if cached is not None:
+            print(f"📦 Using cached result for {address} on {network.value}")
+            if not cached.ok:
+                self._print_failure(cached)
+                return None
+            print(f"✅ Contract: {cached.contract.contract_name}")
+            return cached.contract
         
-        if not api_url or not service_name:
+        service = self._evm_service(network)
+        if service is None:
             print(f"❌ API endpoint not configured for {network.value}")
             return None
         
-        # Get API key from configuration
-        api_key = self.api_config.get_api_key(service_name)
-        has_valid_key = self.api_config.has_valid_key(service_name)
-        
-        if not has_valid_key:
+        api_url, service_name, api_key = service
+        if not self.api_config.has_valid_key(service_name):
             print(f"⚠️  Using free API key for {network.value} - rate limited")
             print(f"💡 Configure your own API key for better performance")
         
-        self._rate_limit()
+        print(f"🔍 Fetching contract source from {network.value}...")
+        print(f"📍 Address: {address}")
+        
+        query = functools.partial(self._query_and_cache, address, network, service)
+        result = self._with_retries(address, network, service_name, api_key, query, report=True)
+        if not result.ok:
+            self._print_failure(result)
+            return None
+        
+        contract_info = result.contract
+        print(f"✅ Successfully fetched contract: {contract_info.contract_name}")
+        print(f"📊 Source code length: {len(contract_info.source_code)} characters")
+        print(f"🔧 Compiler: {contract_info.compiler_version}")
+        
+        return contract_info
+    
+    def _with_retries(self, address: str, network: BlockchainNetwork, service_name: str, api_key: str,
+                      query: Callable[[], FetchResult], report: bool = False) -> FetchResult:
+        """
+        Run a query under the rate limiter and the retry policy.
+        
+        Transient failures are retried with jittered exponential backoff
+        while attempts and the service's retry budget last. The service's
+        circuit breaker sees every outcome and fails the query immediately
+        while the explorer is down.
+        
+        Args:
+            address: Address being fetched
+            network: Network of the address
+            service_name: Service the query is sent to
+            api_key: API key the query uses, selecting the rate-limit bucket
+            query: Sends one request and classifies its outcome
+            report: Print a line before each retry
+            
+        Returns:
+            Result of the last attempt
+        """
+        breaker = self.retry_policy.breaker(service_name)
+        self.retry_policy.budget(service_name).record_request()
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                return self._circuit_open(address, network, service_name, breaker, attempt)
+            self.rate_limiter.acquire(service_name, api_key)
+            result = query()
+            attempt += 1
+            delay = self._after_attempt(result, service_name, breaker, attempt)
+            if delay is None:
+                return result
+            if report:
+                print(f"⏳ {result.message}; retrying in {delay:.1f}s "
+                      f"(attempt {attempt + 1}/{self.retry_policy.max_attempts})")
+            time.sleep(delay)
+    
+    async def _with_retries_async(self, address: str, network: BlockchainNetwork, service_name: str,
+                                  api_key: str, query: Callable[[], FetchResult],
+                                  semaphore: asyncio.Semaphore, executor: ThreadPoolExecutor) -> FetchResult:
+        """
+        Asyncio version of _with_retries for fetch_many.
+        
+        Each attempt holds a slot of the service's semaphore and runs the
+        query on the executor; backoff delays are waited without holding a slot.
+        """
+        loop = asyncio.get_running_loop()
+        breaker = self.retry_policy.breaker(service_name)
+        self.retry_policy.budget(service_name).record_request()
+        attempt = 0
+        while True:
+            async with semaphore:
+                if not breaker.allow():
+                    return self._circuit_open(address, network, service_name, breaker, attempt)
+                await self.rate_limiter.acquire_async(service_name, api_key)
+                result = await loop.run_in_executor(executor, query)
+            attempt += 1
+            delay = self._after_attempt(result, service_name, breaker, attempt)
+            if delay is None:
+                return result
+            await asyncio.sleep(delay)
+    
+    def _after_attempt(self, result: FetchResult, service_name: str, breaker: CircuitBreaker,
+                       attempt: int) -> Optional[float]:
+        """Report an attempt's outcome to the breaker; return the delay before retrying, or None."""
+        result.attempts = attempt
+        if is_endpoint_failure(result):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        if result.ok:
+            return None
+        return self.retry_policy.retry_delay(service_name, attempt, is_retryable(result), result.retry_after)
+    
+    def _circuit_open(self, address: str, network: BlockchainNetwork, service_name: str,
+                      breaker: CircuitBreaker, attempts: int) -> FetchResult:
+        return FetchResult(address, network, error=FetchError.CIRCUIT_OPEN, attempts=attempts,
+                           message=f"{service_name} is failing; requests paused for "
+                                   f"{breaker.retry_in():.0f}s")
+    
+    def _query_and_cache(self, address: str, network: BlockchainNetwork,
+                         service: Tuple[str, str, str]) -> FetchResult:
+        """Query an EVM explorer (see _query_evm_contract) and cache the result."""
+        result = self._query_evm_contract(address, network, *service)
+        if self.cache is not None:
+            self.cache.put(result)
+        return result
+    
+    def _query_evm_contract(self, address: str, network: BlockchainNetwork, api_url: str,
+                            service_name: str, api_key: str) -> FetchResult:
+        """
+        Request a contract's source from an EVM explorer and parse the response.
+        
+        Does not wait for the rate limiter or print anything, so it can run on
+        worker threads; rate-limit responses still adjust the limiter.
+        
+        Returns:
+            FetchResult holding the contract or the classified failure
+        """
+        def failure(error: FetchError, message: str, **details) -> FetchResult:
+            return FetchResult(address, network, error=error, message=message, **details)
         
         try:
             # API parameters for getting contract source
@@ -167,10 +481,11 @@ class ContractSourceFetcher:
             if chain_id:
                 params['chainid'] = chain_id
             
-            print(f"🔍 Fetching contract source from {network.value}...")
-            print(f"📍 Address: {address}")
-            
-            response = requests.get(api_url, params=params, timeout=10)
+            response = self.http.get(api_url, params=params, timeout=10)
+            if response.status_code == 429:
+                self.rate_limiter.record_rate_limited(service_name, api_key)
+                return failure(FetchError.RATE_LIMITED, f"Rate limit exceeded for {network.value}",
+                               status_code=429, retry_after=_retry_after(response))
             response.raise_for_status()
             
             data = response.json()
@@ -179,47 +494,26 @@ class ContractSourceFetcher:
                 error_msg = data.get('message', 'Unknown error')
                 result = data.get('result', '')
                 
-                # Provide specific error messages
-                if ('Invalid API Key' in error_msg or 'Missing/Invalid API Key' in error_msg or 
+                if ('Invalid API Key' in error_msg or 'Missing/Invalid API Key' in error_msg or
                     'Invalid API Key' in result or 'Missing/Invalid API Key' in result):
-                    if network == BlockchainNetwork.POLYGON_MAINNET:
-                        print(f"❌ Polygon API requires valid API key (V2 migration)")
-                        print(f"💡 Get a free API key from https://etherscan.io/apis")
-                        print(f"🔧 Set environment: export POLYGONSCAN_API_KEY=\"your_key\"")
-                        print(f"📋 Polygon now uses Etherscan V2 API with chain ID 137")
-                    else:
-                        print(f"❌ Invalid API key for {network.value}")
-                        print(f"💡 Get a free API key from {self.explorer_urls[network].replace('/address/', '/apis')}")
-                elif 'Contract source code not verified' in error_msg or result == 'Contract source code not verified':
-                    print(f"❌ Contract source code not verified on {network.value}")
-                    print(f"📋 This contract is not open source or hasn't been verified")
-                    print(f"🔗 Check: {self.explorer_urls[network]}{address}")
-                elif 'rate limit' in error_msg.lower():
-                    print(f"❌ Rate limit exceeded for {network.value}")
-                    print(f"⏳ Please wait a moment and try again")
-                elif 'NOTOK' in data.get('status', ''):
-                    print(f"❌ API request failed for {network.value}")
-                    print(f"📋 Possible reasons:")
-                    print(f"   • Contract not verified on explorer")
-                    print(f"   • Invalid contract address")
-                    print(f"   • API service temporarily unavailable")
-                    print(f"🔗 Verify contract at: {self.explorer_urls[network]}{address}")
-                else:
-                    print(f"❌ API Error: {error_msg}")
-                
-                return None
+                    return failure(FetchError.INVALID_API_KEY, f"Invalid API key for {network.value}")
+                if 'Contract source code not verified' in error_msg or result == 'Contract source code not verified':
+                    return failure(FetchError.NOT_VERIFIED, f"Contract source code not verified on {network.value}")
+                if is_rate_limit_message(error_msg) or is_rate_limit_message(result):
+                    self.rate_limiter.record_rate_limited(service_name, api_key)
+                    return failure(FetchError.RATE_LIMITED, f"Rate limit exceeded for {network.value}")
+                return failure(FetchError.API_ERROR, f"API Error: {error_msg}")
             
+            self.rate_limiter.record_success(service_name, api_key)
             result = data.get('result', [])
             if not result or not result[0]:
-                print("❌ Contract not verified or not found")
-                return None
+                return failure(FetchError.NOT_FOUND, "Contract not verified or not found")
             
             contract_data = result[0]
             source_code = contract_data.get('SourceCode', '')
             
             if not source_code:
-                print("❌ No source code available (contract not verified)")
-                return None
+                return failure(FetchError.NOT_VERIFIED, "No source code available (contract not verified)")
             
             # Handle different source code formats
             if source_code.startswith('{{'):
@@ -249,29 +543,66 @@ class ContractSourceFetcher:
                 abi=contract_data.get('ABI'),
                 constructor_args=contract_data.get('ConstructorArguments')
             )
-            
-            print(f"✅ Successfully fetched contract: {contract_info.contract_name}")
-            print(f"📊 Source code length: {len(source_code)} characters")
-            print(f"🔧 Compiler: {contract_info.compiler_version}")
-            
-            return contract_info
-            
+            return FetchResult(address, network, contract=contract_info)
+        
+        except requests.exceptions.HTTPError as e:
+            # The exception text includes the request URL, and with it the API key
+            return failure(FetchError.NETWORK_ERROR,
+                           f"Network error: HTTP {e.response.status_code} {e.response.reason}",
+                           status_code=e.response.status_code, retry_after=_retry_after(e.response))
         except requests.exceptions.RequestException as e:
-            print(f"❌ Network error: {e}")
-            return None
+            return failure(FetchError.NETWORK_ERROR, f"Network error: {_redact_api_key(str(e))}")
         except Exception as e:
-            print(f"❌ Error fetching contract: {e}")
-            return None
+            return failure(FetchError.ERROR, f"Error fetching contract: {_redact_api_key(str(e))}")
+    
+    def _print_failure(self, result: FetchResult):
+        """Print a failed fetch with hints on how to fix it."""
+        network = result.blockchain
+        if result.error == FetchError.INVALID_API_KEY and network == BlockchainNetwork.POLYGON_MAINNET:
+            print(f"❌ Polygon API requires valid API key (V2 migration)")
+            print(f"💡 Get a free API key from https://etherscan.io/apis")
+            print(f"🔧 Set environment: export POLYGONSCAN_API_KEY=\"your_key\"")
+            print(f"📋 Polygon now uses Etherscan V2 API with chain ID 137")
+            return
+        
+        print(f"❌ {result.message}")
+        if result.error == FetchError.INVALID_API_KEY:
+            print(f"💡 Get a free API key from {self.explorer_urls[network].replace('/address/', '/apis')}")
+        elif result.error == FetchError.NOT_VERIFIED:
+            print(f"📋 This contract is not open source or hasn't been verified")
+            print(f"🔗 Check: {self.explorer_urls[network]}{result.address}")
+        elif result.error == FetchError.RATE_LIMITED:
+            print(f"⏳ Please wait a moment and try again")
+        if result.attempts > 1:
+            print(f"🔁 Gave up after {result.attempts} attempts")
     
     def _fetch_solana_contract(self, address: str) -> Optional[ContractInfo]:
         """Fetch Solana program information."""
         
+        print(f"🔍 Analyzing Solana program: {address}")
+        
+        query = functools.partial(self._query_solana_program, address)
+        result = self._with_retries(address, BlockchainNetwork.SOLANA_MAINNET, 'solana', '', query, report=True)
+        if not result.ok:
+            self._print_failure(result)
+            return None
+        
+        print(f"✅ Solana program found")
+        return result.contract
+    
+    def _query_solana_program(self, address: str) -> FetchResult:
+        """
+        Request a Solana account from the RPC API and describe it.
+        
+        Like _query_evm_contract, this neither waits for the rate limiter nor prints.
+        
+        Returns:
+            FetchResult holding the program or the classified failure
+        """
+        network = BlockchainNetwork.SOLANA_MAINNET
+        
         try:
-            print(f"🔍 Analyzing Solana program: {address}")
-            
             # For Solana, we'll use the RPC API to get account info
-            rpc_url = "https://api.mainnet-beta.solana.com"
-            
             payload = {
                 "jsonrpc": "2.0",
                 "id": 1,
@@ -284,20 +615,30 @@ class ContractSourceFetcher:
                 ]
             }
             
-            self._rate_limit()
-            response = requests.post(rpc_url, json=payload, timeout=10)
+            response = self.http.post(self.api_endpoints[network], json=payload, timeout=10)
+            if response.status_code == 429:
+                self.rate_limiter.record_rate_limited('solana')
+                return FetchResult(address, network, error=FetchError.RATE_LIMITED,
+                                   message="Rate limit exceeded for solana",
+                                   status_code=429, retry_after=_retry_after(response))
             response.raise_for_status()
             
             data = response.json()
             
-            if data.get('error'):
-                print(f"❌ Solana RPC Error: {data['error']}")
-                return None
+            error = data.get('error')
+            if error:
+                if is_rate_limit_message(error.get('message') if isinstance(error, dict) else error):
+                    self.rate_limiter.record_rate_limited('solana')
+                    return FetchResult(address, network, error=FetchError.RATE_LIMITED,
+                                       message="Rate limit exceeded for solana")
+                return FetchResult(address, network, error=FetchError.API_ERROR,
+                                   message=f"Solana RPC Error: {error}")
             
+            self.rate_limiter.record_success('solana')
             result = data.get('result')
             if not result or not result.get('value'):
-                print("❌ Solana account not found")
-                return None
+                return FetchResult(address, network, error=FetchError.NOT_FOUND,
+                                   message="Solana account not found")
             
             account_info = result['value']
             
@@ -314,19 +655,83 @@ class ContractSourceFetcher:
                 source_code=source_code,
                 contract_name="Solana Program",
                 compiler_version="Unknown",
-                blockchain=BlockchainNetwork.SOLANA_MAINNET,
+                blockchain=network,
                 is_verified=False,  # Solana programs are not verified in the same way
-                explorer_url=self.explorer_urls[BlockchainNetwork.SOLANA_MAINNET] + address
+                explorer_url=self.explorer_urls[network] + address
             )
-            
-            print(f"✅ Solana program found")
-            print(f"👤 Owner: {owner}")
-            
-            return contract_info
-            
+            return FetchResult(address, network, contract=contract_info)
+        
+        except requests.exceptions.HTTPError as e:
+            return FetchResult(address, network, error=FetchError.NETWORK_ERROR,
+                               message=f"Error fetching Solana program: HTTP {e.response.status_code} "
+                                       f"{e.response.reason}",
+                               status_code=e.response.status_code, retry_after=_retry_after(e.response))
+        except requests.exceptions.RequestException as e:
+            return FetchResult(address, network, error=FetchError.NETWORK_ERROR,
+                               message=f"Error fetching Solana program: {e}")
         except Exception as e:
-            print(f"❌ Error fetching Solana program: {e}")
-            return None
+            return FetchResult(address, network, error=FetchError.ERROR,
+                               message=f"Error fetching Solana program: {e}")
+    
+    async def fetch_many(self, addresses: Iterable[Union[str, Tuple[str, BlockchainNetwork]]],
+                         concurrency: int = 4, url_hint: str = "") -> AsyncIterator[FetchResult]:
+        """
+        Fetch many contracts concurrently, yielding results as they complete.
+        
+        Each explorer gets its own rate limit, retry policy state and up to
+        ``concurrency`` requests in flight, so a slow, throttled or failing
+        explorer does not hold back the others. Requests run on worker threads over the pooled HTTP
+        client. Cached EVM contracts are yielded without any request. Nothing
+        is printed: failures are yielded as results with an error instead.
+        
+        Args:
+            addresses: Contract addresses, or (address, network) pairs for
+                addresses whose network cannot be told from the address alone
+                (EVM addresses look the same on every chain)
+            concurrency: Maximum requests in flight per explorer
+            url_hint: Optional URL hint used to detect the network of plain addresses
+        
+        Yields:
+            One FetchResult per address, in completion order
+        """
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=concurrency * len(BlockchainNetwork),
+                                      thread_name_prefix='contract-fetch')
+        semaphores: Dict[str, asyncio.Semaphore] = {}
+        
+        async def fetch(item: Union[str, Tuple[str, BlockchainNetwork]]) -> FetchResult:
+            if isinstance(item, tuple):
+                address, network = item
+            else:
+                address, network = item, self._detect_network_from_address(item, url_hint)
+            if network == BlockchainNetwork.SOLANA_MAINNET:
+                service_name, api_key = 'solana', ''
+                query = functools.partial(self._query_solana_program, address)
+            else:
+                if self.cache is not None:
+                    cached = await loop.run_in_executor(executor, self.cache.get, address, network)
+                    if cached is not None:
+                        return cached
+                service = self._evm_service(network)
+                if service is None:
+                    return FetchResult(address, network, error=FetchError.NOT_CONFIGURED,
+                                       message=f"API endpoint not configured for {network.value}")
+                _, service_name, api_key = service
+                query = functools.partial(self._query_and_cache, address, network, service)
+            
+            semaphore = semaphores.setdefault(service_name, asyncio.Semaphore(concurrency))
+            return await self._with_retries_async(address, network, service_name, api_key, query,
+                                                  semaphore, executor)
+        
+        tasks = [asyncio.ensure_future(fetch(item)) for item in addresses]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                yield await completed
+        finally:
+            # Stop pending fetches when the caller stops iterating early
+            for task in tasks:
+                task.cancel()
+            executor.shutdown(wait=False)
     
     def get_supported_networks(self) -> Dict[str, str]:
         """Get list of supported networks with their descriptions."""
@@ -13,42 +13,918 @@ import re
 import logging
 import subprocess
 import json
-from typing import List, Dict, Optional, Tuple
+import hashlib
+import threading
+from types import MappingProxyType
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple, Mapping, Pattern, Union
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import tempfile
 import os
+import shutil
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import lru_cache
 
+from cache_store import SQLiteCache, read_json, write_json
+from slither_pool import SlitherWorkerPool, SlitherPoolError
+from source_index import SnippetRef, get_source_index
+from solidity_lexer import TokenKind, get_token_stream
+from source_structure import StructureIndex, get_structure_index
+from scan_engine import ScanEngine, ScanRule, ScanStats, DEFAULT_RULE_TIME_BUDGET
 
-@dataclass
-class Finding:
+
+# Regex flags used by each detector family. Solidity patterns run over the whole
+# source; Solana and chain-specific patterns are matched line by line.
+SOLIDITY_REGEX_FLAGS = re.IGNORECASE | re.MULTILINE | re.DOTALL
+LINE_REGEX_FLAGS = re.IGNORECASE | re.MULTILINE
+
+
+@dataclass(frozen=True)
+class DetectorMetadata:
     """
-    Represents a security finding from the analysis.
+    Descriptive text shared by every finding of one detector.
     
     Attributes:
+        detector_id: Catalog id of the detector (e.g. "solidity:reentrancy")
         vulnerability_type: The type of vulnerability (e.g., "Reentrancy")
         severity: Severity level (Critical, High, Medium, Low, Info)
-        line_number: Line number where the issue was found (1-indexed)
-        code_snippet: The problematic code snippet
         description: Human-readable description of the issue
         explanation: Educational explanation of how this could be exploited
         recommendation: How to fix the issue
         cwe_id: Common Weakness Enumeration ID if applicable
         swc_id: Smart Contract Weakness Classification ID if applicable
     """
+    detector_id: str
     vulnerability_type: str
     severity: str
-    line_number: Optional[int]
-    code_snippet: str
     description: str
     explanation: str
     recommendation: str
     cwe_id: Optional[str] = None
     swc_id: Optional[str] = None
     
+    def to_dict(self) -> Dict:
+        """Convert metadata to dictionary for JSON serialization (without the id)."""
+        data = asdict(self)
+        del data['detector_id']
+        return data
+
+
+class FindingCatalog:
+    """
+    Process-wide registry of detector metadata referenced by findings.
+    
+    Registering identical metadata twice returns the same instance, so every
+    finding of a detector points at one shared copy of its text.
+    """
+    
+    def __init__(self):
+        self._by_id: Dict[str, DetectorMetadata] = {}
+        self._lock = threading.Lock()
+    
+    def register(self, detector_id: Optional[str], vulnerability_type: str, severity: str,
+                 description: str, explanation: str, recommendation: str,
+                 cwe_id: Optional[str] = None, swc_id: Optional[str] = None) -> DetectorMetadata:
+        """
+        Register detector metadata, reusing the entry if it is already known.
+        
+        Args:
+            detector_id: Preferred catalog id; derived from the vulnerability
+                type when None. A suffix is added if the id is taken by
+                different metadata.
+            vulnerability_type: The type of vulnerability
+            severity: Severity level
+            description: Human-readable description of the issue
+            explanation: Educational explanation of the issue
+            recommendation: How to fix the issue
+            cwe_id: CWE ID if applicable
+            swc_id: SWC ID if applicable
+            
+        Returns:
+            The shared DetectorMetadata instance
+        """
+        fields = (vulnerability_type, severity, description, explanation, recommendation, cwe_id, swc_id)
+        base_id = detector_id or re.sub(r'[^a-z0-9]+', '_', vulnerability_type.lower()).strip('_')
+        
+        existing = self._by_id.get(base_id)
+        if existing is not None and self._fields(existing) == fields:
+            return existing
+        
+        with self._lock:
+            candidate = base_id
+            if candidate in self._by_id and self._fields(self._by_id[candidate]) != fields:
+                digest = hashlib.sha256(json.dumps(fields).encode()).hexdigest()[:8]
+                candidate = f"{base_id}#{digest}"
+            metadata = self._by_id.get(candidate)
+            if metadata is None:
+                metadata = DetectorMetadata(candidate, *fields)
+                self._by_id[candidate] = metadata
+            return metadata
+    
+    @staticmethod
+    def _fields(metadata: DetectorMetadata) -> Tuple:
+        return (metadata.vulnerability_type, metadata.severity, metadata.description,
+                metadata.explanation, metadata.recommendation, metadata.cwe_id, metadata.swc_id)
+    
+    def get(self, detector_id: str) -> Optional[DetectorMetadata]:
+        """Look up registered metadata by id."""
+        return self._by_id.get(detector_id)
+    
+    def to_dict(self, detector_ids: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Serialize the metadata of the given detectors once each.
+        
+        Args:
+            detector_ids: Ids referenced by the findings being serialized
+            
+        Returns:
+            Mapping of detector id to its metadata dictionary
+        """
+        return {
+            detector_id: self._by_id[detector_id].to_dict()
+            for detector_id in dict.fromkeys(detector_ids)
+            if detector_id in self._by_id
+        }
+    
+    def load(self, catalog: Mapping[str, Dict]) -> None:
+        """Register every entry of a catalog serialized with to_dict()."""
+        for detector_id, data in catalog.items():
+            self.register(detector_id, data['vulnerability_type'], data['severity'],
+                          data['description'], data['explanation'], data['recommendation'],
+                          data.get('cwe_id'), data.get('swc_id'))
+
+
+FINDING_CATALOG = FindingCatalog()
+
+
+def register_pattern_metadata(family: str, patterns: Mapping[str, Dict]) -> Dict[str, DetectorMetadata]:
+    """
+    Register the metadata of a detector family's patterns in FINDING_CATALOG.
+    
+    The vulnerability type is the pattern's "type" if given, otherwise its
+    title-cased name.
+    
+    Args:
+        family: Detector family (e.g. "solidity", "solana", "chain:bsc")
+        patterns: Pattern definitions keyed by pattern name
+        
+    Returns:
+        Shared metadata keyed by pattern name
+    """
+    return {
+        pattern_name: FINDING_CATALOG.register(
+            f"{family}:{pattern_name}",
+            pattern_data.get('type') or pattern_name.replace('_', ' ').title(),
+            pattern_data['severity'],
+            pattern_data['description'],
+            pattern_data['explanation'],
+            pattern_data['recommendation'],
+            pattern_data.get('cwe_id'),
+            pattern_data.get('swc_id')
+        )
+        for pattern_name, pattern_data in patterns.items()
+    }
+
+
+class Finding:
+    """
+    Represents a security finding from the analysis.
+    
+    A finding only stores its location, snippet and a reference to the
+    shared DetectorMetadata of the detector that produced it; the type,
+    severity and descriptive text are read through from the metadata.
+    Findings can still be built with the full set of fields, which registers
+    the metadata in FINDING_CATALOG.
+    
+    Attributes:
+        vulnerability_type: The type of vulnerability (e.g., "Reentrancy")
+        severity: Severity level (Critical, High, Medium, Low, Info)
+        line_number: Line number where the issue was found (1-indexed)
+        code_snippet: The problematic code snippet
+        description: Human-readable description of the issue
+        explanation: Educational explanation of how this could be exploited
+        recommendation: How to fix the issue
+        cwe_id: Common Weakness Enumeration ID if applicable
+        swc_id: Smart Contract Weakness Classification ID if applicable
+        function: Enclosing function (e.g. "Bank.withdraw") if the finding is inside one
+        detector_id: Catalog id of the detector metadata
+        fingerprint: Stable id of the reported issue for dedup and baselines
+    """
+    __slots__ = ('metadata', 'line_number', '_code_snippet', 'function', '_description', '_fingerprint')
+    
+    def __init__(self, vulnerability_type: str, severity: str, line_number: Optional[int],
+                 code_snippet: Union[str, SnippetRef], description: str, explanation: str, recommendation: str,
+                 cwe_id: Optional[str] = None, swc_id: Optional[str] = None,
+                 function: Optional[str] = None, detector_id: Optional[str] = None):
+        self.line_number = line_number
+        self._code_snippet = code_snippet
+        self.function = function
+        self._description = None
+        self._fingerprint = None
+        
+        # A known detector with a finding-specific description keeps its shared metadata
+        metadata = FINDING_CATALOG.get(detector_id) if detector_id else None
+        if metadata is not None and metadata == DetectorMetadata(
+                detector_id, vulnerability_type, severity, metadata.description,
+                explanation, recommendation, cwe_id, swc_id):
+            self.metadata = metadata
+            self._description = description if description != metadata.description else None
+            return
+        self.metadata = FINDING_CATALOG.register(
+            detector_id, vulnerability_type, severity, description,
+            explanation, recommendation, cwe_id, swc_id
+        )
+    
+    @classmethod
+    def from_metadata(cls, metadata: DetectorMetadata, line_number: Optional[int],
+                      code_snippet: Union[str, SnippetRef], function: Optional[str] = None,
+                      description: Optional[str] = None) -> "Finding":
+        """
+        Create a finding for a registered detector.
+        
+        Args:
+            metadata: Shared metadata of the detector
+            line_number: Line number where the issue was found
+            code_snippet: The problematic code snippet, or a SnippetRef
+                building it on first access
+            function: Enclosing function, if any
+            description: Finding-specific description overriding the detector's
+            
+        Returns:
+            New finding referencing the metadata
+        """
+        finding = cls.__new__(cls)
+        finding.metadata = metadata
+        finding.line_number = line_number
+        finding._code_snippet = code_snippet
+        finding.function = function
+        finding._description = description if description != metadata.description else None
+        finding._fingerprint = None
+        return finding
+    
+    @classmethod
+    def from_dict(cls, data: Mapping, catalog: Optional[Mapping[str, Dict]] = None,
+                  code: Optional[str] = None) -> "Finding":
+        """
+        Rebuild a finding from to_dict() or to_compact_dict() output.
+        
+        Args:
+            data: Serialized finding
+            catalog: Serialized catalog the compact form refers to, if not
+                already registered in this process
+            code: Source the finding was reported in; required when the
+                snippet was serialized as a line reference
+            
+        Returns:
+            The finding
+        """
+        if 'vulnerability_type' in data:
+            # The fingerprint is derived from the other fields
+            return cls(**{key: value for key, value in data.items() if key != 'fingerprint'})
+        if catalog:
+            FINDING_CATALOG.load(catalog)
+        metadata = FINDING_CATALOG.get(data['detector_id'])
+        if metadata is None:
+            raise KeyError(f"Unknown detector id: {data['detector_id']}")
+        if 'snippet_ref' in data:
+            if code is None:
+                raise ValueError("The source is required to rebuild a snippet reference")
+            code_snippet = get_source_index(code).snippet_ref(**data['snippet_ref'])
+        else:
+            code_snippet = data.get('code_snippet', '')
+        return cls.from_metadata(metadata, data.get('line_number'), code_snippet,
+                                 data.get('function'), data.get('description'))
+    
+    @property
+    def code_snippet(self) -> str:
+        """The problematic code snippet, built from the source on first access."""
+        snippet = self._code_snippet
+        if isinstance(snippet, SnippetRef):
+            snippet = self._code_snippet = snippet.materialize()
+        return snippet
+    
+    @code_snippet.setter
+    def code_snippet(self, value: Union[str, SnippetRef]) -> None:
+        self._code_snippet = value
+        self._fingerprint = None
+    
+    @property
+    def fingerprint(self) -> str:
+        """Stable fingerprint of the reported issue, computed on first access (see finding_fingerprint)."""
+        if self._fingerprint is None:
+            self._fingerprint = finding_fingerprint(self)
+        return self._fingerprint
+    
+    @property
+    def detector_id(self) -> str:
+        return self.metadata.detector_id
+    
+    @property
+    def vulnerability_type(self) -> str:
+        return self.metadata.vulnerability_type
+    
+    @property
+    def severity(self) -> str:
+        return self.metadata.severity
+    
+    @property
+    def description(self) -> str:
+        return self._description if self._description is not None else self.metadata.description
+    
+    @property
+    def explanation(self) -> str:
+        return self.metadata.explanation
+    
+    @property
+    def recommendation(self) -> str:
+        return self.metadata.recommendation
+    
+    @property
+    def cwe_id(self) -> Optional[str]:
+        return self.metadata.cwe_id
+    
+    @property
+    def swc_id(self) -> Optional[str]:
+        return self.metadata.swc_id
+    
     def to_dict(self) -> Dict:
         """Convert finding to dictionary for JSON serialization."""
-        return asdict(self)
+        return {
+            'vulnerability_type': self.vulnerability_type,
+            'severity': self.severity,
+            'line_number': self.line_number,
+            'code_snippet': self.code_snippet,
+            'description': self.description,
+            'explanation': self.explanation,
+            'recommendation': self.recommendation,
+            'cwe_id': self.cwe_id,
+            'swc_id': self.swc_id,
+            'function': self.function,
+            'detector_id': self.detector_id,
+            'fingerprint': self.fingerprint
+        }
+    
+    def to_compact_dict(self, snippet_ref: bool = False) -> Dict:
+        """
+        Convert finding to a dictionary that refers to its detector metadata by id.
+        
+        Serialize the metadata once per report with FINDING_CATALOG.to_dict().
+        
+        Args:
+            snippet_ref: Store a snippet that has not been built yet as its
+                line reference ('snippet_ref') instead of its text, for
+                storage next to the source; from_dict() then needs the source
+        """
+        data = {
+            'detector_id': self.detector_id,
+            'fingerprint': self.fingerprint,
+            'line_number': self.line_number
+        }
+        if snippet_ref and isinstance(self._code_snippet, SnippetRef):
+            data['snippet_ref'] = self._code_snippet.to_dict()
+        else:
+            data['code_snippet'] = self.code_snippet
+        data['function'] = self.function
+        if self._description is not None:
+            data['description'] = self._description
+        return data
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Finding):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return (f"Finding(vulnerability_type={self.vulnerability_type!r}, severity={self.severity!r}, "
+                f"line_number={self.line_number!r}, function={self.function!r})")
+
+
+# Rank of each severity level, most severe first
+SEVERITY_ORDER = {'Critical': 0, 'High': 1, 'Medium': 2, 'Low': 3, 'Info': 4}
+
+
+# Slither checks that report the same issue as a regex detector. Findings of a
+# mapped check share the regex detector's issue class, so both tools' reports
+# of one issue get the same fingerprint and are merged.
+SLITHER_CHECK_DETECTORS = MappingProxyType({
+    'reentrancy-eth': 'solidity:reentrancy_simple',
+    'reentrancy-no-eth': 'solidity:reentrancy_simple',
+    'reentrancy-benign': 'solidity:reentrancy_simple',
+    'reentrancy-events': 'solidity:reentrancy_simple',
+    'reentrancy-unlimited-gas': 'solidity:reentrancy_simple',
+    'unchecked-lowlevel': 'solidity:unchecked_call',
+    'unchecked-send': 'solidity:unchecked_call',
+    'unchecked-transfer': 'solidity:unchecked_call',
+    'tx-origin': 'solidity:tx_origin',
+    'deprecated-standards': 'solidity:deprecated_functions',
+    'weak-prng': 'solidity:weak_randomness',
+    'uninitialized-storage': 'solidity:uninitialized_storage',
+    'controlled-delegatecall': 'solidity:delegatecall_danger',
+    'delegatecall-loop': 'solidity:delegatecall_danger',
+})
+
+_SNIPPET_MARKER = ">>> "
+
+
+def issue_class(finding: Finding) -> str:
+    """
+    Get the detector id identifying the kind of issue a finding reports.
+    
+    Slither checks listed in SLITHER_CHECK_DETECTORS map to the regex
+    detector reporting the same issue; every other finding is its own class.
+    
+    Args:
+        finding: Finding to classify
+        
+    Returns:
+        Detector id of the issue class
+    """
+    detector_id = finding.detector_id
+    if detector_id.startswith('slither:'):
+        check = detector_id.split(':')[1]
+        return SLITHER_CHECK_DETECTORS.get(check, f"slither:{check}")
+    return detector_id
+
+
+def _normalized_snippet(finding: Finding) -> str:
+    """Text of the flagged line with whitespace collapsed, or of the whole snippet."""
+    snippet = finding._code_snippet
+    if isinstance(snippet, SnippetRef):
+        text = snippet.index.line_text(snippet.line_number)
+    else:
+        text = snippet
+        for line in snippet.split('\n'):
+            if line.startswith(_SNIPPET_MARKER):
+                text = line[len(_SNIPPET_MARKER):]
+                break
+    return ' '.join(text.split())
+
+
+def finding_fingerprint(finding: Finding) -> str:
+    """
+    Compute the stable fingerprint identifying the issue a finding reports.
+    
+    The fingerprint hashes the issue class, the enclosing function and the
+    whitespace-normalized text of the flagged line. It leaves out line
+    numbers, so it survives edits elsewhere in the source and can be
+    compared across runs. Findings without a snippet (e.g. detector
+    timeouts) include their description instead.
+    
+    Args:
+        finding: Finding to fingerprint
+        
+    Returns:
+        16 hex digit fingerprint
+    """
+    snippet = _normalized_snippet(finding)
+    parts = [issue_class(finding), (finding.function or '').strip(),
+             hashlib.sha256(snippet.encode('utf-8')).hexdigest()]
+    if not snippet:
+        parts.append(finding.description)
+    return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+
+def finding_key(finding: Finding) -> str:
+    """
+    Get the key under which two findings are considered duplicates.
+    
+    The fingerprint alone leaves out the line number, so identical lines
+    (e.g. two `throw;` statements in one function) would collapse into one
+    finding. It is only compared on its own against baselines and when
+    merging Slither findings into regex findings.
+    
+    Args:
+        finding: Finding to key
+        
+    Returns:
+        The finding's fingerprint and line number
+    """
+    return f"{finding.fingerprint}:{finding.line_number}"
+
+
+def compare_findings(findings: List[Finding], baseline: Iterable[str]) -> Dict[str, List]:
+    """
+    Compare findings against the fingerprints of an earlier analysis.
+    
+    Args:
+        findings: Findings of the current analysis
+        baseline: Fingerprints of the baseline analysis (e.g. the "fingerprint"
+            field of the findings in an earlier JSON report)
+        
+    Returns:
+        Dictionary with the 'new' and 'unchanged' findings and the 'fixed'
+        baseline fingerprints no longer reported
+    """
+    baseline = set(baseline)
+    current = set()
+    result = {'new': [], 'unchanged': [], 'fixed': []}
+    for finding in findings:
+        fingerprint = finding.fingerprint
+        current.add(fingerprint)
+        result['unchanged' if fingerprint in baseline else 'new'].append(finding)
+    result['fixed'] = sorted(baseline - current)
+    return result
+
+
+def sort_by_severity(findings: List[Finding]) -> List[Finding]:
+    """
+    Sort findings by severity level (Critical -> Info), keeping the order within a level.
+    
+    Args:
+        findings: Findings to sort
+        
+    Returns:
+        New sorted list of findings
+    """
+    return sorted(findings, key=lambda x: SEVERITY_ORDER.get(x.severity, 4))
+
+
+def severity_ordered_patterns(patterns: Dict[str, Dict], severity_threshold: str) -> List[str]:
+    """
+    Select the patterns that can produce a finding at or above a severity.
+    
+    Args:
+        patterns: Pattern definitions with a 'severity' entry each
+        severity_threshold: Least severe level to keep (e.g. "High")
+        
+    Returns:
+        Names of the selected patterns, most severe first (definition order
+        within a level)
+    """
+    threshold = SEVERITY_ORDER.get(severity_threshold, 4)
+    selected = [name for name, data in patterns.items() if SEVERITY_ORDER.get(data['severity'], 4) <= threshold]
+    return sorted(selected, key=lambda name: SEVERITY_ORDER.get(patterns[name]['severity'], 4))
+
+
+_ANALYSIS_INCOMPLETE = FINDING_CATALOG.register(
+    "analysis_incomplete", "Analysis Incomplete", "Info",
+    "Analysis did not finish within the deadline",
+    "Results from this stage were not available before the analysis deadline, so only the findings of the other detectors are reported.",
+    "Re-run the analysis with a longer deadline (cached results make repeat runs faster) to include the complete results."
+)
+
+_DETECTOR_TIMED_OUT = FINDING_CATALOG.register(
+    "detector_timed_out", "Detector Timed Out", "Info",
+    "Detector timed out",
+    "The detector exceeded its execution budget on this source and was aborted. Matches found before the timeout are still reported, but later occurrences may have been missed.",
+    "Review the code manually for this vulnerability class, or split very large flattened sources before analysis."
+)
+
+
+def analysis_incomplete_finding(stage: str, deadline: float) -> Finding:
+    """
+    Build the finding reported when an analysis stage misses the caller's deadline.
+    
+    Args:
+        stage: Name of the stage that did not finish (e.g. "Slither")
+        deadline: Deadline in seconds that was exceeded
+        
+    Returns:
+        Informational finding noting that the results are partial
+    """
+    return Finding.from_metadata(
+        _ANALYSIS_INCOMPLETE, line_number=None, code_snippet="",
+        description=f"{stage} analysis did not finish within {deadline:.1f}s"
+    )
+
+
+def detector_timeout_finding(detector_name: str) -> Finding:
+    """
+    Build the finding reported when a detector exceeds its execution budget.
+    
+    Args:
+        detector_name: Name of the pattern that was aborted
+        
+    Returns:
+        Informational finding noting that results for the detector are incomplete
+    """
+    return Finding.from_metadata(
+        _DETECTOR_TIMED_OUT, line_number=None, code_snippet="",
+        description=f"Detector timed out: {detector_name.replace('_', ' ').title()}"
+    )
+
+
+# Comment and string literal syntax per source language. Block comments are
+# matched to the end of the source when unterminated.
+_MASKABLE_SYNTAX = {
+    'solidity': re.compile(
+        r'//[^\n]*'
+        r'|/\*.*?(?:\*/|\Z)'
+        r'|"(?:\\.|[^"\\\n])*"'
+        r"|'(?:\\.|[^'\\\n])*'",
+        re.DOTALL
+    ),
+    'rust': re.compile(
+        r'//[^\n]*'
+        r'|/\*.*?(?:\*/|\Z)'
+        r'|b?r(#*)".*?"\1'
+        r'|b?"(?:\\.|[^"\\])*"'
+        # Char literals hold exactly one (escaped) character, unlike lifetimes ('a)
+        r"|b?'(?:\\(?:u\{[0-9a-fA-F]{1,6}\}|x[0-9a-fA-F]{2}|.)|[^'\\\n])'",
+        re.DOTALL
+    ),
+}
+
+
+def _blank(text: str) -> str:
+    """Replace every character except newlines with a space."""
+    if '\n' not in text:
+        return ' ' * len(text)
+    return '\n'.join(' ' * len(part) for part in text.split('\n'))
+
+
+def _mask_match(match) -> str:
+    """Blank a comment entirely, or the contents of a string literal between its quotes."""
+    text = match.group(0)
+    if text.startswith(('//', '/*')):
+        return _blank(text)
+    # Keep any literal prefix (b, r#) and the quotes themselves
+    opening = min(i for i in (text.find('"'), text.find("'")) if i >= 0)
+    closing = text.rindex(text[opening])
+    return text[:opening + 1] + _blank(text[opening + 1:closing]) + text[closing:]
+
+
+@lru_cache(maxsize=8)
+def mask_comments_and_strings(code: str, language: str = 'solidity') -> str:
+    """
+    Blank out comments and string literal contents in one linear pass.
+    
+    The masked view has the same length and line structure as the original, so
+    match offsets and line numbers map back to the original source unchanged.
+    The result is cached per source, so every detector family scanning the
+    same code shares one masked view.
+    
+    Args:
+        code: Source code to mask
+        language: Source language, "solidity" or "rust"
+        
+    Returns:
+        Masked source of identical length
+    """
+    if language != 'solidity':
+        return _MASKABLE_SYNTAX[language].sub(_mask_match, code)
+
+    # Solidity reuses the shared token stream instead of a separate regex pass
+    tokens = get_token_stream(code)
+    comment = int(TokenKind.COMMENT)
+    parts = []
+    position = 0
+    for index in tokens.iter_kind(TokenKind.COMMENT, TokenKind.STRING):
+        start, end = tokens.span(index)
+        parts.append(code[position:start])
+        if tokens.kinds[index] == comment:
+            parts.append(_blank(code[start:end]))
+        else:
+            parts.append(code[start] + _blank(code[start + 1:end - 1]) + code[end - 1])
+        position = end
+    parts.append(code[position:])
+    return ''.join(parts)
+
+
+@dataclass(frozen=True)
+class CompiledPatternSet:
+    """
+    Immutable set of compiled regexes shared by every detector instance.
+    
+    Attributes:
+        family: Detector family the patterns belong to (e.g. "solidity", "solana")
+        version: Hash of the pattern definitions and regex flags
+        regexes: Read-only mapping of pattern name to compiled regex
+        engine: Single-pass scanning engine running every pattern of the set
+    """
+    family: str
+    version: str
+    regexes: Mapping[str, Pattern]
+    engine: ScanEngine
+
+
+# Process-wide registry of compiled pattern sets keyed by (family, version, line_mode)
+_PATTERN_REGISTRY: Dict[Tuple[str, str, bool], CompiledPatternSet] = {}
+_PATTERN_REGISTRY_LOCK = threading.Lock()
+
+
+def pattern_set_version(patterns: Dict[str, Dict], flags: int) -> str:
+    """
+    Compute a stable version hash for a set of pattern definitions.
+    
+    Args:
+        patterns: Pattern definitions keyed by pattern name
+        flags: Regex flags the patterns are compiled with
+        
+    Returns:
+        Short hex digest that changes whenever any pattern or its metadata changes
+    """
+    payload = json.dumps({'flags': int(flags), 'patterns': patterns}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def get_compiled_patterns(family: str, patterns: Dict[str, Dict], flags: int,
+                          line_mode: bool = False) -> CompiledPatternSet:
+    """
+    Return the compiled pattern set for a detector family, compiling it once per process.
+    
+    Args:
+        family: Detector family name used to namespace the registry
+        patterns: Pattern definitions with a 'pattern' regex entry and optional
+            'anchors' and 'requires' literals each
+        flags: Regex flags to compile the patterns with
+        line_mode: Whether the patterns are matched per line instead of over the whole source
+        
+    Returns:
+        Shared CompiledPatternSet for this exact pattern set version
+    """
+    key = (family, pattern_set_version(patterns, flags), line_mode)
+    compiled = _PATTERN_REGISTRY.get(key)
+    if compiled is None:
+        with _PATTERN_REGISTRY_LOCK:
+            compiled = _PATTERN_REGISTRY.get(key)
+            if compiled is None:
+                regexes = {name: re.compile(data['pattern'], flags) for name, data in patterns.items()}
+                compiled = CompiledPatternSet(
+                    family=family,
+                    version=key[1],
+                    regexes=MappingProxyType(regexes),
+                    engine=ScanEngine(
+                        [
+                            ScanRule(
+                                name,
+                                regexes[name],
+                                anchors=tuple(data.get('anchors', ())),
+                                requires=tuple(tuple(group) for group in data.get('requires', ())),
+                                line_mode=line_mode,
+                                time_budget=data.get('time_budget', DEFAULT_RULE_TIME_BUDGET)
+                            )
+                            for name, data in patterns.items()
+                        ],
+                        name=family
+                    )
+                )
+                _PATTERN_REGISTRY[key] = compiled
+    return compiled
+
+
+# Slither probe results memoized per process (keyed by PATH) and persisted to
+# the cache directory keyed by PATH and the executable's mtime
+SLITHER_PROBE_CACHE_FILE = 'slither_probe.json'
+_SLITHER_PROBES: Dict[str, Optional[str]] = {}
+_SLITHER_PROBE_LOCK = threading.Lock()
+
+
+def _probe_slither(path_env: str) -> Optional[str]:
+    """Locate Slither on PATH and read its version, using the on-disk capability cache."""
+    executable = shutil.which('slither', path=path_env)
+    if executable is None:
+        return None
+    try:
+        mtime_ns = os.stat(executable).st_mtime_ns
+    except OSError:
+        return None
+    
+    key = {'path': path_env, 'executable': executable, 'mtime_ns': mtime_ns}
+    cached = read_json(SLITHER_PROBE_CACHE_FILE)
+    if isinstance(cached, dict) and cached.get('key') == key:
+        return cached.get('version')
+    
+    try:
+        result = subprocess.run([executable, '--version'],
+                                capture_output=True, text=True, timeout=5)
+    except (subprocess.TimeoutExpired, OSError, subprocess.SubprocessError):
+        # Not persisted: a slow first start should not disable Slither for good
+        return None
+    version = (result.stdout.strip() or 'unknown') if result.returncode == 0 else None
+    write_json(SLITHER_PROBE_CACHE_FILE, {'key': key, 'version': version})
+    return version
+
+
+def get_slither_version() -> Optional[str]:
+    """
+    Get the installed Slither version, probing for it at most once per process.
+    
+    The probe only runs when Slither is first needed. Its result is also
+    cached on disk, keyed by PATH and the modification time of the slither
+    executable, so later processes skip the `slither --version` subprocess.
+    
+    Returns:
+        Slither version string, or None if Slither is not available
+    """
+    path_env = os.environ.get('PATH', os.defpath)
+    if path_env not in _SLITHER_PROBES:
+        with _SLITHER_PROBE_LOCK:
+            if path_env not in _SLITHER_PROBES:
+                _SLITHER_PROBES[path_env] = _probe_slither(path_env)
+    return _SLITHER_PROBES[path_env]
+
+
+# solc is often a solc-select shim whose version changes without the
+# executable changing, so its version is only memoized per process
+_SOLC_VERSIONS: Dict[str, Optional[str]] = {}
+
+
+def get_solc_version() -> Optional[str]:
+    """
+    Get the version of the solc compiler Slither will use, probing once per process.
+    
+    Returns:
+        solc version string (e.g. "0.8.19+commit.7dd6d404"), or None if solc is not available
+    """
+    path_env = os.environ.get('PATH', os.defpath)
+    if path_env not in _SOLC_VERSIONS:
+        with _SLITHER_PROBE_LOCK:
+            if path_env not in _SOLC_VERSIONS:
+                version = None
+                executable = shutil.which('solc', path=path_env)
+                if executable is not None:
+                    try:
+                        result = subprocess.run([executable, '--version'],
+                                                capture_output=True, text=True, timeout=5)
+                        match = re.search(r'Version:\s*(\S+)', result.stdout)
+                        if result.returncode == 0:
+                            version = match.group(1) if match else result.stdout.strip()
+                    except (subprocess.TimeoutExpired, OSError, subprocess.SubprocessError):
+                        pass
+                _SOLC_VERSIONS[path_env] = version
+    return _SOLC_VERSIONS[path_env]
+
+
+# Parsed Slither findings cached across runs, keyed by source and toolchain
+SLITHER_RESULT_CACHE_FILE = 'slither_results.sqlite'
+# Bumped when the layout of cached entries changes, so older entries are never read
+SLITHER_RESULT_CACHE_FORMAT = 2
+_SLITHER_RESULT_CACHE: Optional[SQLiteCache] = None
+
+
+def get_slither_result_cache() -> SQLiteCache:
+    """Get the process-wide Slither result cache, opening it on first use."""
+    global _SLITHER_RESULT_CACHE
+    if _SLITHER_RESULT_CACHE is None:
+        with _SLITHER_PROBE_LOCK:
+            if _SLITHER_RESULT_CACHE is None:
+                _SLITHER_RESULT_CACHE = SQLiteCache(SLITHER_RESULT_CACHE_FILE)
+    return _SLITHER_RESULT_CACHE
+
+
+def slither_cache_key(code: str, slither_version: Optional[str], solc_version: Optional[str],
+                      detectors: str = 'all') -> str:
+    """
+    Build the content-addressed cache key for a Slither analysis.
+    
+    Args:
+        code: Analyzed Solidity source
+        slither_version: Installed Slither version
+        solc_version: Installed solc version
+        detectors: Slither detectors that were enabled
+        
+    Returns:
+        Hex digest identifying the source and toolchain
+    """
+    payload = json.dumps({
+        'format': SLITHER_RESULT_CACHE_FORMAT,
+        'source': hashlib.sha256(code.encode('utf-8')).hexdigest(),
+        'slither': slither_version,
+        'solc': solc_version,
+        'detectors': detectors,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# Background threads running Slither analyses alongside the regex detectors
+SLITHER_EXECUTOR_WORKERS = 4
+_SLITHER_EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+
+def get_slither_executor() -> ThreadPoolExecutor:
+    """Get the process-wide executor Slither analyses run on, creating it on first use."""
+    global _SLITHER_EXECUTOR
+    if _SLITHER_EXECUTOR is None:
+        with _SLITHER_PROBE_LOCK:
+            if _SLITHER_EXECUTOR is None:
+                _SLITHER_EXECUTOR = ThreadPoolExecutor(
+                    max_workers=SLITHER_EXECUTOR_WORKERS, thread_name_prefix='slither'
+                )
+    return _SLITHER_EXECUTOR
+
+
+# Durations of Slither runs in this process, used to estimate the time a
+# fail-fast analysis saves by skipping Slither
+_SLITHER_DURATIONS = {'count': 0, 'total': 0.0}
+
+
+def record_slither_duration(seconds: float) -> None:
+    """Record how long an uncached Slither analysis took."""
+    with _SLITHER_PROBE_LOCK:
+        _SLITHER_DURATIONS['count'] += 1
+        _SLITHER_DURATIONS['total'] += seconds
+
+
+def estimated_slither_duration() -> Optional[float]:
+    """Get the mean duration of the Slither runs seen so far, or None if there were none."""
+    with _SLITHER_PROBE_LOCK:
+        if not _SLITHER_DURATIONS['count']:
+            return None
+        return _SLITHER_DURATIONS['total'] / _SLITHER_DURATIONS['count']
 
 
 class VulnerabilityDetector:
@@ -60,32 +936,62 @@ class VulnerabilityDetector:
     smart contract security analysis.
     """
     
-    def __init__(self):
+    def __init__(self, slither_pool: Optional[SlitherWorkerPool] = None,
+                 slither_cache: Optional[SQLiteCache] = None):
+        """
+        Args:
+            slither_pool: Optional pool of warm Slither workers to run Slither
+                analyses on instead of spawning a subprocess per contract
+            slither_cache: Optional store for parsed Slither findings; defaults
+                to the shared on-disk cache in the cache directory
+        """
         self.logger = logging.getLogger(__name__)
-        self.slither_available = self._check_slither_availability()
+        self.slither_pool = slither_pool
+        self._slither_cache = slither_cache
         
         # Define vulnerability patterns
         self.patterns = self._initialize_patterns()
+        self.compiled_patterns = get_compiled_patterns('solidity', self.patterns, SOLIDITY_REGEX_FLAGS)
+        self.metadata = register_pattern_metadata('solidity', self.patterns)
+    
+    @property
+    def slither_available(self) -> bool:
+        """Whether Slither is installed (probed lazily on first access)."""
+        return self._check_slither_availability()
     
     def _check_slither_availability(self) -> bool:
         """Check if Slither is installed and available."""
-        try:
-            result = subprocess.run(['slither', '--version'], 
-                                  capture_output=True, text=True, timeout=5)
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.SubprocessError):
-            return False
+        return get_slither_version() is not None
     
     def _initialize_patterns(self) -> Dict[str, Dict]:
         """
         Initialize regex patterns for vulnerability detection.
         
+        Each pattern lists the literal 'anchors' its matches start with so the
+        scanning engine only tries it where one of them occurs, and optionally
+        'requires': groups of literals the source must contain (one per group)
+        for the pattern to run at all. Patterns may also override the engine's
+        'time_budget' (seconds).
+        
+        Patterns with 'scope': 'function' only match inside a function,
+        modifier or constructor and never past its closing brace; functions
+        whose mutability is listed in 'skip_mutability' are not scanned.
+        
+        Patterns that scan up to a delimiter commit to their first candidate
+        with a capturing lookahead followed by a backreference, e.g.
+        (?=([^;]*?before))\1 - Python's re has no atomic groups before 3.11,
+        and this keeps them linear on long statements instead of retrying
+        every earlier split point.
+        
         Returns:
             Dictionary of vulnerability patterns with their metadata
         """
         return {
             'reentrancy': {
-                'pattern': r'(?:\.call(?:\.value)?\s*\(|\.send\s*\(|\.transfer\s*\()(?:[^;]*?)(?:before|prior to)(?:[^;]*?)(?:balance|state)',
+                'pattern': r'(?:\.call(?:\.value)?\s*\(|\.send\s*\(|\.transfer\s*\()(?=([^;]*?(?:before|prior to)))\1(?:[^;]*?)(?:balance|state)',
+                'anchors': ['.call', '.send', '.transfer'],
+                'requires': [['before', 'prior to'], ['balance', 'state']],
+                'scope': 'function',
                 'severity': 'Critical',
                 'cwe_id': 'CWE-841',
                 'swc_id': 'SWC-107',
@@ -94,7 +1000,11 @@ class VulnerabilityDetector:
                 'recommendation': 'Use the Checks-Effects-Interactions pattern: perform all checks first, update state variables second, and interact with external contracts last. Consider using OpenZeppelin\'s ReentrancyGuard modifier.'
             },
             'reentrancy_simple': {
-                'pattern': r'(?:\.call\s*\((?:[^)]*)\)\s*;(?:[^}]*?)(?:balance|amount|value)\s*(?:-=|\+=|=))',
+                'pattern': r'(?:\.call\s*\((?:[^)]*)\)\s*;(?:.*?)(?:balance|amount|value)\s*(?:-=|\+=|=))',
+                'anchors': ['.call'],
+                'requires': [['balance', 'amount', 'value']],
+                'scope': 'function',
+                'skip_mutability': ['view', 'pure'],
                 'severity': 'Critical',
                 'cwe_id': 'CWE-841',
                 'swc_id': 'SWC-107',
@@ -104,6 +1014,8 @@ class VulnerabilityDetector:
             },
             'unchecked_call': {
                 'pattern': r'(?:\.call|\.send|\.transfer)\s*\([^)]*\)\s*;(?!\s*(?:require|assert|if))',
+                'anchors': ['.call', '.send', '.transfer'],
+                'scope': 'function',
                 'severity': 'High',
                 'cwe_id': 'CWE-252',
                 'swc_id': 'SWC-104',
@@ -112,7 +1024,11 @@ class VulnerabilityDetector:
                 'recommendation': 'Always check return values of external calls using require() statements or conditional logic. Consider using transfer() instead of send() for Ether transfers as it automatically reverts on failure.'
             },
             'access_control': {
-                'pattern': r'function\s+\w+\s*\([^)]*\)\s*(?:public|external)(?!\s+(?:view|pure))(?![^{]*(?:onlyOwner|require\s*\(.*msg\.sender|modifier\s+\w+))',
+                'pattern': r'function\s+\w+\s*\([^)]*\)\s*(?:public|external)(?!\s+(?:view|pure))(?![^{]*(?:onlyOwner|modifier\s+\w+))(?!(?=([^{]*?require\s*\())\1[^{]*msg\.sender)',
+                'anchors': ['function'],
+                'requires': [['public', 'external']],
+                'scope': 'function',
+                'skip_mutability': ['view', 'pure'],
                 'severity': 'High',
                 'cwe_id': 'CWE-284',
                 'swc_id': 'SWC-105',
@@ -121,7 +1037,9 @@ class VulnerabilityDetector:
                 'recommendation': 'Add appropriate access control modifiers (e.g., onlyOwner) or require statements to restrict function access to authorized users only.'
             },
             'integer_overflow': {
-                'pattern': r'pragma\s+solidity\s+[^;]*[0-6]\.[0-7]\.\d+(?:[^{]*(?:\+\+|--|\+=|-=|\*=|/=))',
+                'pattern': r'pragma\s+solidity\s+(?=([^;]*?[0-6]\.[0-7]\.\d+))\1(?=([^{]*(?:\+\+|--|\+=|-=|\*=|/=)))\2',
+                'anchors': ['pragma'],
+                'requires': [['solidity'], ['++', '--', '+=', '-=', '*=', '/=']],
                 'severity': 'High',
                 'cwe_id': 'CWE-190',
                 'swc_id': 'SWC-101',
@@ -131,6 +1049,7 @@ class VulnerabilityDetector:
             },
             'tx_origin': {
                 'pattern': r'tx\.origin\s*(?:==|!=)',
+                'anchors': ['tx.origin'],
                 'severity': 'Medium',
                 'cwe_id': 'CWE-346',
                 'swc_id': 'SWC-115',
@@ -140,6 +1059,7 @@ class VulnerabilityDetector:
             },
             'deprecated_functions': {
                 'pattern': r'(?:suicide\s*\(|throw\s*;|block\.blockhash|sha3\s*\()',
+                'anchors': ['suicide', 'throw', 'block.blockhash', 'sha3'],
                 'severity': 'Low',
                 'cwe_id': None,
                 'swc_id': 'SWC-111',
@@ -149,6 +1069,8 @@ class VulnerabilityDetector:
             },
             'weak_randomness': {
                 'pattern': r'(?:block\.timestamp|block\.number|block\.difficulty|blockhash\s*\([^)]*\))(?:[^;]*?)(?:random|rand|seed)',
+                'anchors': ['block.timestamp', 'block.number', 'block.difficulty', 'blockhash'],
+                'requires': [['rand', 'seed']],
                 'severity': 'Medium',
                 'cwe_id': 'CWE-338',
                 'swc_id': 'SWC-120',
@@ -157,7 +1079,9 @@ class VulnerabilityDetector:
                 'recommendation': 'Use a commit-reveal scheme, oracle services like Chainlink VRF, or other secure randomness solutions instead of blockchain data for random number generation.'
             },
             'uninitialized_storage': {
-                'pattern': r'(?:struct|mapping)(?:[^;]*?)(?:storage)(?:[^;=]*?)(?:;)',
+                'pattern': r'(?:struct|mapping)(?=([^;]*storage))\1(?:[^;=]*?)(?:;)',
+                'anchors': ['struct', 'mapping'],
+                'requires': [['storage']],
                 'severity': 'Medium',
                 'cwe_id': 'CWE-909',
                 'swc_id': 'SWC-109',
@@ -167,6 +1091,7 @@ class VulnerabilityDetector:
             },
             'delegatecall_danger': {
                 'pattern': r'delegatecall\s*\(',
+                'anchors': ['delegatecall'],
                 'severity': 'High',
                 'cwe_id': 'CWE-470',
                 'swc_id': 'SWC-112',
@@ -176,98 +1101,282 @@ class VulnerabilityDetector:
             }
         }
     
-    def analyze(self, code: str) -> List[Finding]:
+    def analyze(self, code: str, stats: Optional[ScanStats] = None,
+                deadline: Optional[float] = None,
+                on_regex_findings: Optional[Callable[[List[Finding]], None]] = None) -> List[Finding]:
         """
         Perform comprehensive security analysis on Solidity code.
         
+        Collects analyze_iter() and sorts the findings by severity.
+        
         Args:
             code: The Solidity source code to analyze
+            stats: Optional ScanStats updated with how many detectors the
+                literal prefilter skipped and which stages did not finish
+            deadline: Optional number of seconds to wait for Slither
+            on_regex_findings: Optional callback receiving the regex findings as
+                soon as they are available, before Slither has finished
             
         Returns:
             List of security findings
         """
-        findings = []
+        return self._sort_by_severity(list(self.analyze_iter(code, stats, deadline, on_regex_findings)))
+    
+    def analyze_iter(self, code: str, stats: Optional[ScanStats] = None,
+                     deadline: Optional[float] = None,
+                     on_regex_findings: Optional[Callable[[List[Finding]], None]] = None
+                     ) -> Iterator[Finding]:
+        """
+        Analyze Solidity code, yielding findings as each detector produces them.
         
-        # Run regex-based detection
-        regex_findings = self._detect_with_regex(code)
-        findings.extend(regex_findings)
+        Slither runs on a background thread while the regex detectors run in
+        the caller, so the wall time is that of the slower stage rather than
+        the sum of both. Regex findings are yielded detector by detector, and
+        Slither findings once Slither has finished. Duplicates are dropped as
+        they arrive; findings are not sorted.
         
-        # Run Slither if available
+        Args:
+            code: The Solidity source code to analyze
+            stats: Optional ScanStats updated with how many detectors the
+                literal prefilter skipped and which stages did not finish
+            deadline: Optional number of seconds to wait for Slither. If it
+                overruns, an "Analysis Incomplete" finding is yielded instead
+                and "slither" is recorded in stats.incomplete_stages; the
+                Slither run still completes in the background and populates
+                the Slither result cache.
+            on_regex_findings: Optional callback receiving the (sorted) regex
+                findings once the regex pass is done, before Slither has finished
+            
+        Yields:
+            Deduplicated security findings
+        """
+        if stats is None:
+            stats = ScanStats()
+        started = time.monotonic()
+        seen = set()
+        
+        # Start Slither first so it runs alongside the regex pass
+        slither_future = None
         if self.slither_available:
-            try:
-                slither_findings = self._detect_with_slither(code)
-                findings.extend(slither_findings)
-            except Exception as e:
-                self.logger.warning(f"Slither analysis failed: {e}")
+            slither_future = get_slither_executor().submit(self._detect_with_slither, code, stats)
         
-        # Remove duplicates and sort by severity
-        findings = self._deduplicate_findings(findings)
-        findings = self._sort_by_severity(findings)
+        try:
+            # Run regex-based detection
+            regex_findings = []
+            for finding in self._iter_regex(code, stats):
+                key = self._dedup_key(finding)
+                if key not in seen:
+                    seen.add(key)
+                    regex_findings.append(finding)
+                    yield finding
+            if on_regex_findings is not None:
+                on_regex_findings(self._sort_by_severity(regex_findings))
+            
+            # Merge Slither results once they are ready. A Slither finding is a
+            # duplicate when a regex finding reports the same issue (same
+            # fingerprint) or, since Slither reports at the function rather
+            # than the statement, the same issue class in the same function;
+            # but only if the regex finding is at least as severe.
+            if slither_future is not None:
+                regex_ranks = {}
+                for finding in regex_findings:
+                    rank = SEVERITY_ORDER.get(finding.severity, 4)
+                    issues = [finding.fingerprint]
+                    if finding.function:
+                        issues.append((issue_class(finding), finding.function))
+                    for issue in issues:
+                        regex_ranks[issue] = min(rank, regex_ranks.get(issue, rank))
+                for finding in self._await_slither(slither_future, stats, deadline, started):
+                    key = self._dedup_key(finding)
+                    rank = SEVERITY_ORDER.get(finding.severity, 4)
+                    issues = [finding.fingerprint, (issue_class(finding), finding.function)]
+                    if key in seen or any(regex_ranks.get(issue, 5) <= rank for issue in issues):
+                        continue
+                    seen.add(key)
+                    yield finding
+        finally:
+            # A consumer that stops early does not need the Slither result
+            if slither_future is not None:
+                slither_future.cancel()
+    
+    def _await_slither(self, slither_future: Future, stats: ScanStats,
+                       deadline: Optional[float], started: float) -> List[Finding]:
+        """
+        Wait for a background Slither analysis within the caller's deadline.
         
-        return findings
+        Args:
+            slither_future: Future of the _detect_with_slither call
+            stats: ScanStats recording Slither as incomplete if it overruns
+            deadline: Optional number of seconds the whole analysis may take
+            started: time.monotonic() value at which the analysis started
+            
+        Returns:
+            Slither findings, or an "Analysis Incomplete" finding on overrun
+        """
+        timeout = None if deadline is None else max(0.0, deadline - (time.monotonic() - started))
+        try:
+            return slither_future.result(timeout=timeout)
+        except FutureTimeoutError:
+            self.logger.warning(f"Slither did not finish within the {deadline:.1f}s deadline")
+            stats.incomplete_stages.append('slither')
+            return [analysis_incomplete_finding('Slither', deadline)]
+        except Exception as e:
+            self.logger.warning(f"Slither analysis failed: {e}")
+            if 'slither' not in stats.failed_stages:
+                stats.failed_stages.append('slither')
+            return []
     
-    def _detect_with_regex(self, code: str) -> List[Finding]:
+    def _detect_with_regex(self, code: str, stats: Optional[ScanStats] = None) -> List[Finding]:
         """
         Detect vulnerabilities using regex patterns.
         
         Args:
             code: Solidity source code
+            stats: Optional ScanStats updated by the scanning engine
             
         Returns:
             List of findings from regex analysis
         """
-        findings = []
-        lines = code.split('\n')
+        return list(self._iter_regex(code, stats))
+    
+    def _iter_regex(self, code: str, stats: Optional[ScanStats] = None,
+                    pattern_names: Optional[List[str]] = None) -> Iterator[Finding]:
+        """
+        Yield regex findings pattern by pattern as the scanning engine confirms them.
         
-        for pattern_name, pattern_data in self.patterns.items():
-            pattern = pattern_data['pattern']
-            compiled_pattern = re.compile(pattern, re.IGNORECASE | re.MULTILINE | re.DOTALL)
-            
-            # Search in full code for complex patterns
-            matches = compiled_pattern.finditer(code)
+        Args:
+            code: Solidity source code
+            stats: Optional ScanStats updated by the scanning engine
+            pattern_names: Optional patterns to run, in order; defaults to all
             
-            for match in matches:
-                # Find line number
-                line_number = code[:match.start()].count('\n') + 1
-                
-                # Extract code snippet
-                start_line = max(0, line_number - 2)
-                end_line = min(len(lines), line_number + 2)
-                snippet_lines = lines[start_line:end_line]
-                
-                # Highlight the problematic line
-                if line_number - 1 < len(lines):
-                    snippet_lines[line_number - start_line - 1] = f">>> {snippet_lines[line_number - start_line - 1]}"
-                
-                code_snippet = '\n'.join(snippet_lines)
+        Yields:
+            Findings from regex analysis, including a timeout finding for each
+            pattern aborted for exceeding its execution budget
+        """
+        source_index = get_source_index(code)
+        
+        # Confine function-scoped patterns to the function they start in
+        structure = get_structure_index(code)
+        scopes = {
+            pattern_name: self._function_scope(structure, pattern_data.get('skip_mutability', ()))
+            for pattern_name, pattern_data in self.patterns.items()
+            if pattern_data.get('scope') == 'function'
+        }
+        
+        # Run every pattern in a single pass over the code, ignoring comments
+        # and string literals
+        matches = self.compiled_patterns.engine.iter_scan(
+            mask_comments_and_strings(code), stats, scopes, rule_ids=pattern_names
+        )
+        
+        for pattern_name, spans, timed_out in matches:
+            metadata = self.metadata[pattern_name]
+            for match_start, _ in spans:
+                # Find line number and enclosing function
+                line_number = source_index.line_of(match_start)
+                function = structure.callable_at(match_start)
                 
-                finding = Finding(
-                    vulnerability_type=pattern_name.replace('_', ' ').title(),
-                    severity=pattern_data['severity'],
+                # Snippet highlighting the problematic line, built only if read
+                yield Finding.from_metadata(
+                    metadata,
                     line_number=line_number,
-                    code_snippet=code_snippet,
-                    description=pattern_data['description'],
-                    explanation=pattern_data['explanation'],
-                    recommendation=pattern_data['recommendation'],
-                    cwe_id=pattern_data.get('cwe_id'),
-                    swc_id=pattern_data.get('swc_id')
+                    code_snippet=source_index.snippet_ref(line_number, marker=">>> "),
+                    function=function.qualified_name if function else None
                 )
-                
-                findings.append(finding)
+            
+            # Report patterns aborted for exceeding their execution budget
+            if timed_out:
+                self.logger.warning(f"Detector {pattern_name} timed out")
+                yield detector_timeout_finding(pattern_name)
+    
+    @staticmethod
+    def _function_scope(structure: StructureIndex, skip_mutability) -> Callable[[int], Optional[int]]:
+        """
+        Build the scope function confining a pattern to function bodies.
         
-        return findings
+        Args:
+            structure: Structural index of the analyzed source
+            skip_mutability: Function mutabilities (e.g. "view") the pattern ignores
+            
+        Returns:
+            Function mapping a match position to the end of its enclosing
+            function, or None when the position should not be scanned
+        """
+        def scope_end(position: int) -> Optional[int]:
+            function = structure.callable_at(position)
+            if function is None or function.mutability in skip_mutability:
+                return None
+            return function.end
+        
+        return scope_end
     
-    def _detect_with_slither(self, code: str) -> List[Finding]:
+    @property
+    def slither_cache(self) -> SQLiteCache:
+        """Store used for parsed Slither findings."""
+        if self._slither_cache is None:
+            self._slither_cache = get_slither_result_cache()
+        return self._slither_cache
+    
+    def _detect_with_slither(self, code: str, stats: Optional[ScanStats] = None) -> List[Finding]:
         """
         Detect vulnerabilities using Slither static analysis tool.
         
+        Findings are cached by source hash and toolchain version, so analyzing
+        unchanged code again does not run Slither at all.
+        
         Args:
             code: Solidity source code
+            stats: Optional ScanStats recording the time spent running Slither,
+                and "slither" in failed_stages if the run failed
             
         Returns:
-            List of findings from Slither analysis
+            List of findings from Slither analysis (empty if it failed)
         """
-        findings = []
+        # Every Slither detector is enabled on both the pool and subprocess paths
+        cache_key = slither_cache_key(code, get_slither_version(), get_solc_version(), detectors='all')
+        cached = self.slither_cache.get(cache_key)
+        if cached is not None:
+            # Compact findings keep their own descriptions out of the shared catalog
+            return [Finding.from_dict(finding, cached['detector_catalog']) for finding in cached['findings']]
+        
+        slither_started = time.monotonic()
+        detector_results = self._run_slither(code)
+        if stats is not None:
+            stats.record_stage('slither', time.monotonic() - slither_started)
+        if detector_results is None:
+            if stats is not None:
+                stats.failed_stages.append('slither')
+            return []
+        record_slither_duration(time.monotonic() - slither_started)
+        
+        findings = self._parse_slither_results(code, detector_results)
+        self.slither_cache.set(cache_key, {
+            'detector_catalog': FINDING_CATALOG.to_dict(finding.detector_id for finding in findings),
+            'findings': [finding.to_compact_dict() for finding in findings]
+        })
+        return findings
+    
+    def _run_slither(self, code: str) -> Optional[List[Dict]]:
+        """
+        Run Slither over a source.
+        
+        Uses the detector's Slither worker pool when one was provided, and a
+        one-off `slither` subprocess otherwise.
+        
+        Args:
+            code: Solidity source code
+            
+        Returns:
+            Slither detector results, or None if the analysis failed
+        """
+        if self.slither_pool is not None:
+            try:
+                return self.slither_pool.run(code)
+            except SlitherPoolError as e:
+                self.logger.warning(f"Slither analysis error: {e}")
+                return None
+        
+        detector_results = None
         
         try:
             # Create temporary file
@@ -285,49 +1394,7 @@ class VulnerabilityDetector:
                 
                 # Parse Slither results
                 if 'results' in slither_data:
-                    for detector_result in slither_data['results']['detectors']:
-                        # Map Slither severity to our severity levels
-                        slither_impact = detector_result.get('impact', 'Informational')
-                        severity_map = {
-                            'High': 'High',
-                            'Medium': 'Medium', 
-                            'Low': 'Low',
-                            'Informational': 'Info'
-                        }
-                        severity = severity_map.get(slither_impact, 'Info')
-                        
-                        # Extract location information
-                        elements = detector_result.get('elements', [])
-                        line_number = None
-                        code_snippet = ""
-                        
-                        if elements:
-                            first_element = elements[0]
-                            if 'source_mapping' in first_element:
-                                lines_info = first_element['source_mapping'].get('lines', [])
-                                if lines_info:
-                                    line_number = lines_info[0]
-                                    
-                                    # Extract code snippet around the line
-                                    code_lines = code.split('\n')
-                                    start_line = max(0, line_number - 2)
-                                    end_line = min(len(code_lines), line_number + 2)
-                                    snippet_lines = code_lines[start_line:end_line]
-                                    code_snippet = '\n'.join(snippet_lines)
-                        
-                        finding = Finding(
-                            vulnerability_type=f"Slither: {detector_result.get('check', 'Unknown')}",
-                            severity=severity,
-                            line_number=line_number,
-                            code_snippet=code_snippet,
-                            description=detector_result.get('description', 'Slither detected an issue'),
-                            explanation="This issue was detected by Slither static analysis. Review the specific detector documentation for detailed exploitation scenarios.",
-                            recommendation="Follow Slither's recommendations and consult smart contract security best practices.",
-                            swc_id=None,
-                            cwe_id=None
-                        )
-                        
-                        findings.append(finding)
+                    detector_results = slither_data['results']['detectors']
         
         except (subprocess.TimeoutExpired, json.JSONDecodeError, Exception) as e:
             self.logger.warning(f"Slither analysis error: {e}")
@@ -340,11 +1407,82 @@ class VulnerabilityDetector:
             except:
                 pass
         
+        return detector_results
+    
+    def _parse_slither_results(self, code: str, detector_results: List[Dict]) -> List[Finding]:
+        """
+        Convert Slither detector results into findings.
+        
+        Args:
+            code: Solidity source code that was analyzed
+            detector_results: Entries of results.detectors from Slither's JSON output
+            
+        Returns:
+            List of findings from Slither analysis
+        """
+        findings = []
+        
+        for detector_result in detector_results:
+            # Map Slither severity to our severity levels
+            slither_impact = detector_result.get('impact', 'Informational')
+            severity_map = {
+                'High': 'High',
+                'Medium': 'Medium', 
+                'Low': 'Low',
+                'Informational': 'Info'
+            }
+            severity = severity_map.get(slither_impact, 'Info')
+            
+            # Extract location information
+            elements = detector_result.get('elements', [])
+            line_number = None
+            code_snippet = ""
+            function_name = None
+            
+            if elements:
+                first_element = elements[0]
+                if 'source_mapping' in first_element:
+                    lines_info = first_element['source_mapping'].get('lines', [])
+                    if lines_info:
+                        line_number = lines_info[0]
+                        
+                        # Extract code snippet around the line
+                        source_index = get_source_index(code)
+                        code_snippet = source_index.snippet(line_number)
+                        
+                        # Tag the function the reported line belongs to; lines in
+                        # other files (e.g. imports) fall outside this source
+                        if 1 <= line_number <= source_index.line_count:
+                            line_text = source_index.line_text(line_number)
+                            offset = source_index.line_starts[line_number - 1] + len(line_text) - len(line_text.lstrip())
+                            function = get_structure_index(code).callable_at(offset)
+                            function_name = function.qualified_name if function else None
+            
+            # Slither descriptions name the exact statement, so they stay per finding
+            check = detector_result.get('check', 'Unknown')
+            metadata = FINDING_CATALOG.register(
+                f"slither:{check}:{severity.lower()}",
+                f"Slither: {check}",
+                severity,
+                "Slither detected an issue",
+                "This issue was detected by Slither static analysis. Review the specific detector documentation for detailed exploitation scenarios.",
+                "Follow Slither's recommendations and consult smart contract security best practices."
+            )
+            finding = Finding.from_metadata(
+                metadata,
+                line_number=line_number,
+                code_snippet=code_snippet,
+                function=function_name,
+                description=detector_result.get('description', 'Slither detected an issue')
+            )
+            
+            findings.append(finding)
+        
         return findings
     
     def _deduplicate_findings(self, findings: List[Finding]) -> List[Finding]:
         """
-        Remove duplicate findings based on vulnerability type and line number.
+        Remove findings with the same fingerprint and line, keeping the first of each.
         
         Args:
             findings: List of findings that may contain duplicates
@@ -356,8 +1494,7 @@ class VulnerabilityDetector:
         deduplicated = []
         
         for finding in findings:
-            # Create a key for deduplication
-            key = (finding.vulnerability_type, finding.line_number, finding.description[:50])
+            key = self._dedup_key(finding)
             
             if key not in seen:
                 seen.add(key)
@@ -365,6 +1502,11 @@ class VulnerabilityDetector:
         
         return deduplicated
     
+    @staticmethod
+    def _dedup_key(finding: Finding) -> str:
+        """Key under which findings are considered duplicates."""
+        return finding_key(finding)
+    
     def _sort_by_severity(self, findings: List[Finding]) -> List[Finding]:
         """
         Sort findings by severity level.
@@ -375,9 +1517,7 @@ class VulnerabilityDetector:
         Returns:
             Sorted list of findings (Critical -> Info)
         """
-        severity_order = {'Critical': 0, 'High': 1, 'Medium': 2, 'Low': 3, 'Info': 4}
-        
-        return sorted(findings, key=lambda x: severity_order.get(x.severity, 4))
+        return sort_by_severity(findings)
     
     def get_detector_info(self) -> Dict[str, Dict]:
         """
@@ -396,7 +1536,8 @@ class VulnerabilityDetector:
                 }
                 for name, data in self.patterns.items()
             },
-            'slither_available': self.slither_available
+            'slither_available': self.slither_available,
+            'pattern_version': self.compiled_patterns.version
         }
         
         return info
\ No newline at end of file
@@ -0,0 +1,133 @@
+"""
+Pooled HTTP Client for Explorer and Source Fetches
+
+Every fetch used to go through a bare requests.get/requests.post, paying a
+new TCP (and TLS) handshake per request. This module provides a shared HTTP
+client that keeps connections alive in per-host pools and asks servers for
+gzip-compressed responses. Each thread gets its own requests.Session (cookies
+and other session state are not shared between threads) mounted on one
+HTTPAdapter, whose urllib3 connection pools are thread-safe and shared by
+every thread. Pool sizes can be set per client or, for the process-wide
+client, with the PANDA_AUDITOR_HTTP_POOL_CONNECTIONS and
+PANDA_AUDITOR_HTTP_POOL_MAXSIZE environment variables.
+
+EDUCATIONAL PURPOSE: This tool is designed to help developers learn about smart contract
+security. It should only be used for authorized security assessments and educational purposes.
+"""
+
+import os
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Number of hosts whose connection pools are kept, and connections kept per host
+DEFAULT_POOL_CONNECTIONS = 8
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_TIMEOUT = 10.0
+
+POOL_CONNECTIONS_ENV = 'PANDA_AUDITOR_HTTP_POOL_CONNECTIONS'
+POOL_MAXSIZE_ENV = 'PANDA_AUDITOR_HTTP_POOL_MAXSIZE'
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'panda-web3-auditor/1.0',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+
+
+class HTTPClient:
+    """
+    Thread-safe HTTP client with keep-alive connection pools per host.
+
+    Requests accept the same arguments as requests.get/requests.post and
+    default to the client's timeout. The client can be used as a context
+    manager to close its pooled connections on exit.
+    """
+
+    def __init__(self, pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE, timeout: float = DEFAULT_TIMEOUT):
+        """
+        Args:
+            pool_connections: Number of hosts whose connection pools are kept
+            pool_maxsize: Connections kept alive per host, which is also the
+                number of concurrent requests to one host that reuse a
+                connection; further requests open a temporary one
+            timeout: Default timeout in seconds for every request
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self._adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        """The calling thread's session, mounted on the shared connection pools."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(DEFAULT_HEADERS)
+            session.mount('https://', self._adapter)
+            session.mount('http://', self._adapter)
+            self._local.session = session
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request over a pooled connection.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Arguments accepted by requests.Session.request
+
+        Returns:
+            The response
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request (see request())."""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Send a POST request (see request())."""
+        return self.request('POST', url, **kwargs)
+
+    def close(self) -> None:
+        """Close every pooled connection; later requests open new ones."""
+        self._adapter.close()
+
+    def __enter__(self) -> "HTTPClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+_HTTP_CLIENT: Optional[HTTPClient] = None
+_HTTP_CLIENT_LOCK = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except ValueError:
+        return default
+
+
+def get_http_client() -> HTTPClient:
+    """Get the process-wide HTTP client, creating it on first use."""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None:
+        with _HTTP_CLIENT_LOCK:
+            if _HTTP_CLIENT is None:
+                _HTTP_CLIENT = HTTPClient(
+                    pool_connections=_env_int(POOL_CONNECTIONS_ENV, DEFAULT_POOL_CONNECTIONS),
+                    pool_maxsize=_env_int(POOL_MAXSIZE_ENV, DEFAULT_POOL_MAXSIZE)
+                )
+    return _HTTP_CLIENT
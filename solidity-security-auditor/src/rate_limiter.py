@@ -0,0 +1,205 @@
+"""
+Per-Service Token-Bucket Rate Limiter for Explorer APIs
+
+ContractSourceFetcher used to sleep 200ms between any two requests, so
+fetches from different explorers throttled each other as if they were one
+API. This module keeps one token bucket per service and API key, configured
+from APIConfig.rate_limits (seconds between requests) and
+APIConfig.rate_bursts (requests allowed back to back), so each explorer gets
+its own quota and bursts up to it.
+
+Buckets are safe to share between threads and asyncio tasks: taking a token
+only reserves it under a lock and returns how long the caller must wait, and
+the wait happens outside the lock with time.sleep or asyncio.sleep.
+Reservations beyond the available tokens queue up in order. A token comes
+back one window (burst x interval) after it was taken rather than refilling
+continuously, so a full burst never pushes a window past the provider quota
+(a continuously refilled bucket of 5 tokens at 5/s lets 9 requests through in
+the first second). When a response says the rate limit was hit, the bucket
+halves its rate and drops its saved burst; every successful response then
+restores part of the configured rate (additive increase, multiplicative
+decrease).
+
+EDUCATIONAL PURPOSE: This tool is designed to help developers learn about smart contract
+security. It should only be used for authorized security assessments and educational purposes.
+"""
+
+import asyncio
+import collections
+import math
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from api_config import APIConfig, api_config
+
+
+# Rate multiplier applied when a response reports the rate limit was hit
+BACKOFF_FACTOR = 0.5
+# Share of the configured rate restored by each successful response
+RECOVERY_STEP = 0.1
+# The adaptive rate never drops below the configured rate divided by this
+MAX_SLOWDOWN = 16
+# Seconds added to every window, so jitter between taking a token and the
+# request reaching the provider does not squeeze two windows into one
+WINDOW_MARGIN = 0.05
+
+
+def is_rate_limit_message(text: Optional[str]) -> bool:
+    """Check whether an API message or result says the rate limit was hit."""
+    return bool(text) and 'rate limit' in str(text).lower()
+
+
+class TokenBucket:
+    """
+    Token bucket with an adaptive refill rate.
+
+    The bucket holds up to ``burst`` tokens. Each request takes one, and the
+    token returns one window (``burst`` requests at the current rate) later;
+    when none is left the caller waits for the oldest one to return.
+    """
+
+    def __init__(self, interval: float, burst: int = 1):
+        """
+        Args:
+            interval: Seconds between requests at the sustained rate; 0 or
+                less disables limiting
+            burst: Requests allowed back to back after an idle period
+        """
+        self.rate = 1.0 / interval if interval > 0 else math.inf
+        self.burst = max(1, burst)
+        self.current_rate = self.rate
+        # Times at which the last ``burst`` tokens were (or will be) used, oldest first
+        self._taken = collections.deque()
+        self._lock = threading.Lock()
+
+    @property
+    def unlimited(self) -> bool:
+        return math.isinf(self.rate)
+
+    def reserve(self) -> float:
+        """
+        Take a token without waiting for it.
+
+        Returns:
+            Seconds the caller must wait before sending its request
+        """
+        if self.unlimited:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            start = now
+            if len(self._taken) >= self.burst:
+                window = self.burst / self.current_rate + WINDOW_MARGIN
+                start = max(now, self._taken.popleft() + window)
+            self._taken.append(start)
+            return start - now
+
+    def acquire(self) -> float:
+        """Wait for a token in the calling thread; return the seconds waited."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self) -> float:
+        """Wait for a token without blocking the event loop; return the seconds waited."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def penalize(self) -> None:
+        """Slow down after the service reported that the rate limit was hit."""
+        if self.unlimited:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self.current_rate = max(self.rate / MAX_SLOWDOWN, self.current_rate * BACKOFF_FACTOR)
+            # Drop the saved burst: every token counts as taken now at the earliest
+            taken = [max(when, now) for when in self._taken]
+            self._taken = collections.deque([now] * (self.burst - len(taken)) + taken)
+
+    def reward(self) -> None:
+        """Restore part of the configured rate after a successful response."""
+        if self.unlimited or self.current_rate >= self.rate:
+            return
+        with self._lock:
+            self.current_rate = min(self.rate, self.current_rate + self.rate * RECOVERY_STEP)
+
+
+class RateLimiter:
+    """Token buckets per (service, API key), created from the API configuration on first use."""
+
+    def __init__(self, config: APIConfig = api_config):
+        """
+        Args:
+            config: API configuration providing each service's rate limit and burst
+        """
+        self.config = config
+        self._overrides: Dict[str, Tuple[float, int]] = {}
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, service: str, interval: float, burst: int = 1) -> None:
+        """
+        Override the configured limit of a service.
+
+        Args:
+            service: Service name (e.g. "etherscan")
+            interval: Seconds between requests; 0 or less disables limiting
+            burst: Requests allowed back to back
+        """
+        with self._lock:
+            self._overrides[service] = (interval, burst)
+            for key in [key for key in self._buckets if key[0] == service]:
+                del self._buckets[key]
+
+    def bucket(self, service: str, api_key: str = '') -> TokenBucket:
+        """
+        Get the bucket of a service and API key.
+
+        Requests made with different API keys for the same service have
+        separate quotas, so they get separate buckets.
+        """
+        key = (service, api_key)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    interval, burst = self._overrides.get(service) or (
+                        self.config.get_rate_limit(service), self.config.get_rate_burst(service)
+                    )
+                    bucket = self._buckets[key] = TokenBucket(interval, burst)
+        return bucket
+
+    def acquire(self, service: str, api_key: str = '') -> float:
+        """Wait for a request slot for the service; return the seconds waited."""
+        return self.bucket(service, api_key).acquire()
+
+    async def acquire_async(self, service: str, api_key: str = '') -> float:
+        """Wait for a request slot for the service without blocking the event loop."""
+        return await self.bucket(service, api_key).acquire_async()
+
+    def record_rate_limited(self, service: str, api_key: str = '') -> None:
+        """Report that the service rejected a request for exceeding its rate limit."""
+        self.bucket(service, api_key).penalize()
+
+    def record_success(self, service: str, api_key: str = '') -> None:
+        """Report a request the service accepted."""
+        self.bucket(service, api_key).reward()
+
+
+_RATE_LIMITER: Optional[RateLimiter] = None
+_RATE_LIMITER_LOCK = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide rate limiter, creating it on first use."""
+    global _RATE_LIMITER
+    if _RATE_LIMITER is None:
+        with _RATE_LIMITER_LOCK:
+            if _RATE_LIMITER is None:
+                _RATE_LIMITER = RateLimiter()
+    return _RATE_LIMITER
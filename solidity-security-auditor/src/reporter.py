@@ -12,7 +12,8 @@ and should only be used for authorized security assessments and educational purp
 import hashlib
 from datetime import datetime
 from typing import List, Dict, Optional
-from detectors import Finding
+from detectors import Finding, FINDING_CATALOG
+from source_index import get_source_index
 
 
 class SecurityReporter:
@@ -163,7 +164,7 @@ The automated analysis did not identify any common security issues or anti-patte
     
     def _generate_scope_section(self, source: str, code: str) -> str:
         """Generate audit scope section."""
-        lines_of_code = len(code.split('\n'))
+        lines_of_code = get_source_index(code).line_count
         
         return f"""## Audit Scope
 
@@ -267,6 +268,8 @@ No security vulnerabilities or issues were identified during the automated analy
         ref_text = f"**References:** {', '.join(references)}" if references else ""
         
         line_info = f"**Line:** {finding.line_number}" if finding.line_number else "**Line:** N/A"
+        if finding.function:
+            line_info += f"  \n**Function:** `{finding.function}`"
         
         return f"""#### Finding #{finding_id}: {finding.vulnerability_type}
 
@@ -372,7 +375,7 @@ Even though no vulnerabilities were detected, consider implementing these securi
     
     def _generate_appendix_section(self, code: str, code_hash: str) -> str:
         """Generate appendix with technical details."""
-        lines_of_code = len(code.split('\n'))
+        lines_of_code = get_source_index(code).line_count
         
         return f"""## Appendix
 
@@ -402,7 +405,8 @@ If you discover vulnerabilities in deployed smart contracts based on this analys
 
 Remember: The goal of security research is to make the ecosystem safer for everyone."""
     
-    def generate_json_report(self, code: str, findings: List[Finding], source: str, code_hash: str) -> Dict:
+    def generate_json_report(self, code: str, findings: List[Finding], source: str, code_hash: str,
+                             profile: Optional[Dict] = None) -> Dict:
         """
         Generate a structured JSON report for machine processing.
         
@@ -411,6 +415,8 @@ Remember: The goal of security research is to make the ecosystem safer for every
             findings: List of security findings from the analysis
             source: Description of the code source
             code_hash: SHA256 hash of the analyzed code
+            profile: Optional ScanStats.profile() of the analysis, included
+                in the metadata
             
         Returns:
             Dictionary containing structured report data
@@ -427,14 +433,17 @@ Remember: The goal of security research is to make the ecosystem safer for every
                 'analysis_timestamp': datetime.now().isoformat(),
                 'source': source,
                 'code_hash': code_hash,
-                'lines_of_code': len(code.split('\n'))
+                'lines_of_code': get_source_index(code).line_count,
+                'profile': profile
             },
             'summary': {
                 'total_findings': len(findings),
                 'severity_breakdown': severity_counts,
                 'risk_level': self._calculate_risk_level(severity_counts)
             },
-            'findings': [finding.to_dict() for finding in findings],
+            # Detector text is emitted once per detector; findings refer to it by id
+            'detector_catalog': FINDING_CATALOG.to_dict(finding.detector_id for finding in findings),
+            'findings': [finding.to_compact_dict() for finding in findings],
             'disclaimer': {
                 'educational_use_only': True,
                 'responsible_disclosure_required': True,
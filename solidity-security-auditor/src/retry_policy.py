@@ -0,0 +1,251 @@
+"""
+Retry Policy, Circuit Breakers and Retry Budgets for Explorer Requests
+
+Explorer fetches fail transiently all the time: free keys hit rate limits,
+explorers answer NOTOK under load, connections time out. This module holds
+the pieces ContractSourceFetcher combines to retry such failures without
+hammering the APIs:
+
+- RetryPolicy computes exponential backoff with full jitter (a random delay
+  between 0 and base_delay * 2^attempt, capped at max_delay), honouring a
+  server's Retry-After when it is longer. A Retry-After beyond
+  max_retry_after gives up instead of stalling the fetch.
+- CircuitBreaker, one per explorer, opens after consecutive failures that
+  mean the endpoint is down (connection errors, timeouts, 5xx). While open,
+  requests fail immediately; after reset_timeout a single probe request is
+  let through, and its outcome closes or reopens the breaker.
+- RetryBudget, one per explorer, caps retries at a share of the requests
+  made (plus a small reserve), so a struggling explorer does not get several
+  times its normal traffic from retries.
+
+Deciding which failures are retryable stays with the caller, which knows
+how its results are classified.
+
+EDUCATIONAL PURPOSE: This tool is designed to help developers learn about smart contract
+security. It should only be used for authorized security assessments and educational purposes.
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_BASE_DELAY = 0.5
+DEFAULT_MAX_DELAY = 8.0
+# Longest Retry-After worth waiting for; a longer one fails the request
+DEFAULT_MAX_RETRY_AFTER = 30.0
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+# Retries allowed per request made, and retries allowed regardless of traffic
+DEFAULT_BUDGET_RATIO = 0.2
+DEFAULT_BUDGET_RESERVE = 10
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one explorer endpoint.
+
+    States are "closed" (requests flow), "open" (requests fail fast) and
+    "half_open" (one probe request decides whether the endpoint recovered).
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout: Seconds the breaker stays open before a probe is
+                allowed; also how long a probe may take before another one
+                is let through
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Check whether a request may be sent now; a True in half-open state starts the probe."""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == self.OPEN:
+                if now - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probe_started = None
+            if self.state == self.HALF_OPEN:
+                # A probe that never reported back (e.g. was cancelled) is replaced after reset_timeout
+                if self._probe_started is not None and now - self._probe_started < self.reset_timeout:
+                    return False
+                self._probe_started = now
+            return True
+
+    def retry_in(self) -> float:
+        """Seconds until an open breaker lets a probe through (0 if requests are allowed)."""
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def record_success(self) -> None:
+        """Report a response showing the endpoint is up, whatever its content."""
+        with self._lock:
+            self._failures = 0
+            self.state = self.CLOSED
+            self._probe_started = None
+
+    def record_failure(self) -> None:
+        """Report a request that failed because the endpoint is down or erroring."""
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_started = None
+
+
+class RetryBudget:
+    """
+    Caps retries at a share of the requests made to one explorer.
+
+    Every first attempt deposits ``ratio`` of a token and every retry
+    withdraws a whole one. The balance starts at, and never exceeds,
+    ``reserve``, so a quiet period cannot bank an unbounded burst of retries.
+    """
+
+    def __init__(self, ratio: float = DEFAULT_BUDGET_RATIO, reserve: int = DEFAULT_BUDGET_RESERVE):
+        """
+        Args:
+            ratio: Retries allowed per request under sustained failures
+            reserve: Retries available before any request is made
+        """
+        self.ratio = ratio
+        self.reserve = reserve
+        self._balance = float(reserve)
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        """Deposit the share of a first attempt."""
+        with self._lock:
+            self._balance = min(self.reserve, self._balance + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Withdraw a retry; return False when the budget is exhausted."""
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+class RetryPolicy:
+    """Backoff schedule plus the circuit breakers and retry budgets of each explorer."""
+
+    def __init__(self, max_attempts: int = DEFAULT_MAX_ATTEMPTS, base_delay: float = DEFAULT_BASE_DELAY,
+                 max_delay: float = DEFAULT_MAX_DELAY, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT, budget_ratio: float = DEFAULT_BUDGET_RATIO,
+                 budget_reserve: int = DEFAULT_BUDGET_RESERVE,
+                 max_retry_after: float = DEFAULT_MAX_RETRY_AFTER):
+        """
+        Args:
+            max_attempts: Attempts per request, including the first; 1 disables retries
+            base_delay: Backoff ceiling in seconds before the first retry,
+                doubled for each further retry
+            max_delay: Upper bound of the backoff ceiling
+            failure_threshold: Consecutive endpoint failures that open a breaker
+            reset_timeout: Seconds an open breaker waits before probing
+            budget_ratio: Retries allowed per request under sustained failures
+            budget_reserve: Retries available before any request is made
+            max_retry_after: Longest server-requested delay to wait for;
+                retry_delay() gives up on a longer one
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.budget_ratio = budget_ratio
+        self.budget_reserve = budget_reserve
+        self.max_retry_after = max_retry_after
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._budgets: Dict[str, RetryBudget] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, service: str) -> CircuitBreaker:
+        """Get the circuit breaker of a service, creating it on first use."""
+        with self._lock:
+            breaker = self._breakers.get(service)
+            if breaker is None:
+                breaker = self._breakers[service] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return breaker
+
+    def budget(self, service: str) -> RetryBudget:
+        """Get the retry budget of a service, creating it on first use."""
+        with self._lock:
+            budget = self._budgets.get(service)
+            if budget is None:
+                budget = self._budgets[service] = RetryBudget(self.budget_ratio, self.budget_reserve)
+            return budget
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Delay before the next attempt.
+
+        Args:
+            attempt: Number of attempts made so far (1 after the first)
+            retry_after: Delay the server asked for, if any; honoured up to
+                max_retry_after
+
+        Returns:
+            Seconds to wait
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay = random.uniform(0, ceiling)
+        if retry_after is None:
+            return delay
+        return max(delay, min(retry_after, self.max_retry_after))
+
+    def retry_delay(self, service: str, attempt: int, retryable: bool,
+                    retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Decide whether to retry a failed attempt.
+
+        Args:
+            service: Service the attempt was sent to
+            attempt: Number of attempts made so far (1 after the first)
+            retryable: Whether the failure is transient
+            retry_after: Delay the server asked for, if any
+
+        Returns:
+            Seconds to wait before retrying, or None to give up (including
+            when the server asked to wait longer than max_retry_after)
+        """
+        if not retryable or attempt >= self.max_attempts:
+            return None
+        if retry_after is not None and retry_after > self.max_retry_after:
+            return None
+        if not self.budget(service).try_spend():
+            return None
+        return self.backoff(attempt, retry_after)
+
+
+_RETRY_POLICY: Optional[RetryPolicy] = None
+_RETRY_POLICY_LOCK = threading.Lock()
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Get the process-wide retry policy, creating it on first use."""
+    global _RETRY_POLICY
+    if _RETRY_POLICY is None:
+        with _RETRY_POLICY_LOCK:
+            if _RETRY_POLICY is None:
+                _RETRY_POLICY = RetryPolicy()
+    return _RETRY_POLICY
@@ -0,0 +1,460 @@
+"""
+Single-Pass Multi-Pattern Scanning Engine
+
+This module runs every pattern of a detector family in one traversal of the
+source. Each pattern declares the literal anchors its matches start with and
+any other literals it cannot match without. A single multi-literal pass
+(Aho-Corasick when pyahocorasick is installed, a prefix-factored regex
+alternation otherwise) records where those literals occur. Patterns missing a
+required literal are skipped outright; the rest are only confirmed at the
+positions where one of their anchors occurs. Matches are dispatched back to
+the id of the pattern that produced them. Callers may confine a rule to
+scopes such as function bodies by supplying where each candidate's scope ends.
+
+EDUCATIONAL PURPOSE: This tool is designed to help developers learn about smart contract
+security. It should only be used for authorized security assessments and educational purposes.
+"""
+
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Pattern, Sequence, Set, Tuple
+
+from source_index import get_source_index
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None  # Optional: falls back to a regex alternation of the literals
+
+
+# Execution budget applied to every rule unless the pattern overrides it.
+# A rule is aborted once its confirmations exceed the time budget. The budget
+# is checked before each candidate, so a single catastrophic match() call can
+# still run past it.
+DEFAULT_RULE_TIME_BUDGET = 5.0
+
+
+@dataclass(frozen=True)
+class ScanRule:
+    """
+    A single pattern registered with the scanning engine.
+
+    Attributes:
+        rule_id: Detector id the matches are dispatched to
+        regex: Compiled pattern used to confirm a candidate position
+        anchors: Literals every match must start with (case-insensitive).
+            Rules without anchors fall back to a full scan of their own.
+        requires: Groups of literals the source must contain for the rule to
+            match at all; at least one literal of every group must be present
+        line_mode: Match the pattern per line (reporting each line once)
+            instead of over the whole source
+        time_budget: Seconds the rule may spend on one source before it is aborted,
+            checked between match attempts rather than during one
+    """
+    rule_id: str
+    regex: Pattern
+    anchors: Tuple[str, ...] = ()
+    requires: Tuple[Tuple[str, ...], ...] = ()
+    line_mode: bool = False
+    time_budget: float = DEFAULT_RULE_TIME_BUDGET
+
+
+@dataclass
+class DetectorProfile:
+    """
+    Cost of one detector accumulated over the scans recorded in a ScanStats.
+
+    Attributes:
+        wall_time: Seconds spent evaluating the rule (including its prefilter check)
+        matches: Number of matches the rule produced
+        bytes_scanned: Characters of source offered to the rule's regex; the
+            windows of overlapping anchor candidates are each counted
+        runs: Number of scans that considered the rule
+        skipped: Number of those scans in which the prefilter skipped it
+    """
+    wall_time: float = 0.0
+    matches: int = 0
+    bytes_scanned: int = 0
+    runs: int = 0
+    skipped: int = 0
+
+
+@dataclass
+class ScanStats:
+    """
+    Counters describing how much work the literal prefilter and early exits saved.
+
+    Stats accumulate across scans, so one instance can cover every detector
+    family that ran for an analysis.
+
+    Attributes:
+        rules_total: Number of rules considered
+        rules_skipped: Rules skipped because a required literal was absent
+        skipped_rules: Ids of the skipped rules
+        timed_out_rules: Ids of rules aborted for exceeding their time budget
+        incomplete_stages: Analysis stages (e.g. "slither") that missed the
+            caller's deadline, leaving the results partial
+        failed_stages: Analysis stages (e.g. "slither") that failed, leaving
+            the results partial
+        rules_not_run: Rules a fail-fast analysis never evaluated
+        slither_skipped: Whether a fail-fast analysis skipped Slither
+        time_saved_estimate: Estimated seconds the latest fail-fast analysis
+            saved over a full analysis; replaced rather than accumulated
+        detector_profiles: Per-detector cost keyed by "<family>:<rule id>"
+        stage_times: Seconds spent in stages other than the detectors, such
+            as the literal "prefilter" pass, "slither" and "fetch"
+    """
+    rules_total: int = 0
+    rules_skipped: int = 0
+    skipped_rules: List[str] = field(default_factory=list)
+    timed_out_rules: List[str] = field(default_factory=list)
+    incomplete_stages: List[str] = field(default_factory=list)
+    failed_stages: List[str] = field(default_factory=list)
+    rules_not_run: List[str] = field(default_factory=list)
+    slither_skipped: bool = False
+    time_saved_estimate: float = 0.0
+    detector_profiles: Dict[str, DetectorProfile] = field(default_factory=dict)
+    stage_times: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def skip_rate(self) -> float:
+        """Fraction of rules the prefilter skipped (0.0 - 1.0)."""
+        return self.rules_skipped / self.rules_total if self.rules_total else 0.0
+
+    @property
+    def complete(self) -> bool:
+        """Whether every detector and stage that ran finished, so the results are whole."""
+        return not (self.timed_out_rules or self.incomplete_stages or self.failed_stages)
+
+    def record_detector(self, detector_id: str, wall_time: float, matches: int,
+                        bytes_scanned: int, skipped: bool = False) -> None:
+        """Add one evaluation of a detector to its profile."""
+        profile = self.detector_profiles.get(detector_id)
+        if profile is None:
+            profile = self.detector_profiles[detector_id] = DetectorProfile()
+        profile.wall_time += wall_time
+        profile.matches += matches
+        profile.bytes_scanned += bytes_scanned
+        profile.runs += 1
+        profile.skipped += skipped
+
+    def record_stage(self, stage: str, seconds: float) -> None:
+        """Add time spent in a non-detector stage (e.g. "slither" or "fetch")."""
+        self.stage_times[stage] = self.stage_times.get(stage, 0.0) + seconds
+
+    def profile(self) -> Dict[str, Dict]:
+        """
+        Summarize where the analysis spent its time.
+
+        Returns:
+            Dictionary with the per-detector profiles ('detectors', most
+            expensive first) and the stage times ('stages'), in seconds
+        """
+        ranked = sorted(self.detector_profiles.items(), key=lambda item: item[1].wall_time, reverse=True)
+        return {
+            'detectors': {detector_id: asdict(profile) for detector_id, profile in ranked},
+            'stages': dict(self.stage_times),
+        }
+
+
+def _literal_trie_pattern(literals: Iterable[str]) -> str:
+    """Build a regex alternation with common prefixes factored out."""
+    trie: Dict[str, Dict] = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, Dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            return f'(?:{body})?'
+        return body
+
+    return build(trie)
+
+
+class ScanEngine:
+    """
+    Runs a set of ScanRules over a source in a single traversal.
+
+    For rules with anchors, a match is only attempted at positions where one of
+    its anchors occurs, which reproduces ``regex.finditer`` (or the per-line
+    ``regex.search`` for line-mode rules) as long as every match starts with a
+    declared anchor and contains a literal from every required group.
+
+    Each rule runs within its time budget, which is checked before every
+    candidate or unanchored match attempt. The budget cannot interrupt a
+    regex call already in progress, so one catastrophic ``match()`` (or the
+    search between two unanchored matches) can still run past it.
+    """
+
+    def __init__(self, rules: Iterable[ScanRule], name: str = ""):
+        """
+        Args:
+            rules: Rules to run
+            name: Detector family of the rules, prefixed to rule ids in
+                ScanStats.detector_profiles
+        """
+        self.name = name
+        self.rules: Tuple[ScanRule, ...] = tuple(rules)
+        self._rules_by_id: Dict[str, ScanRule] = {rule.rule_id: rule for rule in self.rules}
+
+        # Every literal that must be located: anchors need positions, required
+        # literals only need to be seen once
+        self._anchor_literals: Set[str] = {
+            anchor.lower() for rule in self.rules for anchor in rule.anchors
+        }
+        literals = set(self._anchor_literals)
+        for rule in self.rules:
+            for group in rule.requires:
+                literals.update(literal.lower() for literal in group)
+
+        # Group literals by first character for dispatch at a regex hit
+        self._literals_by_first: Dict[str, List[str]] = {}
+        for literal in sorted(literals):
+            self._literals_by_first.setdefault(literal[0], []).append(literal)
+
+        self._literal_regex = None
+        self._automaton = None
+        if literals:
+            self._literal_regex = re.compile(_literal_trie_pattern(literals), re.IGNORECASE)
+            if ahocorasick is not None:
+                self._automaton = ahocorasick.Automaton()
+                for literal in literals:
+                    self._automaton.add_word(literal, literal)
+                self._automaton.make_automaton()
+
+    @property
+    def literal_count(self) -> int:
+        """Number of distinct literals located in the single pass."""
+        return sum(len(literals) for literals in self._literals_by_first.values())
+
+    def scan(self, code: str, stats: Optional[ScanStats] = None,
+             scopes: Optional[Mapping[str, Callable[[int], Optional[int]]]] = None
+             ) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        Scan source code with every registered rule.
+
+        Args:
+            code: Source code to scan
+            stats: Optional ScanStats updated with the prefilter skip counts
+            scopes: Optional mapping of rule id to a function returning the end
+                offset of the scope containing a candidate position, or None to
+                skip the candidate. Scoped matches never extend past that end.
+
+        Returns:
+            Mapping of rule id to (start, end) match spans in source order.
+            Line-mode rules report the span of each matching line.
+        """
+        return {rule_id: spans for rule_id, spans, _ in self.iter_scan(code, stats, scopes)}
+
+    def iter_scan(self, code: str, stats: Optional[ScanStats] = None,
+                  scopes: Optional[Mapping[str, Callable[[int], Optional[int]]]] = None,
+                  rule_ids: Optional[Sequence[str]] = None
+                  ) -> Iterator[Tuple[str, List[Tuple[int, int]], bool]]:
+        """
+        Scan source code, yielding each rule's matches as soon as it has run.
+
+        Arguments are the same as for scan(). The single literal pass runs
+        before the first rule is yielded. Rules are only evaluated as the
+        iterator is consumed, so a caller that stops early skips the rest.
+
+        Args:
+            rule_ids: Optional ids of the rules to run, in the order to run
+                them; defaults to every rule in registration order
+
+        Yields:
+            Tuples of (rule id, match spans in source order, whether the rule
+            was aborted for exceeding its time budget), in rule order
+        """
+        started = time.perf_counter()
+        occurrences = self._find_literals(code)
+        if stats is not None:
+            stats.record_stage('prefilter', time.perf_counter() - started)
+        source_index = get_source_index(code)
+        prefix = f"{self.name}:" if self.name else ""
+
+        rules = self.rules if rule_ids is None else [self._rules_by_id[rule_id] for rule_id in rule_ids]
+        for rule in rules:
+            started = time.perf_counter()
+            scope_end = scopes.get(rule.rule_id) if scopes else None
+            if stats is not None:
+                stats.rules_total += 1
+
+            if not self._is_satisfied(rule, occurrences):
+                if stats is not None:
+                    stats.rules_skipped += 1
+                    stats.skipped_rules.append(rule.rule_id)
+                    stats.record_detector(prefix + rule.rule_id, time.perf_counter() - started,
+                                          0, 0, skipped=True)
+                yield rule.rule_id, [], False
+                continue
+
+            if rule.anchors:
+                positions = sorted({
+                    position
+                    for anchor in rule.anchors
+                    for position in occurrences.get(anchor.lower(), ())
+                })
+                spans, timed_out, scanned = self._confirm(rule, code, source_index, positions, scope_end)
+            else:
+                spans, timed_out, scanned = self._scan_unanchored(rule, code, source_index, scope_end)
+
+            if stats is not None:
+                if timed_out:
+                    stats.timed_out_rules.append(rule.rule_id)
+                stats.record_detector(prefix + rule.rule_id, time.perf_counter() - started,
+                                      len(spans), scanned)
+            yield rule.rule_id, spans, timed_out
+
+    @staticmethod
+    def _is_satisfied(rule: ScanRule, occurrences: Dict[str, List[int]]) -> bool:
+        """Check that the source contains an anchor and a literal from every required group."""
+        groups = rule.requires + ((rule.anchors,) if rule.anchors else ())
+        return all(any(literal.lower() in occurrences for literal in group) for group in groups)
+
+    def _find_literals(self, code: str) -> Dict[str, List[int]]:
+        """
+        Locate every registered literal in one pass over the source.
+
+        Returns:
+            Mapping of found literal to its start offsets (anchors) or a single
+            offset (literals that are only required to be present)
+        """
+        occurrences: Dict[str, List[int]] = {}
+        if self._literal_regex is None:
+            return occurrences
+
+        anchor_literals = self._anchor_literals
+        lowered = code.lower()
+
+        if self._automaton is not None and len(lowered) == len(code):
+            for end, literal in self._automaton.iter(lowered):
+                positions = occurrences.get(literal)
+                if positions is None:
+                    occurrences[literal] = [end - len(literal) + 1]
+                elif literal in anchor_literals:
+                    positions.append(end - len(literal) + 1)
+            return occurrences
+
+        literals_by_first = self._literals_by_first
+        search = self._literal_regex.search
+        position = 0
+        while True:
+            hit = search(code, position)
+            if hit is None:
+                break
+            start = hit.start()
+            position = start + 1
+            for literal in literals_by_first.get(code[start].lower(), ()):
+                if code[start:start + len(literal)].lower() != literal:
+                    continue
+                positions = occurrences.get(literal)
+                if positions is None:
+                    occurrences[literal] = [start]
+                elif literal in anchor_literals:
+                    positions.append(start)
+        return occurrences
+
+    @staticmethod
+    def _confirm(rule: ScanRule, code: str, source_index, positions: List[int],
+                 scope_end: Optional[Callable[[int], Optional[int]]] = None
+                 ) -> Tuple[List[Tuple[int, int]], bool, int]:
+        """
+        Confirm a rule at its candidate anchor positions within its budget.
+
+        Reproduces ``regex.finditer`` (or a per-line ``regex.search``) by only
+        attempting matches at the candidates, which every match starts at.
+        Matches may run as far as the regex takes them, except that scoped
+        matches stop at the end of their scope; line-mode rules ignore scopes.
+        The budget is checked before every candidate, including skipped ones,
+        so a rule with many expensive candidates is aborted part-way through a
+        line or statement; a single ``match()`` call is never interrupted.
+
+        Returns:
+            Tuple of (match spans found, whether the rule was aborted,
+            characters from each attempted candidate to where its match was
+            allowed to end)
+        """
+        spans = []
+        scanned = 0
+        deadline = time.perf_counter() + rule.time_budget
+        match_at = rule.regex.match
+
+        if rule.line_mode:
+            # A line is reported once, so candidates after its first match are skipped
+            matched_line = 0
+            for position in positions:
+                if time.perf_counter() > deadline:
+                    return spans, True, scanned
+                line_number = source_index.line_of(position)
+                if line_number == matched_line:
+                    continue
+                line_start, line_end = source_index.line_span(line_number)
+                scanned += line_end - position
+                if match_at(code, position, line_end):
+                    spans.append((line_start, line_end))
+                    matched_line = line_number
+            return spans, False, scanned
+
+        # Like finditer, the next match may only start after the previous one ends
+        next_start = 0
+        code_length = len(code)
+        for position in positions:
+            if time.perf_counter() > deadline:
+                return spans, True, scanned
+            if position < next_start:
+                continue
+            end = code_length
+            if scope_end is not None:
+                end = scope_end(position)
+                if end is None:
+                    continue
+            scanned += end - position
+            match = match_at(code, position, end)
+            if match:
+                spans.append(match.span())
+                next_start = max(match.end(), position + 1)
+        return spans, False, scanned
+
+    @staticmethod
+    def _scan_unanchored(rule: ScanRule, code: str, source_index,
+                         scope_end: Optional[Callable[[int], Optional[int]]] = None
+                         ) -> Tuple[List[Tuple[int, int]], bool, int]:
+        """
+        Run a rule without anchors over the whole source within its budget.
+
+        The budget is checked before every line in line mode and on every match
+        ``finditer`` yields otherwise, including matches dropped for leaving
+        their scope; the search for the next match is not interrupted.
+        Scoped rules keep only the matches that end within the scope they start in.
+        The characters scanned are counted up to where the rule stopped.
+        """
+        spans = []
+        deadline = time.perf_counter() + rule.time_budget
+
+        if rule.line_mode:
+            scanned = 0
+            for line_number, line in source_index.iter_lines():
+                if time.perf_counter() > deadline:
+                    return spans, True, scanned
+                scanned += len(line)
+                if rule.regex.search(line):
+                    spans.append(source_index.line_span(line_number))
+            return spans, False, scanned
+
+        for match in rule.regex.finditer(code):
+            if time.perf_counter() > deadline:
+                return spans, True, match.start()
+            if scope_end is not None:
+                scope = scope_end(match.start())
+                if scope is None or match.end() > scope:
+                    continue
+            spans.append(match.span())
+        return spans, False, len(code)
@@ -0,0 +1,230 @@
+"""
+Pool of Persistent Slither Workers
+
+Spawning `slither` for every contract pays for a Python interpreter start-up
+and Slither's imports on each analysis. This module keeps a pool of
+long-lived worker processes (see slither_worker.py) that load Slither once
+and then receive jobs over their stdin, so per-job latency is dominated by
+compilation and analysis. The pool bounds how many jobs run at once, applies
+a timeout to every job and replaces workers that time out, crash or have
+served their job quota.
+
+EDUCATIONAL PURPOSE: This tool is designed to help developers learn about smart contract
+security. It should only be used for authorized security assessments and educational purposes.
+"""
+
+import itertools
+import json
+import logging
+import os
+import queue
+import subprocess
+import sys
+import threading
+from typing import Dict, List, Optional
+
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'slither_worker.py')
+
+
+class SlitherPoolError(Exception):
+    """Raised when a Slither job fails, times out or no worker can be started."""
+
+
+class SlitherJobError(SlitherPoolError):
+    """Raised when Slither reports an error for a job (e.g. compilation failed)."""
+
+
+class SlitherWorker:
+    """
+    A single worker process and the thread reading its responses.
+
+    Attributes:
+        process: The worker subprocess
+        jobs_done: Number of jobs this worker has completed
+    """
+
+    def __init__(self, python: str, startup_timeout: float):
+        self.process = subprocess.Popen(
+            [python, WORKER_SCRIPT],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, bufsize=1
+        )
+        self.jobs_done = 0
+        self._responses: "queue.Queue[Optional[Dict]]" = queue.Queue()
+        threading.Thread(target=self._read_responses, daemon=True).start()
+
+        try:
+            ready = self._next_response(startup_timeout)
+        except SlitherPoolError:
+            self.kill()
+            raise
+        if not ready.get('ready'):
+            self.kill()
+            raise SlitherPoolError("Slither worker failed to start")
+
+    @property
+    def alive(self) -> bool:
+        """Whether the worker process is still running."""
+        return self.process.poll() is None
+
+    def _read_responses(self) -> None:
+        """Forward every JSON line the worker writes; None marks its exit."""
+        for line in self.process.stdout:
+            try:
+                self._responses.put(json.loads(line))
+            except ValueError:
+                continue
+        self._responses.put(None)
+
+    def _next_response(self, timeout: float) -> Dict:
+        try:
+            response = self._responses.get(timeout=timeout)
+        except queue.Empty:
+            raise SlitherPoolError(f"Slither worker did not respond within {timeout:.0f}s")
+        if response is None:
+            raise SlitherPoolError("Slither worker exited unexpectedly")
+        return response
+
+    def request(self, job_id: int, source: str, timeout: float) -> List[Dict]:
+        """
+        Send one job to the worker and wait for its response.
+
+        Args:
+            job_id: Identifier echoed back by the worker
+            source: Solidity source to analyze
+            timeout: Seconds to wait for the response
+
+        Returns:
+            Slither detector results for the source
+        """
+        try:
+            self.process.stdin.write(json.dumps({'id': job_id, 'source': source}) + '\n')
+            self.process.stdin.flush()
+        except OSError as e:
+            raise SlitherPoolError(f"Could not send job to Slither worker: {e}")
+
+        response = self._next_response(timeout)
+        while response.get('id') != job_id:
+            response = self._next_response(timeout)
+        self.jobs_done += 1
+
+        if 'error' in response:
+            raise SlitherJobError(response['error'])
+        return response.get('results', [])
+
+    def stop(self) -> None:
+        """Ask the worker to exit by closing its stdin, killing it if it does not."""
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+
+    def kill(self) -> None:
+        """Kill the worker process immediately."""
+        self.process.kill()
+        self.process.wait()
+
+
+class SlitherWorkerPool:
+    """
+    Bounded pool of warm Slither workers shared by detectors.
+
+    Workers are started on demand, up to ``workers`` at a time, which is
+    also the number of jobs that run concurrently; further callers wait for
+    a free worker. The pool is thread-safe and can be used as a context
+    manager to stop the workers on exit.
+    """
+
+    def __init__(self, workers: int = 2, job_timeout: float = 60.0,
+                 startup_timeout: float = 60.0, max_jobs_per_worker: int = 100,
+                 python: str = sys.executable):
+        """
+        Args:
+            workers: Maximum number of worker processes (and concurrent jobs)
+            job_timeout: Seconds a single job may run before its worker is killed
+            startup_timeout: Seconds a new worker may take to load Slither
+            max_jobs_per_worker: Jobs after which a worker is replaced, bounding
+                memory growth in long batch runs
+            python: Interpreter used to run the workers
+        """
+        self.logger = logging.getLogger(__name__)
+        self.job_timeout = job_timeout
+        self.startup_timeout = startup_timeout
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.python = python
+
+        self._slots = threading.BoundedSemaphore(workers)
+        self._idle: List[SlitherWorker] = []
+        self._lock = threading.Lock()
+        self._job_ids = itertools.count(1)
+        self._closed = False
+
+    def run(self, source: str, timeout: Optional[float] = None) -> List[Dict]:
+        """
+        Analyze a source on a pooled worker.
+
+        Args:
+            source: Solidity source code
+            timeout: Optional per-job timeout overriding the pool's job_timeout
+
+        Returns:
+            Slither detector results, shaped like results.detectors in
+            `slither --json` output
+
+        Raises:
+            SlitherPoolError: If the job fails, times out or the pool is closed
+        """
+        if self._closed:
+            raise SlitherPoolError("Slither worker pool is closed")
+
+        with self._slots:
+            worker = self._acquire()
+            healthy = False
+            try:
+                results = worker.request(next(self._job_ids), source, timeout or self.job_timeout)
+                healthy = True
+                return results
+            except SlitherJobError:
+                healthy = True
+                raise
+            finally:
+                self._release(worker, healthy)
+
+    def _acquire(self) -> SlitherWorker:
+        """Take an idle worker, starting a new one if none is alive."""
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.alive:
+                    return worker
+        return SlitherWorker(self.python, self.startup_timeout)
+
+    def _release(self, worker: SlitherWorker, healthy: bool) -> None:
+        """Return a worker to the pool, or retire it once it is unhealthy or used up."""
+        with self._lock:
+            if (healthy and worker.alive and not self._closed
+                    and worker.jobs_done < self.max_jobs_per_worker):
+                self._idle.append(worker)
+                return
+        if healthy:
+            worker.stop()
+        else:
+            # A timed-out or crashed worker may still be busy; replace it
+            self.logger.warning("Replacing unresponsive Slither worker")
+            worker.kill()
+
+    def close(self) -> None:
+        """Stop every idle worker; busy workers stop when their job finishes."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.stop()
+
+    def __enter__(self) -> "SlitherWorkerPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Long-Lived Slither Worker Process
+
+Started by SlitherWorkerPool. The worker imports Slither and registers its
+detectors once, then serves analysis jobs read as JSON lines from stdin,
+writing one JSON line per job to stdout:
+
+    request:  {"id": 1, "source": "pragma solidity ..."}
+    response: {"id": 1, "results": [...]}   or   {"id": 1, "error": "..."}
+
+Each result has the same shape as an entry of results.detectors in
+`slither --json` output. Per-job cost is reduced to compilation and
+analysis, since interpreter start-up and imports are paid once.
+
+EDUCATIONAL PURPOSE: This tool is designed to help developers learn about smart contract
+security. It should only be used for authorized security assessments and educational purposes.
+"""
+
+import inspect
+import json
+import os
+import sys
+import tempfile
+
+
+def load_detectors():
+    """Return every detector class shipped with Slither."""
+    from slither.detectors import all_detectors
+    from slither.detectors.abstract_detector import AbstractDetector
+
+    return [
+        obj for obj in vars(all_detectors).values()
+        if inspect.isclass(obj) and issubclass(obj, AbstractDetector) and obj is not AbstractDetector
+    ]
+
+
+def analyze(source: str, detectors) -> list:
+    """Run every detector over a single Solidity source."""
+    from slither import Slither
+
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.sol', delete=False) as tmp_file:
+        tmp_file.write(source)
+        tmp_file_path = tmp_file.name
+    try:
+        slither = Slither(tmp_file_path)
+        for detector in detectors:
+            slither.register_detector(detector)
+        return [result for results in slither.run_detectors() for result in results]
+    finally:
+        os.unlink(tmp_file_path)
+
+
+def main():
+    # Slither and solc log to stdout; keep the protocol channel clean
+    protocol = sys.stdout
+    sys.stdout = sys.stderr
+
+    detectors = load_detectors()
+    protocol.write(json.dumps({'ready': True}) + '\n')
+    protocol.flush()
+
+    for line in sys.stdin:
+        job_id = None
+        try:
+            job = json.loads(line)
+            job_id = job.get('id')
+            response = {'id': job_id, 'results': analyze(job['source'], detectors)}
+        except Exception as e:
+            response = {'id': job_id, 'error': f"{type(e).__name__}: {e}"}
+        protocol.write(json.dumps(response, default=str) + '\n')
+        protocol.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Solidity Lexer Producing a Compact Token Stream
+
+This module tokenizes Solidity source once per analysis. Token kinds and
+offsets are stored in typed arrays (one byte for the kind, two unsigned ints
+for the offsets) instead of per-token objects, so memory stays proportional
+to the token count even on very large verified sources. Whitespace is not
+stored; comments and string literals are kept as tokens so consumers can
+skip or mask them.
+
+EDUCATIONAL PURPOSE: This tool is designed to help developers learn about smart contract
+security. It should only be used for authorized security assessments and educational purposes.
+"""
+
+import re
+from array import array
+from bisect import bisect_right
+from enum import IntEnum
+from functools import lru_cache
+from typing import Iterator, Tuple
+
+
+class TokenKind(IntEnum):
+    """Kinds of tokens produced by the lexer (stored as one byte each)."""
+    COMMENT = 0
+    STRING = 1
+    NUMBER = 2
+    IDENTIFIER = 3
+    KEYWORD = 4
+    OPERATOR = 5
+    LBRACE = 6
+    RBRACE = 7
+    LPAREN = 8
+    RPAREN = 9
+    LBRACKET = 10
+    RBRACKET = 11
+    SEMICOLON = 12
+    COMMA = 13
+    UNKNOWN = 14
+
+
+KEYWORDS = frozenset({
+    'abstract', 'anonymous', 'assembly', 'break', 'calldata', 'catch', 'constant',
+    'constructor', 'continue', 'contract', 'delete', 'do', 'else', 'emit', 'enum',
+    'error', 'event', 'external', 'fallback', 'false', 'for', 'function', 'if',
+    'immutable', 'import', 'indexed', 'interface', 'internal', 'is', 'library',
+    'mapping', 'memory', 'modifier', 'new', 'override', 'payable', 'pragma',
+    'private', 'public', 'pure', 'receive', 'return', 'returns', 'revert',
+    'storage', 'struct', 'throw', 'true', 'try', 'type', 'unchecked', 'using',
+    'view', 'virtual', 'while',
+})
+
+# Alternatives are tried in order; comment and string syntax matches the
+# masking pass in detectors.py so both agree on what is code.
+_TOKEN_REGEX = re.compile(
+    r'(?P<ws>\s+)'
+    r'|(?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))'
+    r'|(?P<string>"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\')'
+    r'|(?P<number>0[xX][0-9a-fA-F_]*|(?:\d[\d_]*(?:\.[\d_]*)?|\.\d[\d_]*)(?:[eE]-?\d+)?)'
+    r'|(?P<name>[A-Za-z_$][A-Za-z0-9_$]*)'
+    r'|(?P<punct>[{}()\[\];,])'
+    r'|(?P<operator>>>>=|>>>|<<=|>>=|\*\*|&&|\|\||\+\+|--|==|!=|<=|>=|<<|>>|=>|->'
+    r'|[-+*/%&|^]=|[-+*/%&|^!~<>=?:.])'
+    r'|(?P<other>.)',
+    re.DOTALL
+)
+
+_PUNCT_KINDS = {
+    '{': TokenKind.LBRACE, '}': TokenKind.RBRACE,
+    '(': TokenKind.LPAREN, ')': TokenKind.RPAREN,
+    '[': TokenKind.LBRACKET, ']': TokenKind.RBRACKET,
+    ';': TokenKind.SEMICOLON, ',': TokenKind.COMMA,
+}
+
+
+class TokenStream:
+    """
+    Array-backed sequence of tokens over a source string.
+
+    Token ``i`` has kind ``kinds[i]`` and covers ``code[starts[i]:ends[i]]``.
+    Tokens are in source order and never overlap.
+
+    Attributes:
+        code: The tokenized source code
+        kinds: TokenKind value of every token (array of unsigned bytes)
+        starts: Start offset of every token (array of unsigned ints)
+        ends: End offset of every token (array of unsigned ints)
+    """
+
+    def __init__(self, code: str, kinds: array, starts: array, ends: array):
+        self.code = code
+        self.kinds = kinds
+        self.starts = starts
+        self.ends = ends
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def kind(self, index: int) -> TokenKind:
+        """Get the kind of a token."""
+        return TokenKind(self.kinds[index])
+
+    def span(self, index: int) -> Tuple[int, int]:
+        """Get the (start, end) offsets of a token."""
+        return self.starts[index], self.ends[index]
+
+    def text(self, index: int) -> str:
+        """Get the source text of a token."""
+        return self.code[self.starts[index]:self.ends[index]]
+
+    def index_at(self, offset: int) -> int:
+        """
+        Find the token at or before a character offset.
+
+        Args:
+            offset: Character offset into the source
+
+        Returns:
+            Index of the last token starting at or before the offset, or -1
+        """
+        return bisect_right(self.starts, offset) - 1
+
+    def iter_kind(self, *kinds: TokenKind) -> Iterator[int]:
+        """Yield the indices of every token of the given kinds."""
+        wanted = set(int(kind) for kind in kinds)
+        for index, kind in enumerate(self.kinds):
+            if kind in wanted:
+                yield index
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes used by the token arrays."""
+        return sum(a.itemsize * len(a) for a in (self.kinds, self.starts, self.ends))
+
+
+def tokenize(code: str) -> TokenStream:
+    """
+    Tokenize Solidity source code.
+
+    Unterminated strings yield a single UNKNOWN token for the quote and lexing
+    resumes after it; unterminated block comments run to the end of the source.
+
+    Args:
+        code: Solidity source code
+
+    Returns:
+        TokenStream over the code
+    """
+    kinds = array('B')
+    starts = array('I')
+    ends = array('I')
+    add_kind, add_start, add_end = kinds.append, starts.append, ends.append
+
+    keyword, identifier = int(TokenKind.KEYWORD), int(TokenKind.IDENTIFIER)
+    group_kinds = {
+        'comment': int(TokenKind.COMMENT),
+        'string': int(TokenKind.STRING),
+        'number': int(TokenKind.NUMBER),
+        'operator': int(TokenKind.OPERATOR),
+        'other': int(TokenKind.UNKNOWN),
+    }
+    punct_kinds = {char: int(kind) for char, kind in _PUNCT_KINDS.items()}
+
+    for match in _TOKEN_REGEX.finditer(code):
+        group = match.lastgroup
+        if group == 'ws':
+            continue
+        if group == 'name':
+            kind = keyword if match.group() in KEYWORDS else identifier
+        elif group == 'punct':
+            kind = punct_kinds[match.group()]
+        else:
+            kind = group_kinds[group]
+        start, end = match.span()
+        add_kind(kind)
+        add_start(start)
+        add_end(end)
+
+    return TokenStream(code, kinds, starts, ends)
+
+
+@lru_cache(maxsize=8)
+def get_token_stream(code: str) -> TokenStream:
+    """
+    Get the shared TokenStream for a source string.
+
+    The source is tokenized once and reused by every consumer analyzing the
+    same code.
+    """
+    return tokenize(code)
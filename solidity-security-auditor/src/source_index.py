@@ -0,0 +1,181 @@
+"""
+Source Index for Offset and Line Lookups
+
+This module provides a line-offset index over analyzed source code. Detectors,
+the Slither integration and the report generator share one index per source
+instead of re-splitting the code or re-counting newlines for every match.
+
+EDUCATIONAL PURPOSE: This tool is designed to help developers learn about smart contract
+security. It should only be used for authorized security assessments and educational purposes.
+"""
+
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, Iterator, List, Tuple
+
+
+class SourceIndex:
+    """
+    Line-start offset index with bisect lookups.
+
+    Line and column numbers are 1-indexed to match the line numbers reported
+    in findings. Line text never includes the trailing newline.
+
+    Attributes:
+        code: The indexed source code
+        line_starts: Character offset at which each line begins
+    """
+
+    def __init__(self, code: str):
+        self.code = code
+        self.line_starts: List[int] = list(
+            accumulate((len(line) + 1 for line in code.split('\n')[:-1]), initial=0)
+        )
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines in the source (same as len(code.split('\\n')))."""
+        return len(self.line_starts)
+
+    def line_of(self, offset: int) -> int:
+        """
+        Get the line number containing a character offset.
+
+        Args:
+            offset: Character offset into the source
+
+        Returns:
+            1-indexed line number
+        """
+        return bisect_right(self.line_starts, offset)
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        """
+        Convert a character offset to a (line, column) pair.
+
+        Args:
+            offset: Character offset into the source
+
+        Returns:
+            Tuple of 1-indexed (line, column)
+        """
+        line = self.line_of(offset)
+        return line, offset - self.line_starts[line - 1] + 1
+
+    def line_span(self, line_number: int) -> Tuple[int, int]:
+        """Get the (start, end) offsets of a line, excluding its newline."""
+        start = self.line_starts[line_number - 1]
+        if line_number < len(self.line_starts):
+            end = self.line_starts[line_number] - 1
+        else:
+            end = len(self.code)
+        return start, end
+
+    def line_text(self, line_number: int) -> str:
+        """
+        Get the text of a single line.
+
+        Args:
+            line_number: 1-indexed line number
+
+        Returns:
+            Line text without the trailing newline
+        """
+        start, end = self.line_span(line_number)
+        return self.code[start:end]
+
+    def iter_lines(self) -> Iterator[Tuple[int, str]]:
+        """Yield (line_number, text) pairs for every line in the source."""
+        for line_number in range(1, len(self.line_starts) + 1):
+            yield line_number, self.line_text(line_number)
+
+    def snippet(self, line_number: int, before: int = 1, after: int = 2, marker: str = "") -> str:
+        """
+        Build a code snippet around a line.
+
+        Args:
+            line_number: 1-indexed line the snippet is centred on
+            before: Number of lines to include before the target line
+            after: Number of lines to include after the target line
+            marker: Optional prefix used to highlight the target line (e.g. ">>> ")
+
+        Returns:
+            Snippet lines joined with newlines
+        """
+        first = max(1, line_number - before)
+        last = min(len(self.line_starts), line_number + after)
+        snippet_lines = []
+        for current in range(first, last + 1):
+            text = self.line_text(current)
+            if marker and current == line_number:
+                text = f"{marker}{text}"
+            snippet_lines.append(text)
+        return '\n'.join(snippet_lines)
+
+    def snippet_ref(self, line_number: int, before: int = 1, after: int = 2,
+                    marker: str = "", strip: bool = False) -> "SnippetRef":
+        """
+        Reference a snippet that is only built when it is first read.
+
+        Args:
+            line_number: 1-indexed line the snippet is centred on
+            before: Number of lines to include before the target line
+            after: Number of lines to include after the target line
+            marker: Optional prefix used to highlight the target line
+            strip: Strip surrounding whitespace from the built snippet
+
+        Returns:
+            SnippetRef resolving to the same text as snippet()
+        """
+        return SnippetRef(self, line_number, before, after, marker, strip)
+
+
+class SnippetRef:
+    """
+    Deferred code snippet: the arguments of SourceIndex.snippet() without the text.
+
+    Findings hold a SnippetRef instead of a string so that snippets are only
+    built for findings that are rendered or serialized.
+    """
+
+    __slots__ = ('index', 'line_number', 'before', 'after', 'marker', 'strip')
+
+    def __init__(self, index: SourceIndex, line_number: int, before: int = 1,
+                 after: int = 2, marker: str = "", strip: bool = False):
+        self.index = index
+        self.line_number = line_number
+        self.before = before
+        self.after = after
+        self.marker = marker
+        self.strip = strip
+
+    def materialize(self) -> str:
+        """Build the snippet text."""
+        text = self.index.snippet(self.line_number, self.before, self.after, self.marker)
+        return text.strip() if self.strip else text
+
+    def to_dict(self) -> Dict:
+        """
+        Serialize the reference without the source or the text.
+
+        Rebuild it with SourceIndex.snippet_ref(**data) on the index of the same source.
+        """
+        return {
+            'line_number': self.line_number,
+            'before': self.before,
+            'after': self.after,
+            'marker': self.marker,
+            'strip': self.strip
+        }
+
+
+@lru_cache(maxsize=8)
+def get_source_index(code: str) -> SourceIndex:
+    """
+    Get the shared SourceIndex for a source string.
+
+    The index is built once and reused by every detector, the Slither snippet
+    extractor and the reporter while analyzing the same code.
+    """
+    return SourceIndex(code)
@@ -0,0 +1,242 @@
+"""
+Structural Span Index for Solidity Sources
+
+This module locates contracts, functions, modifiers and constructors by brace
+matching over the shared token stream. Detectors use the resulting spans to
+confine matches to a single function, skip view/pure functions, and tag
+findings with the function they were found in.
+
+EDUCATIONAL PURPOSE: This tool is designed to help developers learn about smart contract
+security. It should only be used for authorized security assessments and educational purposes.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from solidity_lexer import TokenKind, TokenStream, get_token_stream
+
+
+CONTRACT_KEYWORDS = frozenset({'contract', 'interface', 'library'})
+CALLABLE_KEYWORDS = frozenset({'function', 'modifier', 'constructor', 'fallback', 'receive'})
+VISIBILITY_KEYWORDS = frozenset({'public', 'external', 'internal', 'private'})
+# 'constant' is the pre-0.5 spelling of 'view' on functions
+MUTABILITY_KEYWORDS = {'view': 'view', 'pure': 'pure', 'payable': 'payable', 'constant': 'view'}
+
+
+@dataclass(frozen=True)
+class CodeSpan:
+    """
+    A contract or callable declared in the source.
+
+    Attributes:
+        kind: Declaring keyword (contract, interface, library, function,
+            modifier, constructor, fallback or receive)
+        name: Declared name; special functions use their keyword
+        start: Offset of the declaring keyword
+        body_start: Offset of the opening brace of the body
+        end: Offset just past the closing brace of the body
+        contract: Name of the enclosing contract, if any
+        visibility: Declared visibility for callables, or ""
+        mutability: "view", "pure", "payable" or "" for callables
+        modifiers: Names of the modifiers (and base constructors) invoked in the header
+    """
+    kind: str
+    name: str
+    start: int
+    body_start: int
+    end: int
+    contract: Optional[str] = None
+    visibility: str = ""
+    mutability: str = ""
+    modifiers: Tuple[str, ...] = ()
+
+    @property
+    def qualified_name(self) -> str:
+        """Name prefixed with the enclosing contract (e.g. "Bank.withdraw")."""
+        return f"{self.contract}.{self.name}" if self.contract else self.name
+
+    def contains(self, offset: int) -> bool:
+        """Check whether a character offset lies within the declaration."""
+        return self.start <= offset < self.end
+
+
+class StructureIndex:
+    """
+    Contract and callable spans of a source with bisect lookups.
+
+    Only declarations with a body are indexed. Callables never nest in
+    Solidity, so the callable at an offset is found with a single bisect.
+
+    Attributes:
+        contracts: Contract, interface and library spans in source order
+        callables: Function, modifier and constructor spans in source order
+    """
+
+    def __init__(self, contracts: List[CodeSpan], callables: List[CodeSpan]):
+        self.contracts = contracts
+        self.callables = callables
+        self._callable_starts = [span.start for span in callables]
+        self._contract_starts = [span.start for span in contracts]
+
+    def callable_at(self, offset: int) -> Optional[CodeSpan]:
+        """
+        Get the function, modifier or constructor containing an offset.
+
+        Args:
+            offset: Character offset into the source
+
+        Returns:
+            The enclosing callable span, or None outside of any callable
+        """
+        index = bisect_right(self._callable_starts, offset) - 1
+        if index >= 0 and self.callables[index].contains(offset):
+            return self.callables[index]
+        return None
+
+    def contract_at(self, offset: int) -> Optional[CodeSpan]:
+        """Get the innermost contract, interface or library containing an offset."""
+        index = bisect_right(self._contract_starts, offset) - 1
+        while index >= 0:
+            if self.contracts[index].contains(offset):
+                return self.contracts[index]
+            index -= 1
+        return None
+
+
+def _parse_header(tokens: TokenStream, index: int) -> Tuple[int, str, str, Tuple[str, ...]]:
+    """
+    Read a callable header from the token after its name up to its body or ';'.
+
+    Returns:
+        Tuple of (index of the terminating token, visibility, mutability, modifier names)
+    """
+    kinds, count = tokens.kinds, len(tokens)
+    keyword, identifier = int(TokenKind.KEYWORD), int(TokenKind.IDENTIFIER)
+    lparen, rparen = int(TokenKind.LPAREN), int(TokenKind.RPAREN)
+    terminators = (int(TokenKind.LBRACE), int(TokenKind.SEMICOLON))
+
+    visibility = mutability = ""
+    modifiers = []
+    depth = 0
+    after_returns = False
+    while index < count:
+        kind = kinds[index]
+        if kind == lparen:
+            depth += 1
+        elif kind == rparen:
+            depth -= 1
+            if depth == 0:
+                after_returns = False
+        elif depth == 0:
+            if kind in terminators:
+                break
+            if kind == keyword:
+                text = tokens.text(index)
+                if text in VISIBILITY_KEYWORDS:
+                    visibility = text
+                elif text in MUTABILITY_KEYWORDS:
+                    mutability = MUTABILITY_KEYWORDS[text]
+                elif text == 'returns':
+                    after_returns = True
+            elif kind == identifier and not after_returns:
+                modifiers.append(tokens.text(index))
+        index += 1
+    return index, visibility, mutability, tuple(modifiers)
+
+
+def build_structure(tokens: TokenStream) -> StructureIndex:
+    """
+    Build the structural index of a source from its token stream.
+
+    Args:
+        tokens: Token stream of the source
+
+    Returns:
+        StructureIndex with every contract and callable that has a body
+    """
+    kinds, count = tokens.kinds, len(tokens)
+    keyword, identifier = int(TokenKind.KEYWORD), int(TokenKind.IDENTIFIER)
+    lbrace, rbrace = int(TokenKind.LBRACE), int(TokenKind.RBRACE)
+    semicolon = int(TokenKind.SEMICOLON)
+
+    contracts: List[CodeSpan] = []
+    callables: List[CodeSpan] = []
+    # One frame per open brace: the declaration it opened, if any
+    stack: List[Optional[dict]] = []
+    contract_names: List[str] = []
+    pending: Optional[dict] = None
+
+    index = 0
+    while index < count:
+        kind = kinds[index]
+
+        if kind == keyword:
+            text = tokens.text(index)
+            if text in CONTRACT_KEYWORDS:
+                name = tokens.text(index + 1) if index + 1 < count and kinds[index + 1] == identifier else ""
+                pending = {'kind': text, 'name': name, 'start': tokens.starts[index]}
+            elif text in CALLABLE_KEYWORDS and not (pending and pending['kind'] in CONTRACT_KEYWORDS):
+                start = tokens.starts[index]
+                name = text
+                header = index + 1
+                if text in ('function', 'modifier') and header < count and kinds[header] == identifier:
+                    name = tokens.text(header)
+                    header += 1
+                index, visibility, mutability, modifiers = _parse_header(tokens, header)
+                if index < count and kinds[index] == lbrace:
+                    pending = {
+                        'kind': text, 'name': name, 'start': start,
+                        'visibility': visibility, 'mutability': mutability, 'modifiers': modifiers,
+                    }
+                    continue
+                pending = None
+
+        elif kind == lbrace:
+            frame = None
+            if pending is not None:
+                frame = dict(pending, body_start=tokens.starts[index],
+                             contract=contract_names[-1] if contract_names else None)
+                if frame['kind'] in CONTRACT_KEYWORDS:
+                    contract_names.append(frame['name'])
+                pending = None
+            stack.append(frame)
+
+        elif kind == rbrace:
+            frame = stack.pop() if stack else None
+            if frame is not None:
+                span = CodeSpan(end=tokens.ends[index], **frame)
+                if span.kind in CONTRACT_KEYWORDS:
+                    contract_names.pop()
+                    contracts.append(span)
+                else:
+                    callables.append(span)
+
+        elif kind == semicolon:
+            pending = None
+
+        index += 1
+
+    # Close declarations left open by an unbalanced source at its end
+    end = len(tokens.code)
+    while stack:
+        frame = stack.pop()
+        if frame is not None:
+            span = CodeSpan(end=end, **frame)
+            (contracts if span.kind in CONTRACT_KEYWORDS else callables).append(span)
+
+    contracts.sort(key=lambda span: span.start)
+    callables.sort(key=lambda span: span.start)
+    return StructureIndex(contracts, callables)
+
+
+@lru_cache(maxsize=8)
+def get_structure_index(code: str) -> StructureIndex:
+    """
+    Get the shared StructureIndex for a Solidity source string.
+
+    The index is built once from the shared token stream and reused by every
+    detector analyzing the same code.
+    """
+    return build_structure(get_token_stream(code))